@@ -1,3 +1,4 @@
+import heapq
 import requests
 import pandas as pd
 import pandas_ta as ta
@@ -132,6 +133,8 @@ def rsi_signal(symbol):
         "change_percent": round(change_percent, 2),
         "usdt_volume_24h": round(usdt_volume_24h),
         "price": round(last_price, 4),
+        # score: RSI rise on the signal bar, used to rank candidates
+        "score": round(current_rsi - previous_rsi, 4),
         "sg_time": get_singapore_time() 
     }
 
@@ -144,36 +147,44 @@ def run_rsi_screener():
         print("❌ No symbols loaded from txt.")
         return
 
-    signals = []
+    # keep the strongest `max_signals` over the whole list instead of the first ones found
+    best = []  # min-heap of (score, symbol, result)
     max_signals = 5
-    signal_count = 0
+    found = 0
 
     for symbol in target_symbols:
         print(f"🔁 Checking {symbol}")
         try:
             result = rsi_signal(symbol)
             if result:
-                signals.append(result)
-                msg = (
-                    f"🚀 R54050E21 Signal\n"
-                    f"Symbol: {result['symbol']}\n"
-                    f"RSI: {result['rsi']} (Prev: {result['p_rsi']})\n"
-                    f"EMA21: {result['ema21']}\n"
-                    f"24h Change: {result['change_percent']}%\n"
-                    f"USDT Volume: {result['usdt_volume_24h']}\n"
-                    f"Price: {result['price']}\n"
-                    f"Date/Time (SGT): {result['sg_time']}"
-                )
-                print(msg)
-                send_telegram_message(msg)
-                signal_count += 1
-                if signal_count >= max_signals:
-                    print("🚫 Reached max signal limit. Exiting early.")
-                    break
+                found += 1
+                entry = (result['score'], symbol, result)
+                if len(best) < max_signals:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
         except Exception as e:
             print(f"❌ Error in {symbol}: {e}")
         time.sleep(0.1)
 
+    signals = [result for _, _, result in sorted(best, reverse=True)]
+    if found > len(signals):
+        print(f"🏅 Sending the top {len(signals)} of {found} signals by score.")
+    for result in signals:
+        msg = (
+            f"🚀 R54050E21 Signal\n"
+            f"Symbol: {result['symbol']}\n"
+            f"RSI: {result['rsi']} (Prev: {result['p_rsi']})\n"
+            f"EMA21: {result['ema21']}\n"
+            f"24h Change: {result['change_percent']}%\n"
+            f"USDT Volume: {result['usdt_volume_24h']}\n"
+            f"Price: {result['price']}\n"
+            f"Score: {result['score']}\n"
+            f"Date/Time (SGT): {result['sg_time']}"
+        )
+        print(msg)
+        send_telegram_message(msg)
+
     if not signals:
         print("\n⚠️ No signals found.")
         send_telegram_message("⚠️ No RSI + EMA21 signals found.")
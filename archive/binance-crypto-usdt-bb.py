@@ -1,3 +1,4 @@
+import heapq
 import requests
 import pandas as pd
 import pandas_ta as ta
@@ -140,7 +141,9 @@ def bb_signal(symbol):
         "rsi": round(current['rsi'], 2),
         "bbu": round(upper, 4),
         "bbm": round(middle, 4),
-        "bbl": round(lower, 4)
+        "bbl": round(lower, 4),
+        # score: 24h traded value in USDT (volume qty x price), used to rank candidates
+        "score": round(volume_qty * price)
     }
 
 # --- MAIN ---
@@ -152,37 +155,44 @@ def run_bb_screener():
         print("❌ No USDT pairs loaded from file.")
         return
 
-    signals = []
+    # keep the strongest `max_signals` over the whole list instead of the first ones found
+    best = []  # min-heap of (score, symbol, result)
     max_signals = 5
-    signal_count = 0
+    found = 0
 
     for symbol in usdt_pairs:
         print(f"🔁 Checking {symbol}")
         try:
             result = bb_signal(symbol)
             if result:
-                signals.append(result)
-                msg = (
-                    f"{result['label']}\n"
-                    f"Symbol: {result['symbol']}\n"
-                    f"Price: {result['price']}\n"
-                    f"RSI: {result['rsi']}\n"
-                    f"BBL: {result['bbl']}\n"
-                    f"BBM: {result['bbm']}\n"
-                    f"BBU: {result['bbu']}\n"
-                    f"24h Change: {result['change_percent']}%\n"
-                    f"Volume Qty: {result['volume_qty']}"
-                )
-                send_telegram_message(msg)
-                signal_count += 1
-                print(f"signal_count: {signal_count}")
-                if signal_count >= max_signals:
-                    print("🚫 Reached max signal limit. Exiting early.")
-                    break
+                found += 1
+                entry = (result['score'], symbol, result)
+                if len(best) < max_signals:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
         except Exception as e:
             print(f"❌ Error in {symbol}: {e}")
         time.sleep(0.1)  # Respect API limits
 
+    signals = [result for _, _, result in sorted(best, reverse=True)]
+    if found > len(signals):
+        print(f"🏅 Sending the top {len(signals)} of {found} signals by score.")
+    for result in signals:
+        msg = (
+            f"{result['label']}\n"
+            f"Symbol: {result['symbol']}\n"
+            f"Price: {result['price']}\n"
+            f"RSI: {result['rsi']}\n"
+            f"BBL: {result['bbl']}\n"
+            f"BBM: {result['bbm']}\n"
+            f"BBU: {result['bbu']}\n"
+            f"24h Change: {result['change_percent']}%\n"
+            f"Volume Qty: {result['volume_qty']}\n"
+            f"Score: {result['score']}"
+        )
+        send_telegram_message(msg)
+
     if not signals:
         print("\n⚠️ No Bollinger Band signals found.")
         send_telegram_message("⚠️ No BBands signals found.")
@@ -0,0 +1 @@
+# cryptobot - shared building blocks for the screener scripts (data, indicators, backtests)
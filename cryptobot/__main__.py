@@ -0,0 +1,5 @@
+import sys
+
+from cryptobot.cli import main
+
+sys.exit(main())
@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+import numpy as np
+import requests
+
+from cryptobot import config
+from cryptobot.candles import (INTERVAL_MS, candle_file, concat_arrays, klines_to_arrays,
+                               load_candles, save_candles)
+from cryptobot.ratelimit import MAX_RETRIES, RateGovernor, klines_weight
+from cryptobot.universe import universe
+
+# Historical kline backfill: pages /fapi/v1/klines and /api/v3/klines forward by
+# startTime/endTime for every symbol in the pair lists, several symbols at a time
+# under a shared request-weight budget. Only what the stored file lacks is requested:
+# the bars before its first one (an earlier start), its holes and the bars after its
+# last one. The file is written once per symbol, when its pages are done or one
+# fails, so an interrupted run resumes from what was stored. Requests go through a
+# ratelimit.RateGovernor, so the budget is shared with any other scanner.
+
+PAGE_LIMIT = {"futures": 1500, "spot": 1000}
+
+
+_local = threading.local()
+
+
+def _session():
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def fetch_page(market, symbol, interval, start_ms, end_ms, budget):
+    url = config.base_url(market) + config.klines_path(market)
+    limit = PAGE_LIMIT[market]
+    params = {"symbol": symbol, "interval": interval, "startTime": int(start_ms),
+              "endTime": int(end_ms), "limit": limit}
+    res = budget.get(url, params, klines_weight(market, limit), session=_session(), label=symbol)
+    if res is None or res.status_code != 200:
+        status = res.status_code if res is not None else "no response"
+        raise RuntimeError(f"{symbol} klines failed after {MAX_RETRIES} retries ({status})")
+    data = res.json()
+    if not isinstance(data, list):
+        raise RuntimeError(f"{symbol} klines error: {data}")
+    return data
+
+
+# --- GAPS ---
+def find_gaps(open_time, interval):
+    """Return [(first_missing_open_time, missing_bars), ...] for holes in a candle series."""
+    step = INTERVAL_MS[interval]
+    if len(open_time) < 2:
+        return []
+    deltas = np.diff(open_time)
+    holes = np.flatnonzero(deltas != step)
+    return [(int(open_time[i] + step), int(deltas[i] // step - 1)) for i in holes]
+
+
+def missing_ranges(open_time, interval, start_ms, end_ms):
+    """[(from_ms, to_ms), ...] a stored series lacks: before its first bar, its holes, after its last bar."""
+    step = INTERVAL_MS[interval]
+    if not len(open_time):
+        return [(start_ms, end_ms)]
+    first, last = int(open_time[0]), int(open_time[-1])
+    ranges = [(start_ms, first)] if -(-start_ms // step) * step < first else []
+    ranges += [(t, t + n * step) for t, n in find_gaps(open_time, interval) if n > 0]
+    ranges.append((max(start_ms, last + step), end_ms))
+    return [(lo, hi) for lo, hi in ranges if lo < hi]
+
+
+def _dedupe(arrays):
+    _, keep = np.unique(arrays['open_time'], return_index=True)
+    return {f: v[keep] for f, v in arrays.items()}
+
+
+# --- ONE SYMBOL ---
+def _fetch_range(market, symbol, interval, lo, hi, end_ms, budget, parts):
+    """Page the closed bars of [lo, hi) into `parts`."""
+    step = INTERVAL_MS[interval]
+    cursor = lo
+    while cursor < hi:
+        page = fetch_page(market, symbol, interval, cursor, hi - 1, budget)
+        # drop the bar that is still forming
+        rows = [r for r in page if r[0] < hi and r[6] < end_ms]
+        if not rows:
+            break
+        parts.append(klines_to_arrays(rows))
+        cursor = int(rows[-1][0]) + step
+        if len(page) < PAGE_LIMIT[market]:
+            break
+
+
+def backfill_symbol(market, symbol, interval, start_ms, end_ms, budget, data_dir=None, fmt=None):
+    path = candle_file(symbol, interval, market, data_dir, fmt)
+    stored = load_candles(path) if os.path.exists(path) else klines_to_arrays([])
+    parts = [stored]
+    try:
+        for lo, hi in missing_ranges(stored['open_time'], interval, start_ms, end_ms):
+            _fetch_range(market, symbol, interval, lo, hi, end_ms, budget, parts)
+    finally:
+        # one write per symbol, also when a page fails, so a re-run starts from what was fetched
+        arrays = _dedupe(concat_arrays(parts))
+        fetched = len(arrays['open_time']) - len(stored['open_time'])
+        if fetched:
+            save_candles(path, arrays)
+    return {"bars": int(len(arrays['open_time'])), "fetched": fetched,
+            "gaps": find_gaps(arrays['open_time'], interval)}
+
+
+# --- PROGRESS FILE ---
+def _progress_path(market, interval, data_dir=None):
+    return os.path.join(data_dir or config.DATA_DIR, market, interval, "_progress.json")
+
+
+def _save_progress(path, progress):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(progress, f, indent=1)
+    os.replace(tmp, path)
+
+
+def backfill(market, symbols, interval, start_ms, end_ms=None, workers=8, data_dir=None,
+             weight_per_minute=None, fmt=None):
+    end_ms = end_ms or int(time.time() * 1000)
+    budget = RateGovernor(market, weight_per_minute, state_dir=data_dir)
+    progress_path = _progress_path(market, interval, data_dir)
+    progress = {}
+    if os.path.exists(progress_path):
+        with open(progress_path) as f:
+            progress = json.load(f)
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(backfill_symbol, market, s, interval, start_ms, end_ms, budget, data_dir, fmt): s
+                   for s in symbols}
+        for fut in as_completed(futures):
+            symbol = futures[fut]
+            try:
+                info = fut.result()
+            except Exception as e:
+                print(f"❌ {symbol}: {e}")
+                failed.append(symbol)
+                continue
+            gaps = f", {len(info['gaps'])} gaps" if info['gaps'] else ""
+            print(f"✅ {symbol}: +{info['fetched']} bars ({info['bars']} stored{gaps})")
+            progress[symbol] = {"bars": info['bars'], "gaps": info['gaps'][:50],
+                                "updated": int(time.time() * 1000)}
+            _save_progress(progress_path, progress)
+    return progress, failed
+
+
+def _parse_date(text):
+    return int(datetime.strptime(text, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill historical klines into the local data dir")
+    parser.add_argument("--market", default="futures", choices=["futures", "spot"])
+    parser.add_argument("--interval", default="15m", choices=sorted(INTERVAL_MS))
+    parser.add_argument("--symbols-file")
+    parser.add_argument("--start", help="YYYY-MM-DD (default: --days back from now)")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--weight", type=int, help="request weight per minute for this run")
+    parser.add_argument("--format", choices=["npz", "bin"], help="candle file format (default: CRYPTOBOT_CANDLE_FORMAT or npz)")
+    args = parser.parse_args(argv)
+
+    default_file = config.FUTURES_PAIRS_FULL_FILE if args.market == "futures" else config.SPOT_PAIRS_FILE
+    symbols = universe(args.market, args.symbols_file or default_file)
+    if not symbols:
+        print("❌ No symbols loaded from txt.")
+        return
+
+    now_ms = int(time.time() * 1000)
+    start_ms = _parse_date(args.start) if args.start else now_ms - args.days * 86_400_000
+    print(f"🔍 Backfilling {len(symbols)} {args.market} symbols ({args.interval}) with {args.workers} workers...\n")
+    start_time = time.time()
+    progress, failed = backfill(args.market, symbols, args.interval, start_ms, now_ms,
+                                args.workers, weight_per_minute=args.weight, fmt=args.format)
+    duration = time.time() - start_time
+    with_gaps = sum(1 for s in symbols if progress.get(s, {}).get("gaps"))
+    print(f"\n✅ Done.\n🔢 Symbols: {len(symbols)}\n❌ Failed: {len(failed)}\n"
+          f"🕳️ With gaps: {with_gaps}\n⏱️ Time: {duration:.2f} sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import numpy as np
+
+# Simple fixed-horizon replay used to score screener signals: enter at the close of
+# the bar where a signal first appears, exit `hold_bars` later at the close.
+
+
+def entries(signal):
+    """Only the first bar of each run of consecutive signals opens a trade."""
+    sig = np.asarray(signal, dtype=bool)
+    prev = np.concatenate(([False], sig[:-1]))
+    return sig & ~prev
+
+
+def trades(close, signal, side=1, hold_bars=8, fee=0.0004):
+    """Entry bar indices and net returns of every trade that has closed by the last bar."""
+    close = np.asarray(close, dtype=np.float64)
+    idx = np.flatnonzero(entries(signal))
+    idx = idx[idx + hold_bars < len(close)]
+    gross = close[idx + hold_bars] / close[idx] - 1.0
+    return idx, side * gross - 2 * fee
+
+
+def trade_returns(close, signal, side=1, hold_bars=8, fee=0.0004):
+    return trades(close, signal, side, hold_bars, fee)[1]
+
+
+def summarize(returns):
+    returns = np.asarray(returns, dtype=np.float64)
+    n = int(returns.size)
+    if n == 0:
+        return {"trades": 0, "win_rate": np.nan, "avg_return": np.nan,
+                "total_return": 0.0, "sharpe": np.nan, "worst": np.nan}
+    std = returns.std(ddof=1) if n > 1 else np.nan
+    return {
+        "trades": n,
+        "win_rate": float((returns > 0).mean()),
+        "avg_return": float(returns.mean()),
+        "total_return": float(returns.sum()),
+        "sharpe": float(returns.mean() / std * np.sqrt(n)) if std and std > 0 else np.nan,
+        "worst": float(returns.min()),
+    }
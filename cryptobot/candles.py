@@ -0,0 +1,190 @@
+import os
+import struct
+import time
+
+import numpy as np
+
+from cryptobot import config
+from cryptobot.httpcache import TICKER_TTL
+from cryptobot.metrics import timed
+from cryptobot.ratelimit import governor, klines_weight
+from cryptobot.singleflight import coalesce
+
+# Kline payload columns as returned by /fapi/v1/klines and /api/v3/klines
+KLINE_COLUMNS = [
+    'open_time', 'open', 'high', 'low', 'close', 'volume',
+    'close_time', 'quote_volume', 'num_trades',
+    'taker_buy_base', 'taker_buy_quote', 'ignore'
+]
+
+# Fields kept in memory / on disk (everything except 'ignore'), all stored as float64
+CANDLE_FIELDS = KLINE_COLUMNS[:-1]
+
+INTERVAL_MS = {
+    "1m": 60_000, "3m": 180_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "6h": 21_600_000,
+    "8h": 28_800_000, "12h": 43_200_000, "1d": 86_400_000,
+}
+
+# Memory-mappable candle file (.bin): a 64-byte header followed by fixed-width rows of
+# len(CANDLE_FIELDS) little-endian float64 in CANDLE_FIELDS order. Opening one maps
+# the file instead of reading it, so only the pages that are actually used get loaded.
+BIN_MAGIC = b"CBKLINE1"
+BIN_VERSION = 1
+BIN_HEADER = struct.Struct("<8sHHqq")  # magic, version, fields, interval_ms, rows
+BIN_HEADER_SIZE = 64
+
+
+# --- READ SYMBOLS FROM TXT ---
+def load_symbol_list(filename=config.FUTURES_PAIRS_FILE):
+    try:
+        with open(filename, "r") as file:
+            symbols = [line.strip().upper() for line in file if line.strip()]
+        return [s for s in symbols if s.endswith("USDT")]
+    except Exception as e:
+        print(f"❌ Error reading symbol list: {e}")
+        return []
+
+
+# --- PAYLOAD -> ARRAYS ---
+def klines_to_arrays(rows):
+    """Convert a raw klines payload (list of lists) into a dict of float64 arrays."""
+    if not rows:
+        return {f: np.empty(0, dtype=np.float64) for f in CANDLE_FIELDS}
+    table = np.asarray([r[:len(CANDLE_FIELDS)] for r in rows], dtype=np.float64)
+    return {f: np.ascontiguousarray(table[:, i]) for i, f in enumerate(CANDLE_FIELDS)}
+
+
+def concat_arrays(parts):
+    parts = [p for p in parts if len(p['open_time'])]
+    if not parts:
+        return klines_to_arrays([])
+    return {f: np.concatenate([p[f] for p in parts]) for f in CANDLE_FIELDS}
+
+
+def to_frame(arrays, copy=True):
+    """Candle DataFrame of `arrays`; copy=False wraps the arrays as they are (e.g. shared-memory views)."""
+    import pandas as pd
+    return pd.DataFrame({f: arrays[f] for f in CANDLE_FIELDS if f in arrays}, copy=copy)
+
+
+def bars_per_day(interval):
+    return 86_400_000 // INTERVAL_MS[interval]
+
+
+# --- FETCH LAST N BARS ---
+def _request_klines(market, symbol, interval, limit, metrics=None):
+    url = config.base_url(market) + config.klines_path(market)
+    params = {"symbol": symbol, "interval": interval, "limit": limit}
+    with timed(metrics, symbol, "http"):
+        res = governor(market).get(url, params, klines_weight(market, limit), label=symbol)
+    if metrics is not None:
+        metrics.response(symbol, res)
+    with timed(metrics, symbol, "parse"):
+        data = res.json()
+    if not isinstance(data, list):
+        raise RuntimeError(data)
+    return data
+
+
+def next_close_ms(interval, now_ms=None):
+    """Open time of the next bar, i.e. the moment the current bar of `interval` closes."""
+    step = INTERVAL_MS[interval]
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    return (now_ms // step + 1) * step
+
+
+def fetch_klines(symbol, interval="15m", limit=300, market="futures", metrics=None):
+    # closed bars never change: the payload is cached (and shared between concurrent
+    # callers, see singleflight) until the current bar closes
+    try:
+        key = (config.base_url(market), market, config.klines_path(market), symbol, interval, limit)
+        data = coalesce(key, next_close_ms(interval),
+                        lambda: _request_klines(market, symbol, interval, limit, metrics))
+    except Exception as e:
+        if metrics is not None:
+            metrics.count(symbol, "errors")
+        print(f"❌ {symbol} klines error: {e}")
+        return klines_to_arrays([])
+    with timed(metrics, symbol, "build"):
+        return klines_to_arrays(data)
+
+
+def fetch_tickers(market="futures"):
+    """{symbol: 24hr ticker} for the whole market in one request, cached for TICKER_TTL seconds."""
+    path = "/fapi/v1/ticker/24hr" if market == "futures" else "/api/v3/ticker/24hr"
+
+    def request():
+        data = governor(market).get(config.base_url(market) + path, weight=40 if market == "futures" else 80, label="ticker/24hr").json()
+        if not isinstance(data, list):
+            raise RuntimeError(data)
+        return data
+
+    try:
+        data = coalesce((config.base_url(market), market, path), time.time() * 1000 + TICKER_TTL * 1000, request)
+    except Exception as e:
+        print(f"❌ 24hr tickers error: {e}")
+        return {}
+    return {t["symbol"]: t for t in data}
+
+
+# --- LOCAL FILES ---
+def candle_file(symbol, interval, market="futures", data_dir=None, fmt=None):
+    return os.path.join(data_dir or config.DATA_DIR, market, interval, f"{symbol}.{fmt or config.CANDLE_FORMAT}")
+
+
+def _write_bin(f, arrays):
+    times = arrays['open_time']
+    interval_ms = int(np.diff(times).min()) if len(times) > 1 else 0
+    header = BIN_HEADER.pack(BIN_MAGIC, BIN_VERSION, len(CANDLE_FIELDS), interval_ms, len(times))
+    f.write(header.ljust(BIN_HEADER_SIZE, b"\0"))
+    table = np.empty((len(times), len(CANDLE_FIELDS)), dtype="<f8")
+    for i, field in enumerate(CANDLE_FIELDS):
+        table[:, i] = arrays[field]
+    f.write(table.tobytes())
+
+
+def save_candles(path, arrays):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if path.endswith(".bin"):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            _write_bin(f, arrays)
+    else:
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, **{f: arrays[f] for f in CANDLE_FIELDS})
+    os.replace(tmp, path)
+
+
+def open_candles(path, last=None):
+    """Map a .bin candle file; returns read-only views of the last `last` rows (all by default)."""
+    with open(path, "rb") as f:
+        magic, version, n_fields, _, rows = BIN_HEADER.unpack(f.read(BIN_HEADER.size))
+    if magic != BIN_MAGIC or version != BIN_VERSION or n_fields != len(CANDLE_FIELDS):
+        raise ValueError(f"{path} is not a version {BIN_VERSION} candle file")
+    if not rows:
+        return klines_to_arrays([])
+    table = np.memmap(path, dtype="<f8", mode="r", offset=BIN_HEADER_SIZE, shape=(rows, n_fields))
+    if last:
+        table = table[-last:]
+    return {f: table[:, i] for i, f in enumerate(CANDLE_FIELDS)}
+
+
+def load_candles(path, last=None):
+    if path.endswith(".bin"):
+        return open_candles(path, last)
+    with np.load(path) as data:
+        return {f: data[f][-last:] if last else data[f] for f in CANDLE_FIELDS if f in data.files}
+
+
+def load_universe(symbols, interval, market="futures", data_dir=None, last=None):
+    """Load stored candles for many symbols (either format), skipping the ones not on disk."""
+    formats = [config.CANDLE_FORMAT] + [f for f in ("bin", "npz") if f != config.CANDLE_FORMAT]
+    out = {}
+    for symbol in symbols:
+        for fmt in formats:
+            path = candle_file(symbol, interval, market, data_dir, fmt)
+            if os.path.exists(path):
+                out[symbol] = load_candles(path, last)
+                break
+    return out
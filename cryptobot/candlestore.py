@@ -0,0 +1,116 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cryptobot.candles import CANDLE_FIELDS
+
+# Candles of a whole universe packed into one (fields x rows) float64 block, either in
+# a multiprocessing.shared_memory segment or in a memory-mapped file. Each symbol is a
+# contiguous run of columns described by index[symbol] = (offset, rows), so a worker
+# process that attached once reads any symbol as zero-copy views; nothing is pickled
+# per task except the small handle passed to the pool initializer.
+
+
+class CandleStore:
+    def __init__(self, block, index, shm=None, path=None, owner=False):
+        self.block = block
+        self.index = index
+        self.shm = shm
+        self.path = path
+        self.owner = owner
+
+    # --- CREATE / ATTACH ---
+    @classmethod
+    def create(cls, universe, path=None):
+        """Copy {key: arrays} into a new segment (a memory-mapped file when `path` is given)."""
+        index, total = {}, 0
+        for key, arrays in universe.items():
+            n = len(arrays['open_time'])
+            index[key] = (total, n)
+            total += n
+        shape = (len(CANDLE_FIELDS), total)
+        shm = None
+        if path:
+            block = np.memmap(path, dtype=np.float64, mode="w+", shape=(shape[0], max(total, 1)))[:, :total]
+        else:
+            shm = shared_memory.SharedMemory(create=True, size=max(8, 8 * shape[0] * total))
+            block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        for key, (off, n) in index.items():
+            for i, f in enumerate(CANDLE_FIELDS):
+                block[i, off:off + n] = universe[key][f]
+        if path:
+            block.base.flush()
+        return cls(block, index, shm=shm, path=path, owner=True)
+
+    @property
+    def handle(self):
+        """Picklable description a worker needs to attach."""
+        return {"name": self.shm.name if self.shm else None, "path": self.path,
+                "rows": self.rows, "index": self.index}
+
+    @classmethod
+    def attach(cls, handle):
+        shape = (len(CANDLE_FIELDS), handle["rows"])
+        shm = None
+        if handle["path"]:
+            block = np.memmap(handle["path"], dtype=np.float64, mode="r",
+                              shape=(shape[0], max(shape[1], 1)))[:, :shape[1]]
+        else:
+            shm = shared_memory.SharedMemory(name=handle["name"])
+            block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+            block.flags.writeable = False
+        return cls(block, handle["index"], shm=shm, path=handle["path"])
+
+    def close(self):
+        self.block = None
+        if self.shm is not None:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- READS ---
+    @property
+    def rows(self):
+        return self.block.shape[1]
+
+    @property
+    def nbytes(self):
+        return self.block.nbytes
+
+    @property
+    def symbols(self):
+        return list(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def view(self, key, field):
+        off, n = self.index[key]
+        return self.block[CANDLE_FIELDS.index(field), off:off + n]
+
+    def arrays(self, key):
+        off, n = self.index[key]
+        return {f: self.block[i, off:off + n] for i, f in enumerate(CANDLE_FIELDS)}
+
+
+# --- POOL WORKERS ---
+_STORE = None
+
+
+def attach_worker(handle):
+    """ProcessPoolExecutor initializer: attach this worker to the store once."""
+    global _STORE
+    _STORE = CandleStore.attach(handle)
+
+
+def worker_store():
+    return _STORE
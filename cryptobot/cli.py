@@ -0,0 +1,108 @@
+import statistics
+import subprocess
+import sys
+import time
+from importlib import import_module
+
+# Single entry point: `python -m cryptobot <command> [args]`. Only the standard library
+# is imported here; each command's module is imported when that command runs, so a
+# light path (dominance, --help) never loads pandas or the indicator stack.
+
+COMMANDS = {
+    "scan": ("cryptobot.scan", "one REST pass over the universe, alert on the last closed bar"),
+    "stream": ("cryptobot.stream", "WebSocket kline streams, strategy checks on every close"),
+    "dominance": ("cryptobot.dominance", "BTC price vs BTC dominance update (0089)"),
+    "backfill": ("cryptobot.backfill", "download historical klines into the data dir"),
+    "derivatives": ("cryptobot.derivatives", "store funding (premiumIndex) and open interest next to the candles"),
+    "sweep": ("cryptobot.sweep", "parallel parameter sweep"),
+    "walkforward": ("cryptobot.walkforward", "walk-forward optimisation"),
+    "patterns": ("cryptobot.patterns", "multi-candle patterns over the full history of a universe"),
+    "orderflow": ("cryptobot.orderflow", "taker imbalance, CVD and trade intensity across the universe"),
+    "journal": ("cryptobot.journal", "forward returns / MFE / MAE scorecard of journaled signals"),
+    "dca": ("cryptobot.dca", "DCA ladder: required capital and price coverage"),
+    "dca-sim": ("cryptobot.dcasim", "replay a DCA bot over stored candles"),
+    "recovery": ("cryptobot.recovery", "average-price recovery plan for open positions"),
+    "loss-recovery": ("cryptobot.leverage", "leveraged loss recovery and liquidation distance"),
+    "fake-exchange": ("cryptobot.fake_exchange", "local fake Binance / CoinGecko / Telegram server"),
+    "bench-startup": ("cryptobot.cli", "measure process startup against the time budget"),
+}
+
+# name: (argv after the interpreter, budget in ms, modules that must not be imported)
+STARTUP_PROBES = {
+    "help": (["-m", "cryptobot", "--help"], 150, ["numpy", "pandas", "requests"]),
+    "dominance": (["-c", "import cryptobot.dominance"], 300, ["numpy", "pandas", "pandas_ta"]),
+    "scan-help": (["-m", "cryptobot", "scan", "--help"], 300, ["pandas", "pandas_ta"]),
+}
+
+
+def usage():
+    width = max(map(len, COMMANDS))
+    lines = ["usage: python -m cryptobot <command> [args]", "", "commands:"]
+    lines += [f"  {name.ljust(width)}  {text}" for name, (_, text) in COMMANDS.items()]
+    return "\n".join(lines)
+
+
+# --- STARTUP BENCHMARK ---
+def _leaked_modules(args, forbidden):
+    """Forbidden modules found in sys.modules after running the probe in one process."""
+    if args[0] == "-m":
+        run = (f"sys.argv = {args[1:]!r}\ntry:\n    runpy.run_module({args[1]!r}, run_name='__main__')\n"
+               f"except SystemExit:\n    pass\n")
+    else:
+        run = args[1] + "\n"
+    code = f"import runpy, sys\n{run}print('LOADED:' + ','.join(m for m in {forbidden!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True).stdout
+    loaded = next((line[len("LOADED:"):] for line in out.splitlines() if line.startswith("LOADED:")), "")
+    return [m for m in loaded.split(",") if m]
+
+
+def bench_startup(runs=7, scale=1.0):
+    """{probe: (median ms, budget ms, leaked heavy modules)}; the budgets are multiplied by `scale`."""
+    base = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], capture_output=True)
+        base.append((time.perf_counter() - started) * 1000)
+    results = {"python": (statistics.median(base), None, [])}
+    for name, (args, budget, forbidden) in STARTUP_PROBES.items():
+        times = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, *args], capture_output=True)
+            times.append((time.perf_counter() - started) * 1000)
+        results[name] = (statistics.median(times), budget * scale, _leaked_modules(args, forbidden))
+    return results
+
+
+def bench_main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Measure `python -m cryptobot` startup against the time budget")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget (slow machines)")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name, (ms, budget, leaked) in bench_startup(args.runs, args.scale).items():
+        over = budget is not None and ms > budget
+        failed |= over or bool(leaked)
+        status = "—" if budget is None else ("❌" if over or leaked else "✅")
+        limit = "" if budget is None else f" / {budget:.0f} ms"
+        extra = f"  heavy imports: {', '.join(leaked)}" if leaked else ""
+        print(f"{status} {name:<10} {ms:7.1f} ms{limit}{extra}")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"❌ Unknown command: {command}\n\n{usage()}")
+        return 2
+    if command == "bench-startup":
+        return bench_main(rest)
+    # argparse in the command module takes its prog from argv[0]
+    sys.argv = [f"cryptobot {command}", *rest]
+    return import_module(COMMANDS[command][0]).main(rest)
@@ -0,0 +1,51 @@
+import os
+
+# =========================
+# ENDPOINTS (override with env vars to point at a local stand-in)
+# =========================
+FUTURES_URL = os.environ.get("CRYPTOBOT_FUTURES_URL", "https://fapi.binance.com")
+SPOT_URL = os.environ.get("CRYPTOBOT_SPOT_URL", "https://api.binance.com")
+COINGECKO_URL = os.environ.get("CRYPTOBOT_COINGECKO_URL", "https://api.coingecko.com")
+TELEGRAM_URL = os.environ.get("CRYPTOBOT_TELEGRAM_URL", "https://api.telegram.org")
+FUTURES_WS_URL = os.environ.get("CRYPTOBOT_FUTURES_WS_URL", "wss://fstream.binance.com")
+SPOT_WS_URL = os.environ.get("CRYPTOBOT_SPOT_WS_URL", "wss://stream.binance.com:9443")
+
+# =========================
+# TELEGRAM CONFIG
+# =========================
+TELEGRAM_TOKEN = os.environ.get("TELEGRAM_TOKEN", "")
+TELEGRAM_CHAT_ID = os.environ.get("TELEGRAM_CHAT_ID", "")
+
+# =========================
+# BINANCE API KEY (read-only is enough: signed USER_DATA endpoints such as leverage brackets)
+# =========================
+BINANCE_API_KEY = os.environ.get("BINANCE_API_KEY", "")
+BINANCE_API_SECRET = os.environ.get("BINANCE_API_SECRET", "")
+
+# =========================
+# FILES
+# =========================
+DATA_DIR = os.environ.get("CRYPTOBOT_DATA_DIR", "data")
+CANDLE_FORMAT = os.environ.get("CRYPTOBOT_CANDLE_FORMAT", "npz")  # or "bin" (memory-mapped)
+FUTURES_PAIRS_FILE = "future_usdt_usdm_pairs.txt"
+FUTURES_PAIRS_FULL_FILE = "future_usdt_usdm_pairs_full.txt"
+SPOT_PAIRS_FILE = "usdt_pairs.txt"
+
+# =========================
+# DEFAULTS
+# =========================
+REQUEST_TIMEOUT = 15
+HTTP_CACHE = os.environ.get("CRYPTOBOT_HTTP_CACHE", "1") != "0"  # klines/tickers cached until the bar closes
+MIN_QUOTE_VOLUME = 20_000_000
+
+
+def base_url(market):
+    return FUTURES_URL if market == "futures" else SPOT_URL
+
+
+def ws_url(market):
+    return FUTURES_WS_URL if market == "futures" else SPOT_WS_URL
+
+
+def klines_path(market):
+    return "/fapi/v1/klines" if market == "futures" else "/api/v3/klines"
@@ -0,0 +1,183 @@
+import argparse
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from cryptobot import config
+from cryptobot.candles import fetch_tickers, load_symbol_list
+
+# DCA ladder with the semantics of Wunder-Trading/DCA_Calculator_v3.xlsx. Order 1 is
+# the initial buy of `amount` USDT at `entry`; every safety order is placed
+# `deviation` % (times `deviation_mult` per step) further below the previous one and
+# buys `size_mult` times the tokens of the previous order. All inputs broadcast, so a
+# whole grid of settings (or a whole symbol list) is one set of array operations.
+#
+#   step[0] = 0, step[1] = deviation, step[n] = step[n-1] * deviation_mult
+#   cum_deviation[n] = cum_deviation[n-1] + step[n]
+#   price[n] = entry * (1 - cum_deviation[n] / 100)
+#   tokens[0] = amount / entry, tokens[n] = tokens[n-1] * size_mult
+#   size[n] = price[n] * tokens[n]      (USDT)
+
+DCA_COUNTS = (5, 10, 15, 20)  # "Final Required USDT - N DCA" = cumulative investment after N orders
+LEVERAGES = (10, 20)
+
+
+def ladder(entry, amount=50.0, deviation=1.3, size_mult=1.1, deviation_mult=1.0, orders=20):
+    """
+    Order table of the ladder as {column: array}; every input broadcasts against the
+    others and the arrays get a trailing axis of length `orders` (order 1 first).
+    """
+    entry, amount, deviation, size_mult, deviation_mult = (
+        np.asarray(x, dtype=np.float64)[..., None] for x in (entry, amount, deviation, size_mult, deviation_mult))
+    n = np.arange(orders)
+    step = np.where(n == 0, 0.0, deviation * deviation_mult ** np.maximum(n - 1, 0))
+    cum_deviation = np.cumsum(step, axis=-1)
+    price = entry * (1 - cum_deviation / 100)
+    tokens = amount / entry * size_mult ** n
+    size = price * tokens
+    cum_invest = np.cumsum(size, axis=-1)
+    cum_tokens = np.cumsum(tokens, axis=-1)
+    return {
+        "deviation": step, "cum_deviation": cum_deviation, "price": price, "size": size,
+        "tokens": tokens, "cum_invest": cum_invest, "cum_tokens": cum_tokens,
+        "avg_price": cum_invest / cum_tokens,
+    }
+
+
+def ladder_frame(entry, amount=50.0, deviation=1.3, size_mult=1.1, deviation_mult=1.0, orders=20):
+    """One ladder as the spreadsheet's order table."""
+    table = pd.DataFrame({k: v.ravel() for k, v in ladder(entry, amount, deviation, size_mult,
+                                                           deviation_mult, orders).items()})
+    table.index = pd.RangeIndex(1, orders + 1, name="order")
+    return table
+
+
+def _at(values, count):
+    return values[..., count - 1]
+
+
+def coverage(lad, counts=DCA_COUNTS, leverages=LEVERAGES):
+    """
+    {column: array} per ladder: USDT required, price drop covered and average entry
+    (% below entry) after each of `counts` orders, and the margin for the largest count
+    at each leverage. Ladders whose orders reach a price <= 0 get NaN.
+    """
+    out = {}
+    entry = lad["price"][..., 0]
+    for count in counts:
+        valid = _at(lad["price"], count) > 0
+        out[f"required_{count}"] = np.where(valid, _at(lad["cum_invest"], count), np.nan)
+        out[f"coverage_{count}"] = np.where(valid, _at(lad["cum_deviation"], count), np.nan)
+        out[f"avg_drop_{count}"] = np.where(valid, (1 - _at(lad["avg_price"], count) / entry) * 100, np.nan)
+    top = max(counts)
+    for lev in leverages:
+        out[f"margin_{top}_{lev}x"] = out[f"required_{top}"] / lev
+    return out
+
+
+# --- PARAMETER GRID ---
+def capital_table(deviations, size_mults, deviation_mults=(1.0,), amount=50.0,
+                  counts=DCA_COUNTS, leverages=LEVERAGES):
+    """
+    Required capital and price coverage for every combination of the settings, one
+    row per combination. The USDT figures do not depend on the entry price, so the
+    whole grid is evaluated as one ladder array at entry 1.
+    """
+    combos = np.array(list(itertools.product(deviations, size_mults, deviation_mults)), dtype=np.float64)
+    lad = ladder(1.0, amount, combos[:, 0], combos[:, 1], combos[:, 2], max(counts))
+    table = pd.DataFrame({"deviation": combos[:, 0], "size_mult": combos[:, 1], "deviation_mult": combos[:, 2]})
+    for k, v in coverage(lad, counts, leverages).items():
+        table[k] = v
+    return table
+
+
+# --- PER SYMBOL ---
+def symbol_table(prices, amount=50.0, deviation=1.3, size_mult=1.1, deviation_mult=1.0,
+                 filters=None, counts=DCA_COUNTS, leverages=LEVERAGES):
+    """
+    Ladder of one setting for every symbol in {symbol: last price}. With `filters`
+    from universe.tradable_symbols, order prices are rounded to the tick size and
+    quantities down to the step size before the totals are taken, and `min_qty_ok`
+    tells whether the initial buy clears the exchange minimum.
+    """
+    symbols = list(prices)
+    entry = np.array([prices[s] for s in symbols], dtype=np.float64)
+    lad = ladder(entry, amount, deviation, size_mult, deviation_mult, max(counts))
+    table = pd.DataFrame({"symbol": symbols, "price": entry})
+    if filters:
+        def column(key):
+            return np.array([(filters.get(s) or {}).get(key) or 0.0 for s in symbols], dtype=np.float64)[:, None]
+
+        tick, step, min_qty = column("tick_size"), column("step_size"), column("min_qty")
+        price = np.where(tick > 0, np.round(lad["price"] / np.where(tick > 0, tick, 1)) * tick, lad["price"])
+        # the quotient is rounded before flooring, or exact multiples of the step lose one
+        tokens = np.where(step > 0, np.floor(np.round(lad["tokens"] / np.where(step > 0, step, 1), 9)) * step,
+                          lad["tokens"])
+        lad["price"], lad["tokens"] = price, tokens
+        lad["size"] = price * tokens
+        lad["cum_invest"] = np.cumsum(lad["size"], axis=-1)
+        lad["cum_tokens"] = np.cumsum(tokens, axis=-1)
+        lad["avg_price"] = np.divide(lad["cum_invest"], lad["cum_tokens"],
+                                     out=np.full_like(price, np.nan), where=lad["cum_tokens"] > 0)
+        table["min_qty_ok"] = tokens[:, 0] >= min_qty[:, 0]
+    for count in counts:
+        table[f"price_{count}"] = _at(lad["price"], count)
+    for k, v in coverage(lad, counts, leverages).items():
+        table[k] = v
+    return table
+
+
+def _values(text):
+    """"1.3" -> [1.3]; "0.5:3:0.25" -> 0.5, 0.75, ... 3 (inclusive)."""
+    if ":" not in text:
+        return [float(text)]
+    start, stop, step = (float(x) for x in text.split(":"))
+    return list(np.round(np.arange(start, stop + step / 2, step), 10))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DCA ladder: required capital and price coverage (DCA_Calculator_v3)")
+    parser.add_argument("--amount", type=float, default=50.0, help="initial buy in USDT")
+    parser.add_argument("--deviation", nargs="+", default=["1.3"], help="price deviation %% (values or start:stop:step)")
+    parser.add_argument("--size-mult", nargs="+", default=["1.1"], help="order size multiplier")
+    parser.add_argument("--deviation-mult", nargs="+", default=["1"], help="price deviation multiplier")
+    parser.add_argument("--counts", type=int, nargs="+", default=list(DCA_COUNTS))
+    parser.add_argument("--entry", type=float, help="print the full order table for this entry price")
+    parser.add_argument("--symbols", action="store_true", help="size the ladder for every symbol in --symbols-file")
+    parser.add_argument("--market", default="futures", choices=["futures", "spot"])
+    parser.add_argument("--symbols-file", default=config.FUTURES_PAIRS_FILE)
+    parser.add_argument("--sort", default=None, help="column to sort the table by")
+    parser.add_argument("--out", help="write the table to this CSV file")
+    args = parser.parse_args(argv)
+
+    deviations = [v for t in args.deviation for v in _values(t)]
+    size_mults = [v for t in args.size_mult for v in _values(t)]
+    deviation_mults = [v for t in args.deviation_mult for v in _values(t)]
+
+    if args.entry:
+        table = ladder_frame(args.entry, args.amount, deviations[0], size_mults[0], deviation_mults[0],
+                             max(args.counts))
+    elif args.symbols:
+        from cryptobot.universe import tradable_symbols
+        tickers = fetch_tickers(args.market)
+        prices = {s: float(tickers[s]["lastPrice"]) for s in load_symbol_list(args.symbols_file) if s in tickers}
+        if not prices:
+            print("❌ No prices for the symbol list.")
+            return
+        table = symbol_table(prices, args.amount, deviations[0], size_mults[0], deviation_mults[0],
+                             tradable_symbols(args.market), args.counts)
+    else:
+        table = capital_table(deviations, size_mults, deviation_mults, args.amount, args.counts)
+    if args.sort:
+        table = table.sort_values(args.sort)
+
+    with pd.option_context("display.max_rows", 60, "display.width", 200):
+        print(table.to_string() if len(table) <= 60 else table)
+    if args.out:
+        table.to_csv(args.out, index=bool(args.entry))
+        print(f"✅ {len(table)} rows written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from cryptobot import config
+from cryptobot.candles import INTERVAL_MS, load_symbol_list, load_universe
+from cryptobot.dca import ladder
+from cryptobot.sweep import candle_pool, worker_store
+
+# Replay of a long-only DCA bot (Wunder-Trading DCA terms) over stored candles. A deal
+# opens at a bar close with the initial buy; safety orders are limit buys at the
+# ladder prices of dca.ladder, filled when a bar's low reaches them; the take profit
+# is a limit sell of the whole position at `take_profit` (a fraction, as in
+# leverage.loss_recovery) over the average price, filled when a bar's high reaches
+# it. Within one bar the take profit is checked against the average before that
+# bar's fills, and a bar that fills safety orders cannot also take profit. The
+# next deal opens at the close of the exit bar.
+#
+# Order sizes in USDT do not depend on the entry price, so the ladder is computed once
+# as ratios of the entry. Each deal then advances from event to event (next fill or
+# take profit) with a vectorized first-hit search over a growing window of bars.
+
+FIRST_WINDOW = 256
+MAX_WINDOW = 1 << 16
+
+
+def _first(mask):
+    i = int(np.argmax(mask))
+    return i if mask[i] else len(mask)
+
+
+def simulate(high, low, close, amount=50.0, orders=20, deviation=1.3, size_mult=1.1, deviation_mult=1.0,
+             take_profit=0.01, fee=0.0004, starts=None):
+    """
+    Deals of one symbol as a list of dicts (entry/exit bar, orders filled, invested
+    USDT, PnL). `starts` optionally limits deal openings to bars where it is True;
+    a deal still open on the last bar has exit=None and is marked to the last close.
+    """
+    high, low, close = (np.asarray(a, dtype=np.float64) for a in (high, low, close))
+    lad = ladder(1.0, amount, deviation, size_mult, deviation_mult, orders)
+    levels = lad["price"][1:]                 # safety order prices / entry
+    cum_invest = lad["cum_invest"]            # USDT after k+1 orders
+    cum_tokens = lad["cum_tokens"]            # tokens * entry after k+1 orders
+    target = lad["avg_price"] * (1 + take_profit)
+    open_at = np.flatnonzero(starts) if starts is not None else None
+
+    n, deals, s = len(close), [], 0
+    while True:
+        if open_at is not None:
+            k = np.searchsorted(open_at, s)
+            if k == len(open_at):
+                break
+            s = int(open_at[k])
+        if s >= n - 1:
+            break
+        entry = close[s]
+        filled, pos, window = 1, s + 1, FIRST_WINDOW
+        exit_bar, last_bar, usdt_bars = None, s, 0.0
+        while pos < n:
+            end = min(pos + window, n)
+            tp = entry * target[filled - 1]
+            i_tp = _first(high[pos:end] >= tp)
+            i_fill = _first(low[pos:end] <= entry * levels[filled - 1]) if filled < orders else end - pos
+            if i_tp == end - pos and i_fill == end - pos:
+                pos, window = end, min(window * 2, MAX_WINDOW)
+                continue
+            if i_tp <= i_fill:
+                exit_bar = pos + i_tp
+                break
+            bar = pos + i_fill
+            usdt_bars += cum_invest[filled - 1] * (bar - last_bar)
+            last_bar = bar
+            filled += int(np.count_nonzero(entry * levels[filled - 1:] >= low[bar]))
+            pos, window = bar + 1, FIRST_WINDOW
+        invested = cum_invest[filled - 1]
+        qty = cum_tokens[filled - 1] / entry
+        exit_price = entry * target[filled - 1] if exit_bar is not None else close[-1]
+        value = qty * exit_price
+        end_bar = exit_bar if exit_bar is not None else n - 1
+        usdt_bars += invested * (end_bar - last_bar)
+        deals.append({"entry": s, "exit": exit_bar, "orders": filled, "invested": invested,
+                      "entry_price": entry, "exit_price": exit_price,
+                      "pnl": value - invested - fee * (invested + value),
+                      "bars": end_bar - s, "usdt_bars": usdt_bars})
+        if exit_bar is None:
+            break
+        s = exit_bar
+    return deals
+
+
+def summarize_deals(deals, bars, required, bar_ms=None):
+    """
+    Per-symbol report: realized PnL of closed deals, orders used, capital utilization
+    (time-weighted USDT in the position / `required`, the capital for the full
+    ladder, and its peak), time in trade and the deal still open at the end.
+    """
+    closed = [d for d in deals if d["exit"] is not None]
+    last = deals[-1] if deals and deals[-1]["exit"] is None else None
+    in_trade = sum(d["bars"] for d in deals)
+    hours = (bar_ms or 0) / 3_600_000
+    return {
+        "deals": len(closed),
+        "pnl": float(sum(d["pnl"] for d in closed)),
+        "avg_pnl": float(np.mean([d["pnl"] for d in closed])) if closed else np.nan,
+        "max_orders": max((d["orders"] for d in deals), default=0),
+        "avg_orders": float(np.mean([d["orders"] for d in deals])) if deals else np.nan,
+        "max_invested": float(max((d["invested"] for d in deals), default=0.0)),
+        "utilization": float(sum(d["usdt_bars"] for d in deals) / (bars * required)) if bars and required else np.nan,
+        "peak_utilization": float(max((d["invested"] for d in deals), default=0.0) / required) if required else np.nan,
+        "time_in_trade": in_trade / bars if bars else np.nan,
+        "avg_deal_hours": float(np.mean([d["bars"] for d in closed]) * hours) if closed and hours else np.nan,
+        "max_deal_hours": float(max(d["bars"] for d in deals) * hours) if deals and hours else np.nan,
+        "open_invested": float(last["invested"]) if last else 0.0,
+        "open_pnl": float(last["pnl"]) if last else 0.0,
+    }
+
+
+# --- UNIVERSE ---
+def _run_symbol(task):
+    symbol, params, interval = task
+    arrays = worker_store().arrays(symbol)
+    deals = simulate(arrays['high'], arrays['low'], arrays['close'], **params)
+    lad = ladder(1.0, params.get("amount", 50.0), params.get("deviation", 1.3), params.get("size_mult", 1.1),
+                 params.get("deviation_mult", 1.0), params.get("orders", 20))
+    bars = len(arrays['close'])
+    return {"symbol": symbol, "bars": bars,
+            **summarize_deals(deals, bars, float(lad["cum_invest"][-1]), INTERVAL_MS.get(interval))}
+
+
+def run(universe, params, interval, workers=None):
+    """One summary row per symbol of {symbol: arrays}, symbols spread over a process pool."""
+    with candle_pool(universe, workers) as pool:
+        rows = list(pool.map(_run_symbol, [(s, params, interval) for s in universe]))
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a DCA bot over stored candles")
+    parser.add_argument("--interval", default="15m")
+    parser.add_argument("--market", default="futures", choices=["futures", "spot"])
+    parser.add_argument("--symbols-file", default=config.FUTURES_PAIRS_FILE)
+    parser.add_argument("--last", type=int, help="only the last N bars of every symbol")
+    parser.add_argument("--amount", type=float, default=50.0, help="initial buy in USDT")
+    parser.add_argument("--orders", type=int, default=20, help="max DCA orders, initial buy included")
+    parser.add_argument("--deviation", type=float, default=1.3, help="price deviation %%")
+    parser.add_argument("--size-mult", type=float, default=1.1)
+    parser.add_argument("--deviation-mult", type=float, default=1.0)
+    parser.add_argument("--take-profit", type=float, default=0.01,
+                        help="over the average price, a fraction (default 0.01 = 1 %%)")
+    parser.add_argument("--fee", type=float, default=0.0004)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--out", help="write the per-symbol table to this CSV file")
+    args = parser.parse_args(argv)
+
+    universe = load_universe(load_symbol_list(args.symbols_file), args.interval, args.market, last=args.last)
+    if not universe:
+        print("❌ No candles available (run the backfill first).")
+        return
+    params = {"amount": args.amount, "orders": args.orders, "deviation": args.deviation,
+              "size_mult": args.size_mult, "deviation_mult": args.deviation_mult,
+              "take_profit": args.take_profit, "fee": args.fee}
+
+    start_time = time.time()
+    table = run(universe, params, args.interval, args.workers).sort_values("pnl", ascending=False)
+    duration = time.time() - start_time
+    with pd.option_context("display.width", 200, "display.max_rows", 40):
+        print(table.to_string(index=False) if len(table) <= 40 else table)
+    print(f"\n💰 Total PnL {table['pnl'].sum():.2f} USDT over {table['deals'].sum()} deals, "
+          f"max orders used {table['max_orders'].max()}, open {table['open_invested'].sum():.2f} USDT")
+    if args.out:
+        table.to_csv(args.out, index=False)
+    print(f"⏱️ Time: {duration:.2f} sec — {len(universe)} symbols, {sum(len(a['close']) for a in universe.values())} bars")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+from cryptobot import config
+from cryptobot.candles import next_close_ms
+from cryptobot.ratelimit import governor
+from cryptobot.singleflight import coalesce
+
+# Futures-only inputs next to the candles: funding / mark price from /fapi/v1/premiumIndex
+# (every symbol in one request) and open interest from /futures/data/openInterestHist
+# (one request per symbol, sent in concurrent batches under the separate governor of
+# the /futures/data endpoints). Payloads are coalesced and cached to their cadence:
+# premiumIndex for PREMIUM_TTL seconds, open interest until its period closes.
+#
+# Storage under the data dir, like the candle files:
+#   futures/openInterest_<period>/<SYMBOL>.npz   OI_FIELDS, merged on timestamp
+#   futures/premiumIndex/<YYYY-MM-DD>.npz        symbol + PREMIUM_FIELDS, one row per
+#                                                symbol and snapshot
+# Binance only serves the last 30 days of open interest, so stored files keep what
+# rolls off the endpoint. `inputs` joins both onto candle bars as of their close.
+
+PREMIUM_PATH = "/fapi/v1/premiumIndex"
+OI_PATH = "/futures/data/openInterestHist"
+PREMIUM_TTL = 60
+OI_LIMIT = 500
+OI_PERIODS = ("5m", "15m", "30m", "1h", "2h", "4h", "6h", "12h", "1d")
+PREMIUM_FIELDS = ("time", "mark_price", "index_price", "funding_rate", "interest_rate", "next_funding_time")
+OI_FIELDS = ("timestamp", "open_interest", "open_interest_value")
+
+
+# --- FETCH ---
+def fetch_premium_index():
+    """{symbol: {field: float}} of every futures symbol from one premiumIndex request."""
+    def request():
+        data = governor("futures").get(config.FUTURES_URL + PREMIUM_PATH, weight=10, label="premiumIndex").json()
+        if not isinstance(data, list):
+            raise RuntimeError(data)
+        return data
+
+    try:
+        data = coalesce((config.FUTURES_URL, "premiumIndex"), time.time() * 1000 + PREMIUM_TTL * 1000, request)
+    except Exception as e:
+        print(f"❌ premiumIndex error: {e}")
+        return {}
+    keys = ("time", "markPrice", "indexPrice", "lastFundingRate", "interestRate", "nextFundingTime")
+    return {p["symbol"]: {f: float(p[k] or "nan") for f, k in zip(PREMIUM_FIELDS, keys)} for p in data}
+
+
+def fetch_open_interest(symbol, period="1h", limit=OI_LIMIT):
+    """Open-interest history of `symbol` as {field: array}, oldest first (empty on error)."""
+    def request():
+        params = {"symbol": symbol, "period": period, "limit": limit}
+        data = governor("futures-data").get(config.FUTURES_URL + OI_PATH, params, label=symbol).json()
+        if not isinstance(data, list):
+            raise RuntimeError(data)
+        return data
+
+    try:
+        data = coalesce((config.FUTURES_URL, "openInterestHist", symbol, period, limit), next_close_ms(period),
+                        request)
+    except Exception as e:
+        print(f"❌ {symbol} openInterestHist error: {e}")
+        data = []
+    rows = sorted((float(d["timestamp"]), float(d["sumOpenInterest"]), float(d["sumOpenInterestValue"]))
+                  for d in data)
+    table = np.array(rows, dtype=np.float64).reshape(-1, len(OI_FIELDS))
+    return {f: table[:, i] for i, f in enumerate(OI_FIELDS)}
+
+
+def fetch_open_interest_many(symbols, period="1h", limit=OI_LIMIT, workers=8):
+    """{symbol: arrays} for many symbols, `workers` requests in flight at a time."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        series = pool.map(lambda s: fetch_open_interest(s, period, limit), symbols)
+        return {s: arrays for s, arrays in zip(symbols, series) if len(arrays['timestamp'])}
+
+
+# --- STORE ---
+def oi_file(symbol, period, data_dir=None):
+    return os.path.join(data_dir or config.DATA_DIR, "futures", f"openInterest_{period}", f"{symbol}.npz")
+
+
+def premium_file(day, data_dir=None):
+    return os.path.join(data_dir or config.DATA_DIR, "futures", "premiumIndex", f"{day}.npz")
+
+
+def _save(path, arrays):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(tmp, **arrays)
+    os.replace(tmp, path)
+
+
+def _load(path, fields):
+    try:
+        with np.load(path) as data:
+            return {f: data[f] for f in fields}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def load_open_interest(symbol, period="1h", data_dir=None):
+    return _load(oi_file(symbol, period, data_dir), OI_FIELDS)
+
+
+def save_open_interest(symbol, period, arrays, data_dir=None):
+    """Merge `arrays` into the stored series (one row per timestamp); returns the merged series."""
+    stored = load_open_interest(symbol, period, data_dir)
+    if stored is not None:
+        arrays = {f: np.concatenate([stored[f], arrays[f]]) for f in OI_FIELDS}
+    _, keep = np.unique(arrays['timestamp'], return_index=True)
+    merged = {f: arrays[f][keep] for f in OI_FIELDS}
+    _save(oi_file(symbol, period, data_dir), merged)
+    return merged
+
+
+def save_premium(snapshot, data_dir=None):
+    """Append one premiumIndex snapshot to the file of its UTC day (once per snapshot time)."""
+    if not snapshot:
+        return
+    symbols = sorted(snapshot)
+    row = {"symbol": np.array(symbols)}
+    row.update({f: np.array([snapshot[s][f] for s in symbols]) for f in PREMIUM_FIELDS})
+    day = datetime.fromtimestamp(np.nanmax(row["time"]) / 1000, timezone.utc).strftime("%Y-%m-%d")
+    path = premium_file(day, data_dir)
+    stored = _load(path, ("symbol",) + PREMIUM_FIELDS)
+    if stored is not None:
+        if len(stored["time"]) and stored["time"].max() >= row["time"].max():
+            return  # the same cached snapshot again
+        row = {f: np.concatenate([stored[f], row[f]]) for f in row}
+    _save(path, row)
+
+
+def load_premium(symbols=None, days=30, data_dir=None):
+    """{symbol: {field: array}} of the stored snapshots of the last `days` days, oldest first."""
+    directory = os.path.dirname(premium_file("x", data_dir))
+    try:
+        names = sorted(n for n in os.listdir(directory) if n.endswith(".npz"))[-days:]
+    except OSError:
+        return {}
+    parts = [p for p in (_load(os.path.join(directory, n), ("symbol",) + PREMIUM_FIELDS) for n in names) if p]
+    if not parts:
+        return {}
+    table = {f: np.concatenate([p[f] for p in parts]) for f in ("symbol",) + PREMIUM_FIELDS}
+    wanted = set(symbols) if symbols is not None else None
+    out = {}
+    for symbol in np.unique(table["symbol"]):
+        if wanted is not None and symbol not in wanted:
+            continue
+        rows = np.flatnonzero(table["symbol"] == symbol)
+        rows = rows[np.argsort(table["time"][rows], kind="stable")]
+        out[str(symbol)] = {f: table[f][rows] for f in PREMIUM_FIELDS}
+    return out
+
+
+def ingest(symbols, period="1h", limit=OI_LIMIT, workers=8, data_dir=None):
+    """One premiumIndex snapshot and the open interest of every symbol, fetched and stored."""
+    snapshot = fetch_premium_index()
+    wanted = set(symbols)
+    save_premium({s: v for s, v in snapshot.items() if s in wanted}, data_dir)
+    series = fetch_open_interest_many(symbols, period, limit, workers)
+    for symbol, arrays in series.items():
+        save_open_interest(symbol, period, arrays, data_dir)
+    return snapshot, series
+
+
+# --- INDICATOR INPUTS ---
+def inputs(df, open_interest=None, premium=None, change_bars=24):
+    """
+    Open interest and funding aligned onto the candle bars of `df`: the last value
+    observed at or before each bar's close (see mtf.asof). Columns: open_interest,
+    open_interest_value, oi_change_pct over `change_bars` candle bars, funding_rate
+    and basis_pct (mark over index).
+    """
+    import pandas as pd
+    from cryptobot.mtf import asof
+    out = pd.DataFrame(index=df.index)
+    if open_interest is not None and len(open_interest['timestamp']):
+        oi = pd.DataFrame({"close_time": open_interest['timestamp'], "open_interest": open_interest['open_interest'],
+                           "open_interest_value": open_interest['open_interest_value']})
+        out = out.join(asof(df, oi))
+        out["oi_change_pct"] = (out["open_interest"] / out["open_interest"].shift(change_bars) - 1) * 100
+    if premium is not None and len(premium['time']):
+        pi = pd.DataFrame({"close_time": premium['time'], "funding_rate": premium['funding_rate'],
+                           "basis_pct": (premium['mark_price'] / premium['index_price'] - 1) * 100})
+        out = out.join(asof(df, pi))
+    return out
+
+
+def latest_inputs(symbols, period="1h", change=24, workers=8):
+    """
+    Current funding, basis and open-interest change of every symbol (a DataFrame), from
+    one premiumIndex request and the open-interest batches; nothing is stored.
+    """
+    import pandas as pd
+    snapshot = fetch_premium_index()
+    series = fetch_open_interest_many(symbols, period, change + 1, workers)
+    rows = []
+    for symbol in symbols:
+        p, oi = snapshot.get(symbol, {}), series.get(symbol)
+        value = oi['open_interest_value'] if oi is not None else np.array([])
+        rows.append({"symbol": symbol, "funding_rate": p.get("funding_rate", np.nan),
+                     "basis_pct": (p["mark_price"] / p["index_price"] - 1) * 100 if p else np.nan,
+                     "open_interest_value": value[-1] if len(value) else np.nan,
+                     "oi_change_pct": (value[-1] / value[0] - 1) * 100 if len(value) > change else np.nan})
+    return pd.DataFrame(rows)
+
+
+def filter_checks(side, row, max_funding=None, min_oi_change=None):
+    """
+    Funding / open-interest conditions on one symbol's latest inputs (a latest_inputs
+    row): funding paid by the strategy side at most `max_funding` (a fraction), open
+    interest up at least `min_oi_change` %. Missing data fails the condition.
+    """
+    checks = {}
+    if max_funding is not None:
+        checks["funding"] = bool(side * row.get("funding_rate", np.nan) <= max_funding)
+    if min_oi_change is not None:
+        checks["oi_change"] = bool(row.get("oi_change_pct", np.nan) >= min_oi_change)
+    return checks
+
+
+def main(argv=None):
+    from cryptobot.universe import universe
+
+    parser = argparse.ArgumentParser(description="Store funding (premiumIndex) and open interest next to the candles")
+    parser.add_argument("--symbols-file", default=config.FUTURES_PAIRS_FILE)
+    parser.add_argument("--period", default="1h", choices=OI_PERIODS, help="open-interest period")
+    parser.add_argument("--limit", type=int, default=OI_LIMIT, help="open-interest rows per symbol (max 500)")
+    parser.add_argument("--workers", type=int, default=8, help="open-interest requests in flight")
+    parser.add_argument("--every", type=int, default=0, help="repeat every N seconds (0: once)")
+    args = parser.parse_args(argv)
+
+    symbols = universe("futures", args.symbols_file)
+    if not symbols:
+        print("❌ No symbols loaded from txt.")
+        return
+    while True:
+        start_time = time.time()
+        snapshot, series = ingest(symbols, args.period, args.limit, args.workers)
+        rates = np.array([snapshot[s]["funding_rate"] for s in symbols if s in snapshot])
+        print(f"💸 Funding of {len(rates)} symbols (mean {np.nanmean(rates) * 100 if len(rates) else np.nan:.4f} %), "
+              f"open interest of {len(series)}/{len(symbols)} ({args.period}) stored — "
+              f"{time.time() - start_time:.2f} sec")
+        if not args.every:
+            return
+        time.sleep(max(args.every - (time.time() - start_time), 0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+from datetime import datetime
+
+import requests
+
+from cryptobot import config
+from cryptobot.notify import send_telegram_message
+
+# 0089 BTC price vs BTC dominance check. It only needs two closes and one CoinGecko
+# number, so it deliberately stays on requests + the standard library: no numpy,
+# pandas or indicator imports on this path.
+
+STATE_FILE = "dominance_state.json"
+
+
+def _direction(new, old):
+    if old is None or new == old:
+        return "flat"
+    return "up" if new > old else "down"
+
+
+def get_btc_price_change(interval="1h"):
+    url = config.SPOT_URL + config.klines_path("spot")
+    data = requests.get(url, params={"symbol": "BTCUSDT", "interval": interval, "limit": 2},
+                        timeout=config.REQUEST_TIMEOUT).json()
+    return _direction(float(data[1][4]), float(data[0][4]))
+
+
+def get_btc_dominance_change(state_file=STATE_FILE):
+    data = requests.get(config.COINGECKO_URL + "/api/v3/global", timeout=config.REQUEST_TIMEOUT).json()
+    btc_dominance = data["data"]["market_cap_percentage"]["btc"]
+
+    last_dom = None
+    if os.path.exists(state_file):
+        with open(state_file, "r") as f:
+            last_dom = json.load(f).get("btc_dominance")
+    with open(state_file, "w") as f:
+        json.dump({"btc_dominance": btc_dominance}, f)
+    return _direction(btc_dominance, last_dom)
+
+
+def market_outcome(price_dir, dom_dir):
+    if price_dir == "up" and dom_dir == "up":
+        return "BTC Season: Bitcoin rally, alts underperform."
+    if price_dir == "up" and dom_dir == "down":
+        return "Altseason: BTC up, but alts pumping harder.Altcoins outperform"
+    if price_dir == "down" and dom_dir == "up":
+        return "Bearish for alts: BTC down, alts crash harder."
+    if price_dir == "down" and dom_dir == "down":
+        return "Late Bear: Both weak, money may move to stables."
+    if price_dir == "flat" and dom_dir == "up":
+        return "Dominance rising while BTC flat → capital consolidating into BTC.Good time to stack BTC. Avoid alts"
+    if price_dir == "flat" and dom_dir == "down":
+        return "Dominance falling while BTC flat → capital rotating to alts.Accumulate alts"
+    return "Mixed/Neutral: No clear signal."
+
+
+def get_arrow(direction):
+    return {"up": "🟢⬆️", "down": "🔴⬇️"}.get(direction, "➖")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BTC price vs BTC dominance update (0089)")
+    parser.add_argument("--interval", default="1h", help="Binance kline interval for the BTC price direction")
+    parser.add_argument("--state-file", default=STATE_FILE)
+    parser.add_argument("--no-telegram", action="store_true")
+    args = parser.parse_args(argv)
+
+    price_dir = get_btc_price_change(args.interval)
+    dom_dir = get_btc_dominance_change(args.state_file)
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    message = (
+        f"📊 <b>BTC & Dominance Update</b>\n"
+        f"⏰ {timestamp}\n\n"
+        f"💰 BTC Price: {price_dir.upper()} {get_arrow(price_dir)}\n"
+        f"📈 BTC Dominance: {dom_dir.upper()} {get_arrow(dom_dir)}\n\n"
+        f"🔮 Outcome: {market_outcome(price_dir, dom_dir)}"
+    )
+    print(message.replace("<b>", "").replace("</b>", ""))
+    if not args.no_telegram:
+        send_telegram_message(message, parse_mode="HTML")
+
+
+if __name__ == "__main__":
+    main()
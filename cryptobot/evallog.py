@@ -0,0 +1,112 @@
+import glob
+import gzip
+import json
+import math
+import os
+import threading
+import time
+import uuid
+
+from cryptobot import config
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # parquet is optional, batches fall back to gzipped JSON lines
+    pa = pq = None
+
+# Structured record of every (symbol, strategy) evaluation of a scan: the indicator
+# values on the last closed bar and the first condition that rejected it (the line the
+# scripts print as "🔴 SYMBOL - Failed: ..."). Rows are buffered in memory and written
+# once per scan as one Parquet file (zstd) or, without pyarrow, one gzipped JSONL file,
+# under <data dir>/evals/date=YYYY-MM-DD/, a layout pyarrow.dataset reads as a table.
+
+BASE_COLUMNS = ("scan_id", "scanned_at", "market", "symbol", "strategy", "interval", "bar_time",
+                "passed", "rejected_by", "failed")
+
+
+def _number(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+class EvaluationLog:
+    def __init__(self, out_dir=None):
+        self.out_dir = out_dir
+        self.lock = threading.Lock()
+        self.rows = []
+        self.scan_id = None
+        self.labels = {}
+        self.started = None
+
+    def directory(self):
+        return self.out_dir or os.path.join(config.DATA_DIR, "evals")
+
+    def start_scan(self, scan_id=None, **labels):
+        self.scan_id = scan_id or uuid.uuid4().hex[:12]
+        self.labels = labels
+        self.started = int(time.time() * 1000)
+
+    def add(self, symbol, strategy, interval, bar_time, failed, values=None):
+        """One evaluation; `failed` lists the conditions that did not hold, in test order."""
+        row = {"symbol": symbol, "strategy": strategy, "interval": interval,
+               "bar_time": None if bar_time is None else int(bar_time), "passed": not failed,
+               "rejected_by": failed[0] if failed else None, "failed": ",".join(failed)}
+        row.update({k: _number(v) for k, v in (values or {}).items()})
+        with self.lock:
+            self.rows.append(row)
+
+    def summary(self):
+        """{strategy: {"passed": n, <condition>: rejections}} of the buffered scan."""
+        out = {}
+        with self.lock:
+            rows = list(self.rows)
+        for row in rows:
+            counts = out.setdefault(row["strategy"], {"passed": 0})
+            key = "passed" if row["passed"] else row["rejected_by"]
+            counts[key] = counts.get(key, 0) + 1
+        return out
+
+    def flush(self):
+        """Write the buffered rows as one batch; returns the file written (None when empty)."""
+        with self.lock:
+            rows, self.rows = self.rows, []
+        if not rows:
+            return None
+        head = {"scan_id": self.scan_id, "scanned_at": self.started, "market": self.labels.get("market")}
+        names = list(BASE_COLUMNS) + sorted({k for r in rows for k in r} - set(BASE_COLUMNS))
+        columns = {k: [head[k]] * len(rows) if k in head else [r.get(k) for r in rows] for k in names}
+
+        day = time.strftime("%Y-%m-%d", time.gmtime(self.started / 1000))
+        out_dir = os.path.join(self.directory(), f"date={day}")
+        os.makedirs(out_dir, exist_ok=True)
+        stem = os.path.join(out_dir, f"evals-{self.started}-{self.scan_id}")
+        if pq is not None:
+            path = stem + ".parquet"
+            pq.write_table(pa.table(columns), path + ".tmp", compression="zstd")
+        else:
+            path = stem + ".jsonl.gz"
+            with gzip.open(path + ".tmp", "wt", compresslevel=5) as f:
+                f.write("".join(json.dumps({k: columns[k][i] for k in names}, separators=(",", ":")) + "\n"
+                                for i in range(len(rows))))
+        os.replace(path + ".tmp", path)
+        return path
+
+
+def load_evaluations(out_dir=None, since=None):
+    """All logged evaluations as one DataFrame (files of days before `since`, "YYYY-MM-DD", skipped)."""
+    import pandas as pd
+    root = out_dir or os.path.join(config.DATA_DIR, "evals")
+    frames = []
+    for day_dir in sorted(glob.glob(os.path.join(root, "date=*"))):
+        if since and day_dir.rsplit("=", 1)[-1] < since:
+            continue
+        for path in sorted(glob.glob(os.path.join(day_dir, "evals-*"))):
+            if path.endswith(".parquet"):
+                frames.append(pd.read_parquet(path))
+            elif path.endswith(".jsonl.gz"):
+                frames.append(pd.read_json(path, lines=True, compression="gzip"))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=list(BASE_COLUMNS))
@@ -0,0 +1,610 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from cryptobot import config
+from cryptobot.candles import INTERVAL_MS, load_symbol_list
+from cryptobot.ratelimit import klines_weight
+
+# Local stand-in for fapi.binance.com, api.binance.com, api.coingecko.com and
+# api.telegram.org. Klines are synthetic (a deterministic function of symbol, interval
+# and open time, so every page and every run returns the same bars) unless a fixture
+# directory with recorded payloads is given. Latency, rate-limit headers, 429s and
+# 5xx errors can be injected to benchmark the clients offline.
+#
+# Fixture layout (all optional, anything missing falls back to synthetic data):
+#   <dir>/<market>/exchangeInfo.json
+#   <dir>/<market>/ticker_24hr.json
+#   <dir>/<market>/klines/<SYMBOL>_<interval>.json
+#   <dir>/futures/leverageBracket.json
+#   <dir>/futures/premiumIndex.json
+#   <dir>/futures/openInterestHist/<SYMBOL>_<period>.json
+#   <dir>/coingecko_global.json
+
+WEIGHT_LIMIT = {"futures": 2400, "spot": 6000}
+DELISTED = ["OLDCOINUSDT", "DEADUSDT"]  # served with status BREAK to exercise symbol filters
+# (notional floor, notional cap, maintenance margin ratio, max leverage) of the synthetic brackets
+BRACKETS = [(0, 5_000, 0.01, 50), (5_000, 50_000, 0.015, 25), (50_000, 250_000, 0.02, 20),
+            (250_000, 1_000_000, 0.05, 10), (1_000_000, 5_000_000, 0.1, 5), (5_000_000, 30_000_000, 0.125, 2)]
+TWO32 = float(2 ** 32)
+
+
+# --- SYNTHETIC DATA ---
+def _seed(*parts):
+    return int.from_bytes(hashlib.sha1("|".join(map(str, parts)).encode()).digest()[:4], "little")
+
+
+def _noise(k, seed):
+    """Deterministic uniform [0, 1) noise per bar index (integer hash, no state)."""
+    x = (k.astype(np.uint64) * np.uint64(2654435761) + np.uint64(seed)) & np.uint64(0xFFFFFFFF)
+    x ^= x >> np.uint64(15)
+    x = (x * np.uint64(2246822519)) & np.uint64(0xFFFFFFFF)
+    x ^= x >> np.uint64(13)
+    return x.astype(np.float64) / TWO32
+
+
+def _price(symbol, k):
+    seed = _seed(symbol)
+    base = 0.05 + (seed % 20000) / 10.0
+    phase = (seed % 997) / 997.0 * 6.283
+    # hourly-scale swings on top of slower trends, expressed in minutes since epoch
+    m = k.astype(np.float64)
+    wave = 0.08 * np.sin(m / 9000 + phase) + 0.03 * np.sin(m / 700 + 2 * phase) + 0.01 * np.sin(m / 45 + phase)
+    return base * (1 + wave + 0.004 * (_noise(k, seed) - 0.5))
+
+
+def synthetic_klines(symbol, interval, start_ms, end_ms, limit, now_ms):
+    step = INTERVAL_MS[interval]
+    first = -(-start_ms // step) * step
+    last = min(end_ms, now_ms) // step * step
+    if last < first:
+        return []
+    open_time = np.arange(first, last + 1, step, dtype=np.int64)[:limit]
+    minutes = open_time // 60_000
+    span = step // 60_000
+    open_ = _price(symbol, minutes)
+    close = _price(symbol, minutes + span)
+    seed = _seed(symbol, interval)
+    wick = 0.002 * (1 + span ** 0.5 / 4)
+    high = np.maximum(open_, close) * (1 + wick * _noise(open_time // step, seed + 1))
+    low = np.minimum(open_, close) * (1 - wick * _noise(open_time // step, seed + 2))
+    volume = 1000 * span * (0.5 + _noise(open_time // step, seed + 3)) * (1 + seed % 50)
+    taker = 0.3 + 0.4 * _noise(open_time // step, seed + 4)
+    trades = (volume / 10).astype(np.int64) + 1
+    rows = []
+    for i in range(len(open_time)):
+        qv = volume[i] * close[i]
+        rows.append([
+            int(open_time[i]), f"{open_[i]:.8f}", f"{high[i]:.8f}", f"{low[i]:.8f}", f"{close[i]:.8f}",
+            f"{volume[i]:.3f}", int(open_time[i] + step - 1), f"{qv:.4f}", int(trades[i]),
+            f"{volume[i] * taker[i]:.3f}", f"{qv * taker[i]:.4f}", "0",
+        ])
+    return rows
+
+
+def _filter_rows(rows, start_ms, end_ms, limit):
+    rows = [r for r in rows if start_ms <= r[0] <= end_ms]
+    return rows[:limit] if start_ms else rows[-limit:]
+
+
+# =========================
+# SERVER
+# =========================
+class FakeExchange(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, host="127.0.0.1", symbols=None, fixtures=None, latency_ms=0,
+                 jitter_ms=0, error_rate=0.0, rate_limit_rate=0.0, weight_limit=None,
+                 now_ms=None, clock=None, seed=0):
+        super().__init__((host, port), _Handler)
+        self.fixtures = fixtures
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.weight_limit = dict(WEIGHT_LIMIT, **(weight_limit or {}))
+        self.frozen_now = now_ms
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.weight = {"futures": [0, 0], "spot": [0, 0]}  # market -> [minute, used]
+        self.requests = []
+        self.sent_messages = []
+        self.symbols = {
+            "futures": symbols or load_symbol_list(config.FUTURES_PAIRS_FULL_FILE) or ["BTCUSDT", "ETHUSDT"],
+            "spot": symbols or load_symbol_list(config.SPOT_PAIRS_FILE) or ["BTCUSDT", "ETHUSDT"],
+        }
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def now_ms(self):
+        if self.clock is not None:
+            return int(self.clock())
+        return self.frozen_now if self.frozen_now is not None else int(time.time() * 1000)
+
+    def use_weight(self, market, weight):
+        minute = self.now_ms() // 60_000
+        with self.lock:
+            state = self.weight[market]
+            if state[0] != minute:
+                state[0], state[1] = minute, 0
+            state[1] += weight
+            return state[1]
+
+    def fixture(self, *parts):
+        if not self.fixtures:
+            return None
+        path = os.path.join(self.fixtures, *parts)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    # --- plumbing ---
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, str(v))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _inject(self, market, weight):
+        srv = self.server
+        if srv.latency_ms or srv.jitter_ms:
+            time.sleep((srv.latency_ms + srv.rng.uniform(0, srv.jitter_ms)) / 1000)
+        headers = {}
+        if market:
+            used = srv.use_weight(market, weight)
+            headers["X-MBX-USED-WEIGHT-1M"] = used
+            headers["X-MBX-USED-WEIGHT"] = used
+            if used > srv.weight_limit[market]:
+                self._send(429, {"code": -1003, "msg": "Too many requests."},
+                           dict(headers, **{"Retry-After": 60 - (srv.now_ms() // 1000) % 60}))
+                return None
+        if srv.rate_limit_rate and srv.rng.random() < srv.rate_limit_rate:
+            self._send(429, {"code": -1003, "msg": "Too many requests."}, dict(headers, **{"Retry-After": 1}))
+            return None
+        if srv.error_rate and srv.rng.random() < srv.error_rate:
+            self._send(503, {"code": -1001, "msg": "Internal error; unable to process your request."}, headers)
+            return None
+        return headers
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def _route(self, method):
+        parsed = urlparse(self.path)
+        path = parsed.path
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        if method == "POST":
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length).decode() if length else ""
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                query.update(json.loads(raw or "{}"))
+            else:
+                query.update({k: v[0] for k, v in parse_qs(raw).items()})
+        self.server.requests.append((method, path, query))
+
+        market = "futures" if path.startswith("/fapi/") else "spot" if path.startswith("/api/v3/") else None
+        route = path.rsplit("/", 1)[-1]
+        try:
+            if path.startswith("/bot") and route == "sendMessage":
+                return self._telegram(path, query)
+            # CoinGecko shares the /api/v3 prefix with Binance spot
+            if path == "/api/v3/global":
+                return self._coingecko_global()
+            if market and route == "klines":
+                return self._klines(market, query)
+            if market and route == "24hr":
+                return self._ticker_24hr(market, query)
+            if market and route == "exchangeInfo":
+                return self._exchange_info(market)
+            if market == "futures" and route == "leverageBracket":
+                return self._leverage_bracket(query)
+            if market == "futures" and route == "premiumIndex":
+                return self._premium_index(query)
+            if path.startswith("/futures/data/") and route == "openInterestHist":
+                return self._open_interest_hist(query)
+            if market and route == "ping":
+                headers = self._inject(market, 1)
+                return headers is not None and self._send(200, {}, headers)
+            self._send(404, {"code": -1, "msg": f"Unknown path {path}"})
+        except (KeyError, ValueError) as e:
+            self._send(400, {"code": -1102, "msg": f"Bad request: {e}"})
+
+    # --- endpoints ---
+    def _klines(self, market, q):
+        limit = int(q.get("limit", 500))
+        weight = klines_weight(market, limit)
+        headers = self._inject(market, weight)
+        if headers is None:
+            return
+        symbol, interval = q["symbol"].upper(), q["interval"]
+        if symbol not in self.server.symbols[market]:
+            return self._send(400, {"code": -1121, "msg": "Invalid symbol."}, headers)
+        now = self.server.now_ms()
+        end_ms = int(q.get("endTime", now))
+        start_ms = int(q.get("startTime", 0))
+        recorded = self.server.fixture(market, "klines", f"{symbol}_{interval}.json")
+        if recorded is not None:
+            rows = _filter_rows(recorded, start_ms, end_ms, limit)
+        elif start_ms:
+            rows = synthetic_klines(symbol, interval, start_ms, end_ms, limit, now)
+        else:
+            step = INTERVAL_MS[interval]
+            rows = synthetic_klines(symbol, interval, (min(end_ms, now) // step - limit + 1) * step,
+                                    end_ms, limit, now)
+        self._send(200, rows, headers)
+
+    def _ticker_24hr(self, market, q):
+        symbol = q.get("symbol", "").upper()
+        headers = self._inject(market, 1 if symbol else 40)
+        if headers is None:
+            return
+        recorded = self.server.fixture(market, "ticker_24hr.json")
+        if recorded is not None:
+            tickers = {t["symbol"]: t for t in recorded}
+        else:
+            names = [symbol] if symbol else self.server.symbols[market]
+            tickers = {s: self._synthetic_ticker(s) for s in names if s in self.server.symbols[market]}
+        if symbol:
+            if symbol not in tickers:
+                return self._send(400, {"code": -1121, "msg": "Invalid symbol."}, headers)
+            return self._send(200, tickers[symbol], headers)
+        self._send(200, list(tickers.values()), headers)
+
+    def _synthetic_ticker(self, symbol):
+        now = self.server.now_ms()
+        rows = synthetic_klines(symbol, "15m", now - 86_400_000, now, 96, now)
+        first_open, last = float(rows[0][1]), float(rows[-1][4])
+        quote = sum(float(r[7]) for r in rows)
+        return {
+            "symbol": symbol, "lastPrice": f"{last:.8f}", "openPrice": f"{first_open:.8f}",
+            "priceChange": f"{last - first_open:.8f}",
+            "priceChangePercent": f"{(last / first_open - 1) * 100:.3f}",
+            "highPrice": f"{max(float(r[2]) for r in rows):.8f}",
+            "lowPrice": f"{min(float(r[3]) for r in rows):.8f}",
+            "volume": f"{sum(float(r[5]) for r in rows):.3f}", "quoteVolume": f"{quote:.4f}",
+            "openTime": rows[0][0], "closeTime": now, "count": sum(r[8] for r in rows),
+        }
+
+    def _exchange_info(self, market):
+        headers = self._inject(market, 1 if market == "futures" else 20)
+        if headers is None:
+            return
+        info = self.server.fixture(market, "exchangeInfo.json")
+        if info is None:
+            info = {"timezone": "UTC", "serverTime": self.server.now_ms(), "symbols": []}
+            for symbol in self.server.symbols[market] + DELISTED:
+                price = float(_price(symbol, np.array([self.server.now_ms() // 60_000]))[0])
+                tick = 10 ** (int(np.floor(np.log10(price))) - 4)
+                entry = {
+                    "symbol": symbol, "status": "BREAK" if symbol in DELISTED else "TRADING",
+                    "baseAsset": symbol[:-4], "quoteAsset": "USDT",
+                    "filters": [
+                        {"filterType": "PRICE_FILTER", "tickSize": f"{tick:.10f}".rstrip("0")},
+                        {"filterType": "LOT_SIZE", "stepSize": "1" if price < 1 else "0.001",
+                         "minQty": "1" if price < 1 else "0.001"},
+                    ],
+                }
+                if market == "futures":
+                    entry.update({"contractType": "PERPETUAL", "marginAsset": "USDT"})
+                info["symbols"].append(entry)
+        etag = '"' + hashlib.sha1(json.dumps(info["symbols"], sort_keys=True).encode()).hexdigest()[:16] + '"'
+        headers["ETag"] = etag
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send(200, info, headers)
+
+    def _leverage_bracket(self, q):
+        headers = self._inject("futures", 1)
+        if headers is None:
+            return
+        if not self.headers.get("X-MBX-APIKEY") or "signature" not in q:
+            return self._send(401, {"code": -2015, "msg": "Invalid API-key, IP, or permissions for action."}, headers)
+        data = self.server.fixture("futures", "leverageBracket.json")
+        if data is None:
+            data, cum, prev_mmr = [], [], 0.0
+            for floor, _, mmr, _ in BRACKETS:
+                cum.append((cum[-1] if cum else 0.0) + floor * (mmr - prev_mmr))
+                prev_mmr = mmr
+            for symbol in self.server.symbols["futures"]:
+                data.append({"symbol": symbol, "brackets": [
+                    {"bracket": i + 1, "initialLeverage": lev, "notionalCap": cap, "notionalFloor": floor,
+                     "maintMarginRatio": mmr, "cum": cum[i]}
+                    for i, (floor, cap, mmr, lev) in enumerate(BRACKETS)]})
+        symbol = q.get("symbol", "").upper()
+        if symbol:
+            data = [d for d in data if d["symbol"] == symbol]
+        self._send(200, data, headers)
+
+    def _premium_index(self, q):
+        symbol = q.get("symbol", "").upper()
+        headers = self._inject("futures", 1 if symbol else 10)
+        if headers is None:
+            return
+        data = self.server.fixture("futures", "premiumIndex.json")
+        if data is None:
+            now = self.server.now_ms()
+            data = []
+            for s in self.server.symbols["futures"]:
+                seed = _seed(s, "funding")
+                mark = float(_price(s, np.array([now // 60_000]))[0])
+                rate = 0.0001 + 0.0004 * np.sin(now / 28_800_000 + seed % 628 / 100)
+                data.append({
+                    "symbol": s, "markPrice": f"{mark:.8f}", "indexPrice": f"{mark * (1 - rate / 2):.8f}",
+                    "estimatedSettlePrice": f"{mark:.8f}", "lastFundingRate": f"{rate:.8f}",
+                    "interestRate": "0.00010000", "nextFundingTime": (now // 28_800_000 + 1) * 28_800_000,
+                    "time": now,
+                })
+        if symbol:
+            match = [d for d in data if d["symbol"] == symbol]
+            if not match:
+                return self._send(400, {"code": -1121, "msg": "Invalid symbol."}, headers)
+            return self._send(200, match[0], headers)
+        self._send(200, data, headers)
+
+    def _open_interest_hist(self, q):
+        # /futures/data/* has its own request limit and no weight headers
+        headers = self._inject(None, 0)
+        if headers is None:
+            return
+        symbol, period = q["symbol"].upper(), q["period"]
+        limit = min(int(q.get("limit", 30)), 500)
+        if symbol not in self.server.symbols["futures"]:
+            return self._send(400, {"code": -1121, "msg": "Invalid symbol."}, headers)
+        step, now = INTERVAL_MS[period], self.server.now_ms()
+        recorded = self.server.fixture("futures", "openInterestHist", f"{symbol}_{period}.json")
+        if recorded is not None:
+            rows = [r for r in recorded if int(q.get("startTime", 0)) <= r["timestamp"] <= int(q.get("endTime", now))]
+            return self._send(200, rows[:limit] if "startTime" in q else rows[-limit:], headers)
+        # only the last 30 days are served, like Binance
+        first = max(int(q.get("startTime", 0)), now - 30 * 86_400_000)
+        last = min(int(q.get("endTime", now)), now) // step * step
+        stamps = np.arange(-(-first // step) * step, last + 1, step, dtype=np.int64)
+        stamps = stamps[:limit] if "startTime" in q else stamps[-limit:]
+        seed = _seed(symbol, "oi")
+        units = 1e6 * (1 + seed % 50) / (0.05 + (_seed(symbol) % 20000) / 10.0)
+        oi = units * (1 + 0.2 * np.sin(stamps / 86_400_000 + seed % 628 / 100)
+                      + 0.02 * (_noise(stamps // 300_000, seed) - 0.5))
+        value = oi * _price(symbol, stamps // 60_000)
+        self._send(200, [{"symbol": symbol, "sumOpenInterest": f"{oi[i]:.8f}",
+                          "sumOpenInterestValue": f"{value[i]:.8f}", "timestamp": int(stamps[i])}
+                         for i in range(len(stamps))], headers)
+
+    def _coingecko_global(self):
+        headers = self._inject(None, 0)
+        if headers is None:
+            return
+        recorded = self.server.fixture("coingecko_global.json")
+        if recorded is None:
+            hour = self.server.now_ms() // 3_600_000
+            btc = 55 + 5 * np.sin(hour / 50) + float(_noise(np.array([hour]), 7)[0])
+            recorded = {"data": {"market_cap_percentage": {"btc": round(float(btc), 4), "eth": 13.2}}}
+        self._send(200, recorded, headers)
+
+    def _telegram(self, path, q):
+        headers = self._inject(None, 0)
+        if headers is None:
+            return
+        if "chat_id" not in q or "text" not in q:
+            return self._send(400, {"ok": False, "error_code": 400, "description": "Bad Request: message text is empty"})
+        msg = {"message_id": len(self.server.sent_messages) + 1, "chat": {"id": q["chat_id"]},
+               "date": self.server.now_ms() // 1000, "text": q["text"]}
+        self.server.sent_messages.append(msg)
+        self._send(200, {"ok": True, "result": msg}, headers)
+
+
+# =========================
+# WEBSOCKET STAND-IN
+# =========================
+class SimClock:
+    """Simulated exchange time running `speed` times faster than the wall clock."""
+
+    def __init__(self, start_ms=None, speed=1.0):
+        self.start_ms = start_ms if start_ms is not None else int(time.time() * 1000)
+        self.speed = speed
+        self.started = time.time()
+
+    def __call__(self):
+        return self.start_ms + (time.time() - self.started) * 1000 * self.speed
+
+
+class FakeKlineStream:
+    """
+    Combined-stream kline server (/stream?streams=btcusdt@kline_1m/...). Every `tick`
+    seconds each subscribed stream receives an update of its forming bar, plus the
+    final x=true event when the bar closes on `clock`. Bars match the REST klines.
+    """
+
+    def __init__(self, port=0, host="127.0.0.1", clock=None, tick=0.2):
+        self.host, self.port = host, port
+        self.clock = clock or SimClock()
+        self.tick = tick
+        self.sent = 0
+        self._loop = None
+        self._server = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}"
+
+    def _event(self, symbol, interval, open_time, now, closed):
+        step = INTERVAL_MS[interval]
+        row = synthetic_klines(symbol, interval, open_time, open_time, 1, open_time + step)[0]
+        if not closed:
+            # a forming bar drifts from its open towards the final close
+            frac = min(max((now - open_time) / step, 0.0), 1.0)
+            o, c = float(row[1]), float(row[4])
+            row[4] = f"{o + (c - o) * frac:.8f}"
+        k = {"t": row[0], "T": row[6], "s": symbol, "i": interval, "o": row[1], "c": row[4],
+             "h": row[2], "l": row[3], "v": row[5], "n": row[8], "x": closed, "q": row[7],
+             "V": row[9], "Q": row[10]}
+        return json.dumps({"stream": f"{symbol.lower()}@kline_{interval}",
+                           "data": {"e": "kline", "E": int(now), "s": symbol, "k": k}})
+
+    async def _handler(self, ws):
+        from websockets.exceptions import ConnectionClosed
+        try:
+            await self._publish(ws)
+        except ConnectionClosed:
+            pass
+
+    async def _publish(self, ws):
+        import asyncio
+        query = parse_qs(urlparse(ws.request.path).query)
+        streams = [s.split("@kline_") for s in query.get("streams", [""])[0].split("/") if "@kline_" in s]
+        last_open = {}
+        while True:
+            now = self.clock()
+            for sym, interval in streams:
+                step = INTERVAL_MS[interval]
+                open_time = int(now // step * step)
+                prev = last_open.get((sym, interval))
+                if prev is not None and prev < open_time:
+                    await ws.send(self._event(sym.upper(), interval, prev, now, True))
+                    self.sent += 1
+                last_open[(sym, interval)] = open_time
+                await ws.send(self._event(sym.upper(), interval, open_time, now, False))
+                self.sent += 1
+            await asyncio.sleep(self.tick)
+
+    def start(self):
+        import asyncio
+        from websockets.asyncio.server import serve
+
+        async def main():
+            self._server = await serve(self._handler, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._server.wait_closed()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(main())
+            except RuntimeError:
+                pass
+
+        threading.Thread(target=run, daemon=True).start()
+        self._ready.wait(5)
+        return self
+
+    def drop_connections(self):
+        """Close every client connection (to exercise reconnect + REST gap-fill)."""
+        for conn in list(self._server.connections):
+            self._loop.call_soon_threadsafe(conn.transport.abort)
+
+    def stop(self):
+        if self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+
+
+# =========================
+# HELPERS
+# =========================
+def start(**options):
+    """Start a FakeExchange on a background thread and return it (see .url)."""
+    server = FakeExchange(**options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@contextmanager
+def running(**options):
+    """Run a fake exchange and point cryptobot.config at it for the duration."""
+    server = start(**options)
+    saved = (config.FUTURES_URL, config.SPOT_URL, config.COINGECKO_URL, config.TELEGRAM_URL, config.HTTP_CACHE)
+    config.FUTURES_URL = config.SPOT_URL = config.COINGECKO_URL = config.TELEGRAM_URL = server.url
+    if options.get("clock") is not None:
+        # response cache expiry follows the wall clock, a simulated one would leave it stale
+        config.HTTP_CACHE = False
+    try:
+        yield server
+    finally:
+        config.FUTURES_URL, config.SPOT_URL, config.COINGECKO_URL, config.TELEGRAM_URL, config.HTTP_CACHE = saved
+        server.shutdown()
+        server.server_close()
+
+
+def record_fixtures(out_dir, symbols, intervals=("15m", "1h"), limit=500):
+    """Save real exchange payloads (against whatever config points at) as fixtures."""
+    import requests
+    for market in ("futures", "spot"):
+        base = config.base_url(market)
+        prefix = "/fapi/v1" if market == "futures" else "/api/v3"
+        os.makedirs(os.path.join(out_dir, market, "klines"), exist_ok=True)
+        for name, route in (("exchangeInfo.json", "/exchangeInfo"), ("ticker_24hr.json", "/ticker/24hr")):
+            with open(os.path.join(out_dir, market, name), "w") as f:
+                json.dump(requests.get(base + prefix + route, timeout=30).json(), f)
+        for symbol in symbols:
+            for interval in intervals:
+                rows = requests.get(base + config.klines_path(market), timeout=30,
+                                    params={"symbol": symbol, "interval": interval, "limit": limit}).json()
+                if isinstance(rows, list):
+                    with open(os.path.join(out_dir, market, "klines", f"{symbol}_{interval}.json"), "w") as f:
+                        json.dump(rows, f)
+            time.sleep(0.1)
+    with open(os.path.join(out_dir, "coingecko_global.json"), "w") as f:
+        json.dump(requests.get(config.COINGECKO_URL + "/api/v3/global", timeout=30).json(), f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local fake Binance / CoinGecko / Telegram server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", help="directory with recorded payloads")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--futures-weight-limit", type=int, default=WEIGHT_LIMIT["futures"])
+    parser.add_argument("--spot-weight-limit", type=int, default=WEIGHT_LIMIT["spot"])
+    parser.add_argument("--now", type=int, help="freeze the clock at this ms timestamp")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = FakeExchange(
+        port=args.port, fixtures=args.fixtures, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, now_ms=args.now, seed=args.seed,
+        weight_limit={"futures": args.futures_weight_limit, "spot": args.spot_weight_limit})
+    print(f"🧪 Fake exchange on {server.url}")
+    for var in ("FUTURES", "SPOT", "COINGECKO", "TELEGRAM"):
+        print(f"   export CRYPTOBOT_{var}_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped.")
+
+
+if __name__ == "__main__":
+    main()
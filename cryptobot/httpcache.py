@@ -0,0 +1,97 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from cryptobot import config
+
+# Response cache for REST payloads whose lifetime is known in advance: klines stay
+# valid until the interval's next close, 24hr tickers for a short TTL. Entries live in
+# a bounded in-memory LRU and as gzipped JSON files in data/cache/http/. Files are
+# written to a temp name and renamed into place, so concurrent readers (threads or
+# other processes) always see either the old or the new complete entry.
+#
+# Documents refreshed on a TTL of their own (exchangeInfo, leverage brackets) are
+# kept as one plain JSON file each with `read_entry` / `write_entry`; the caller
+# stores its fetch time in the entry and decides when it is stale.
+
+TICKER_TTL = 30
+MEMORY_ITEMS = 2048
+
+
+class ResponseCache:
+    def __init__(self, directory=None, memory_items=MEMORY_ITEMS, disk=True):
+        self.directory = directory
+        self.memory_items = memory_items
+        self.disk = disk
+        self.lock = threading.Lock()
+        self.memory = OrderedDict()
+        self.stats = {"memory": 0, "disk": 0, "miss": 0}
+
+    def path(self, key):
+        name = hashlib.sha1(json.dumps(key).encode()).hexdigest()[:20]
+        return os.path.join(self.directory or os.path.join(config.DATA_DIR, "cache", "http"), name)
+
+    def _remember(self, key, expires_ms, data):
+        with self.lock:
+            self.memory[key] = (expires_ms, data)
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.memory_items:
+                self.memory.popitem(last=False)
+
+    def get(self, key, now_ms=None):
+        """Cached payload of `key`, or None when missing or expired."""
+        now_ms = now_ms if now_ms is not None else time.time() * 1000
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None and entry[0] > now_ms:
+                self.memory.move_to_end(key)
+                self.stats["memory"] += 1
+                return entry[1]
+        if self.disk:
+            try:
+                with gzip.open(self.path(key) + ".json.gz", "rt") as f:
+                    stored = json.load(f)
+                if stored["key"] == json.loads(json.dumps(key)) and stored["expires"] > now_ms:
+                    self._remember(key, stored["expires"], stored["data"])
+                    with self.lock:
+                        self.stats["disk"] += 1
+                    return stored["data"]
+            except (OSError, ValueError, KeyError, EOFError):
+                pass
+        with self.lock:
+            self.stats["miss"] += 1
+        return None
+
+    def put(self, key, data, expires_ms):
+        self._remember(key, expires_ms, data)
+        if not self.disk:
+            return
+        path = self.path(key) + ".json.gz"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp, "wt", compresslevel=5) as f:
+            json.dump({"key": key, "expires": expires_ms, "data": data}, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+
+# --- DOCUMENT FILES ---
+def read_entry(path):
+    """The JSON document stored at `path`, or None when missing or unreadable."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_entry(path, entry):
+    """Store `entry` at `path` through a temp file, so readers never see a partial document."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)
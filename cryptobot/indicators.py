@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+# Pandas ports of the indicators used by the screener scripts.
+# They mirror pandas_ta / the hand-written versions so backtests see the same numbers.
+
+
+def sma(series, length):
+    return series.rolling(length).mean()
+
+
+def ema(series, length):
+    # pandas_ta style: seed with the SMA of the first `length` values, then recursive EMA
+    if len(series) < length:
+        return pd.Series(np.nan, index=series.index)
+    seeded = series.copy().astype(float)
+    seeded.iloc[:length - 1] = np.nan
+    seeded.iloc[length - 1] = series.iloc[:length].mean()
+    return seeded.ewm(span=length, adjust=False, ignore_na=True).mean()
+
+
+def rma(series, length):
+    return series.ewm(alpha=1.0 / length, min_periods=length).mean()
+
+
+def rsi(close, length=14):
+    delta = close.diff()
+    gain = delta.clip(lower=0)
+    loss = (-delta).clip(lower=0)
+    avg_gain = rma(gain, length)
+    avg_loss = rma(loss, length)
+    return 100 * avg_gain / (avg_gain + avg_loss)
+
+
+def true_range(df):
+    prev_close = df['close'].shift(1)
+    tr = pd.concat([
+        df['high'] - df['low'],
+        (df['high'] - prev_close).abs(),
+        (df['low'] - prev_close).abs(),
+    ], axis=1).max(axis=1, skipna=False)
+    return tr
+
+
+def dmi(df, length=14):
+    """+DI, -DI and ADX as pandas_ta.adx (RMA smoothing)."""
+    up = df['high'].diff()
+    down = -df['low'].diff()
+    plus_dm = up.where((up > down) & (up > 0), 0.0)
+    minus_dm = down.where((down > up) & (down > 0), 0.0)
+    atr = rma(true_range(df), length)
+    plus = 100 * rma(plus_dm, length) / atr
+    minus = 100 * rma(minus_dm, length) / atr
+    dx = 100 * (plus - minus).abs() / (plus + minus)
+    return plus, minus, rma(dx, length)
+
+
+def choppiness_index(df, length=14):
+    """
+    CI = 100 * log10(sum(ATR(1), n) / (highest(high, n) - lowest(low, n))) / log10(n)
+    """
+    atr_sum = true_range(df).rolling(length).sum()
+    highest_high = df['high'].rolling(length).max()
+    lowest_low = df['low'].rolling(length).min()
+    denom = (highest_high - lowest_low).replace(0, np.nan)
+    return 100 * np.log10(atr_sum / denom) / np.log10(length)
+
+
+# --- Custom TradingView-style SMI (same maths as 0084/0085) ---
+def smi_tradingview(df, length=21, smooth_k=5, smooth_d=5):
+    highest = df['high'].rolling(length).max()
+    lowest = df['low'].rolling(length).min()
+
+    diff = df['close'] - (highest + lowest) / 2
+    hl_range = highest - lowest
+
+    diff_smoothed = diff.ewm(span=smooth_k).mean().ewm(span=smooth_k).mean()
+    hl_smoothed = hl_range.ewm(span=smooth_k).mean().ewm(span=smooth_k).mean()
+
+    smi = 100 * (diff_smoothed / (hl_smoothed / 2))
+    smi_signal = smi.ewm(span=smooth_d).mean()
+    return smi, smi_signal
+
+
+def cross_state(fast, slow):
+    """
+    Per-bar version of last_cross_event_idx() from 0086/0087.
+    Returns (kind, bars_since): kind is +1 for the last cross being bullish, -1 bearish,
+    0 if no cross yet; bars_since counts bars since the bar on which the sign flipped.
+    """
+    diff = (fast - slow).to_numpy()
+    sign = np.sign(diff)
+    prev = np.roll(sign, 1)
+    prev[0] = np.nan
+    changed = (sign != prev) & ~np.isnan(prev) & ~np.isnan(sign)
+    bullish = changed & (prev < 0) & (sign > 0)
+    bearish = changed & (prev > 0) & (sign < 0)
+
+    idx = np.arange(len(diff))
+    last_change = pd.Series(np.where(changed, idx, np.nan)).ffill().to_numpy()
+    event = np.where(bullish, 1.0, np.where(bearish, -1.0, np.where(changed, 0.0, np.nan)))
+    kind = pd.Series(event).ffill().fillna(0).to_numpy()
+    bars_since = idx - last_change
+    return (pd.Series(kind, index=fast.index),
+            pd.Series(bars_since, index=fast.index))
+
+
+def confirmed_swings(df, length):
+    """
+    Swing highs/lows as in 0092 (strictly above/below `length` bars on each side).
+    A swing at bar i is only known at bar i + length, so for every bar this returns
+    the index of the last swing high / swing low already confirmed at that bar.
+    """
+    high, low = df['high'], df['low']
+    is_high = pd.Series(True, index=df.index)
+    is_low = pd.Series(True, index=df.index)
+    for i in range(1, length + 1):
+        is_high &= (high > high.shift(i)) & (high > high.shift(-i))
+        is_low &= (low < low.shift(i)) & (low < low.shift(-i))
+
+    idx = pd.Series(np.arange(len(df)), index=df.index, dtype=float)
+    last_high = idx.where(is_high).shift(length).ffill()
+    last_low = idx.where(is_low).shift(length).ffill()
+    return last_high, last_low
+
+
+def rolling_quote_volume(df, bars):
+    # Stand-in for the 24h ticker quoteVolume when replaying history
+    return df['quote_volume'].rolling(bars, min_periods=1).sum()
@@ -0,0 +1,206 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from cryptobot import config
+from cryptobot import indicators as ind
+from cryptobot import orderflow
+from cryptobot.candles import bars_per_day, load_symbol_list
+from cryptobot.registry import STRATEGY_SPECS
+
+# Append-only journal of every signal the scanners emit, and a batch job scoring them.
+# Each signal is one JSON line in data/journal/signals.jsonl (strategy, symbol, side,
+# bar time, price, score and an indicator / order-flow snapshot of the signal bar);
+# lines are only ever appended, so the record survives the per-run signal files being
+# overwritten.
+# The outcome job gathers the bars after every journaled signal from the candle store
+# in one indexed pass and reports forward return, maximum favourable excursion (MFE)
+# and maximum adverse excursion (MAE) per horizon, all signed by the strategy side.
+
+HORIZONS = (1, 4, 8, 24, 96)  # bars of the signal's interval
+KEY = ["strategy", "symbol", "interval", "bar_time"]
+
+
+def journal_path(path=None):
+    return path or os.path.join(config.DATA_DIR, "journal", "signals.jsonl")
+
+
+# --- RECORD ---
+def snapshot(df, interval):
+    """Indicator values on the last bar of `df` (the signal bar)."""
+    close = df['close']
+    last = float(close.iat[-1])
+    atr = ind.rma(ind.true_range(df), 14).iat[-1]
+    flow = orderflow.features(df)
+    values = {
+        "rsi14": ind.rsi(close, 14).iat[-1],
+        "atr14_pct": atr / last * 100,
+        "ema21_dist_pct": (last / ind.ema(close, 21).iat[-1] - 1) * 100,
+        "quote_volume_24h": ind.rolling_quote_volume(df, bars_per_day(interval)).iat[-1],
+        "taker_imbalance": flow["imbalance"][-1],
+        "trades_z": flow["trades_z"][-1],
+    }
+    return {k: None if pd.isna(v) else round(float(v), 6) for k, v in values.items()}
+
+
+def signal_entry(strategy, symbol, interval, df, score=None, market="futures"):
+    return {
+        "strategy": strategy, "symbol": symbol, "interval": interval, "market": market,
+        "side": STRATEGY_SPECS[strategy]["side"], "bar_time": int(df['open_time'].iat[-1]),
+        "price": float(df['close'].iat[-1]),
+        "score": None if score is None or pd.isna(score) else round(float(score), 6),
+        "indicators": snapshot(df, interval), "logged_at": int(time.time() * 1000),
+    }
+
+
+def record(entries, path=None):
+    """Append entries as JSON lines (one write, so concurrent scanners do not interleave lines)."""
+    if not entries:
+        return
+    path = journal_path(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        f.write("".join(json.dumps(e, separators=(",", ":")) + "\n" for e in entries))
+
+
+def load_journal(path=None):
+    """Journaled signals, one row per (strategy, symbol, interval, bar), first record kept."""
+    path = journal_path(path)
+    rows = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue  # a line cut short by a crash
+    except OSError:
+        pass
+    if not rows:
+        return pd.DataFrame(columns=KEY + ["market", "side", "price", "score"])
+    table = pd.DataFrame(rows)
+    return table.drop_duplicates(KEY, keep="first").reset_index(drop=True)
+
+
+# --- OUTCOMES ---
+def outcomes(journal, candles, horizons=HORIZONS):
+    """
+    Forward return, MFE and MAE after every journaled signal, signed by its side.
+    `candles` maps (symbol, interval) to candle arrays; all of them are concatenated
+    into one flat array so every signal and horizon is a single gather. Columns of
+    a horizon that has not fully elapsed on the stored bars are NaN.
+    """
+    out = journal.copy()
+    horizons = sorted(horizons)
+    span = horizons[-1]
+    keys = list(candles)
+    offsets = np.cumsum([0] + [len(candles[k]['open_time']) for k in keys])
+    # one trailing NaN bar: gathers outside a series land on it
+    flat = {f: np.concatenate([np.asarray(candles[k][f], dtype=np.float64) for k in keys] + [[np.nan]])
+            for f in ("open_time", "high", "low", "close")}
+
+    # position of every signal bar in the flat arrays, and where its series ends
+    pos = np.full(len(out), -1, dtype=np.int64)
+    end = np.zeros(len(out), dtype=np.int64)
+    slot = {k: i for i, k in enumerate(keys)}
+    for (symbol, interval), rows in out.groupby(["symbol", "interval"]).groups.items():
+        i = slot.get((symbol, interval))
+        if i is None:
+            continue
+        lo, hi = offsets[i], offsets[i + 1]
+        bar = out.loc[rows, "bar_time"].to_numpy(dtype=np.float64)
+        j = lo + np.searchsorted(flat["open_time"][lo:hi], bar)
+        at = out.index.get_indexer(rows)
+        pos[at] = np.where((j < hi) & (flat["open_time"][j] == bar), j, -1)
+        end[at] = hi
+
+    known = pos >= 0
+    ahead = pos[:, None] + np.arange(1, span + 1)[None, :]
+    valid = known[:, None] & (ahead < end[:, None])
+    take = np.where(valid, ahead, len(flat["close"]) - 1)
+    closes = flat["close"][take]
+    run_high = np.fmax.accumulate(flat["high"][take], axis=1)
+    run_low = np.fmin.accumulate(flat["low"][take], axis=1)
+
+    price = out["price"].to_numpy(dtype=np.float64)[:, None]
+    side = out["side"].to_numpy(dtype=np.float64)[:, None]
+    fwd = side * (closes / price - 1)
+    up, down = run_high / price - 1, run_low / price - 1
+    mfe = np.where(side > 0, up, -down)
+    mae = np.where(side > 0, down, -up)
+    for h in horizons:
+        done = valid[:, h - 1]
+        out[f"ret_{h}"] = np.where(done, fwd[:, h - 1], np.nan)
+        out[f"mfe_{h}"] = np.where(done, mfe[:, h - 1], np.nan)
+        out[f"mae_{h}"] = np.where(done, mae[:, h - 1], np.nan)
+    out["in_store"] = known
+    return out
+
+
+def scorecard(scored, horizons=HORIZONS):
+    """Per strategy and interval: signals, resolved count, mean return, win rate, MFE and MAE per horizon."""
+    rows = []
+    for (strategy, interval), group in scored.groupby(["strategy", "interval"]):
+        row = {"strategy": strategy, "interval": interval, "signals": len(group)}
+        for h in sorted(horizons):
+            ret = group[f"ret_{h}"].dropna()
+            row[f"n_{h}"] = len(ret)
+            row[f"avg_ret_{h}"] = ret.mean() if len(ret) else np.nan
+            row[f"win_{h}"] = (ret > 0).mean() if len(ret) else np.nan
+            row[f"mfe_{h}"] = group[f"mfe_{h}"].mean()
+            row[f"mae_{h}"] = group[f"mae_{h}"].mean()
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def load_candles_for(journal, market="futures", fetch=0):
+    """{(symbol, interval): arrays} for the signals of `journal` (stored candles, or the last `fetch` bars)."""
+    from cryptobot.sweep import load_or_fetch
+    candles = {}
+    for interval, group in journal[journal["market"] == market].groupby("interval"):
+        universe = load_or_fetch(sorted(group["symbol"].unique()), interval, market, fetch)
+        candles.update({(symbol, interval): arrays for symbol, arrays in universe.items()})
+    return candles
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Forward returns, MFE and MAE of every journaled signal")
+    parser.add_argument("--journal", help="journal file (default: <data dir>/journal/signals.jsonl)")
+    parser.add_argument("--market", default="futures", choices=["futures", "spot"])
+    parser.add_argument("--horizons", type=int, nargs="+", default=list(HORIZONS), help="bars after the signal")
+    parser.add_argument("--strategies", nargs="+", help="only these strategies")
+    parser.add_argument("--symbols-file", help="only the symbols in this list")
+    parser.add_argument("--fetch", type=int, default=0, help="fetch the last N bars over REST instead of the data dir")
+    parser.add_argument("--out", help="write every scored signal to this CSV file")
+    args = parser.parse_args(argv)
+
+    journal = load_journal(args.journal)
+    if args.strategies:
+        journal = journal[journal["strategy"].isin(args.strategies)]
+    if args.symbols_file:
+        journal = journal[journal["symbol"].isin(load_symbol_list(args.symbols_file))]
+    journal = journal[journal["market"] == args.market].reset_index(drop=True)
+    if journal.empty:
+        print("⚠️ No journaled signals.")
+        return
+
+    start_time = time.time()
+    candles = load_candles_for(journal, args.market, args.fetch)
+    scored = outcomes(journal, candles, args.horizons)
+    card = scorecard(scored, args.horizons)
+    duration = time.time() - start_time
+
+    with pd.option_context("display.width", 250, "display.max_columns", 60):
+        print(card.to_string(index=False))
+    missing = int((~scored["in_store"]).sum())
+    print(f"\n📒 {len(scored)} signals scored ({missing} without candles) — {duration:.2f} sec")
+    if args.out:
+        scored.drop(columns=["indicators"], errors="ignore").to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
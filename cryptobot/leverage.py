@@ -0,0 +1,192 @@
+import argparse
+import hashlib
+import hmac
+import os
+import time
+from urllib.parse import urlencode
+
+import numpy as np
+import pandas as pd
+import requests
+
+from cryptobot import config
+from cryptobot.httpcache import read_entry, write_entry
+from cryptobot.ratelimit import governor
+from cryptobot.recovery import load_positions, market_prices
+
+# Leveraged loss recovery (Wunder-Trading/Loss_Recovery_Input_Based.xlsx) for a whole
+# futures book and several leverage tiers at once, plus an isolated-margin liquidation
+# estimate for every tier from the USD-M leverage brackets. For a long opened with
+# `investment` USDT at `entry`, now at `price`, with take profit tp (a fraction):
+#
+#   extra     = investment * (entry - price) / (price * tp)
+#   new_avg   = (investment + extra) / (investment / entry + extra / price)
+#   tp_price  = new_avg * (1 + tp),   margin at L x = extra / L
+#
+# Liquidation (Binance one-way isolated formula, long) for the whole position after
+# the extra buy, with wallet balance = notional / L and the bracket of that notional:
+#
+#   liq = (notional - notional / L - cum) / (qty * (1 - maint_margin_ratio))
+#
+# Brackets come from the signed /fapi/v1/leverageBracket endpoint (BINANCE_API_KEY /
+# BINANCE_API_SECRET) and are cached in data/cache/ like exchangeInfo.
+
+LEVERAGES = (10, 20)
+CACHE_TTL = 24 * 3600
+BRACKET_PATH = "/fapi/v1/leverageBracket"
+
+
+# --- LEVERAGE BRACKETS (cached) ---
+def _cache_path(cache_dir=None):
+    return os.path.join(cache_dir or config.DATA_DIR, "cache", "leverageBracket_futures.json")
+
+
+def _signed_get(path, params=None):
+    query = urlencode(dict(params or {}, timestamp=int(time.time() * 1000), recvWindow=60_000))
+    signature = hmac.new(config.BINANCE_API_SECRET.encode(), query.encode(), hashlib.sha256).hexdigest()
+    session = requests.Session()
+    session.headers["X-MBX-APIKEY"] = config.BINANCE_API_KEY
+    return governor("futures").get(f"{config.FUTURES_URL}{path}?{query}&signature={signature}",
+                                   session=session, label="leverageBracket")
+
+
+def leverage_brackets(ttl=CACHE_TTL, cache_dir=None, force=False):
+    """
+    {symbol: [[notional_floor, notional_cap, maint_margin_ratio, cum, max_leverage], ...]}
+    from the cache, refreshed once older than `ttl` when an API key is configured.
+    """
+    path = _cache_path(cache_dir)
+    cached = read_entry(path)
+    if cached and not force and time.time() - cached["fetched_at"] < ttl:
+        return cached["brackets"]
+    if not (config.BINANCE_API_KEY and config.BINANCE_API_SECRET):
+        if not cached:
+            print("⚠️ No cached leverage brackets and no BINANCE_API_KEY/SECRET to fetch them")
+        return cached["brackets"] if cached else {}
+    try:
+        res = _signed_get(BRACKET_PATH)
+        res.raise_for_status()
+        data = res.json()
+    except Exception as e:
+        if cached:
+            print(f"⚠️ leverageBracket refresh failed ({e}), using cached copy")
+            return cached["brackets"]
+        print(f"❌ Failed to get leverage brackets: {e}")
+        return {}
+    brackets = {
+        s["symbol"]: sorted([float(b["notionalFloor"]), float(b["notionalCap"]), float(b["maintMarginRatio"]),
+                             float(b["cum"]), float(b["initialLeverage"])] for b in s["brackets"])
+        for s in data
+    }
+    write_entry(path, {"fetched_at": time.time(), "brackets": brackets})
+    return brackets
+
+
+def bracket_columns(symbols, notional, brackets):
+    """Maintenance margin ratio, cum and max leverage of the bracket each notional falls in (NaN if unknown)."""
+    symbols = np.asarray(symbols)
+    notional = np.asarray(notional, dtype=np.float64)
+    out = np.full((len(notional), 3), np.nan)
+    for symbol in np.unique(symbols):
+        table = np.asarray(brackets.get(symbol) or [], dtype=np.float64)
+        if not len(table):
+            continue
+        rows = symbols == symbol
+        i = np.clip(np.searchsorted(table[:, 0], notional[rows], side="right") - 1, 0, len(table) - 1)
+        out[rows] = table[i, 2:]
+    return out[:, 0], out[:, 1], out[:, 2]
+
+
+# --- LOSS RECOVERY ---
+def loss_recovery(entry, investment, price, take_profit, leverages=LEVERAGES):
+    """
+    {column: array} for every position; inputs broadcast. `take_profit` is a fraction
+    as in the sheet (0.5 = 50 %); nothing is added to a position that is not at a loss.
+    """
+    entry, investment, price, take_profit = (np.asarray(x, dtype=np.float64)
+                                             for x in (entry, investment, price, take_profit))
+    qty = investment / entry
+    with np.errstate(divide="ignore", invalid="ignore"):
+        extra = np.maximum(investment * (entry - price) / (price * take_profit), 0.0)
+        total = investment + extra
+        total_qty = qty + extra / price
+        new_avg = total / total_qty
+        tp_price = new_avg * (1 + take_profit)
+    out = {
+        "qty": qty, "value": qty * price, "unrealized": qty * price - investment,
+        "extra": extra, "total_investment": total, "total_qty": total_qty, "new_avg": new_avg,
+        "tp_price": tp_price, "net_profit": total_qty * tp_price - total,
+    }
+    for lev in leverages:
+        out[f"margin_{lev}x"] = extra / lev
+    return out
+
+
+def liquidation(notional, qty, price, mmr, cum=0.0, max_leverage=None, leverages=LEVERAGES):
+    """
+    Isolated-margin liquidation price of a long of `qty` worth `notional` at entry for
+    every leverage, and its distance below `price` in %; NaN where the leverage is over
+    the bracket's max leverage or the bracket is unknown.
+    """
+    notional, qty, price, mmr, cum = (np.asarray(x, dtype=np.float64) for x in (notional, qty, price, mmr, cum))
+    out = {}
+    for lev in leverages:
+        liq = np.maximum((notional - notional / lev - cum) / (qty * (1 - mmr)), 0.0)
+        if max_leverage is not None:
+            liq = np.where(np.asarray(max_leverage, dtype=np.float64) >= lev, liq, np.nan)
+        out[f"liq_{lev}x"] = liq
+        out[f"liq_dist_{lev}x"] = (price - liq) / price * 100
+    return out
+
+
+def loss_table(positions, prices=None, take_profit=0.5, leverages=LEVERAGES, brackets=None):
+    """
+    Loss-recovery plan for every row of `positions` (symbol, entry, investment,
+    optional price / take_profit as fractions), ranked by extra amount. Liquidation
+    columns are added when `brackets` (see leverage_brackets) are given.
+    """
+    table = positions.copy()
+    if prices is None:
+        prices = market_prices(table["symbol"].unique())
+    live = table["symbol"].map(prices).astype(float)
+    table["price"] = table["price"].fillna(live) if "price" in table.columns else live
+    tp = table["take_profit"].fillna(take_profit) if "take_profit" in table.columns else take_profit
+    for k, v in loss_recovery(table["entry"], table["investment"], table["price"], tp, leverages).items():
+        table[k] = v
+    if brackets:
+        mmr, cum, max_leverage = bracket_columns(table["symbol"].to_numpy(), table["total_investment"], brackets)
+        table["maint_margin_ratio"], table["max_leverage"] = mmr, max_leverage
+        for k, v in liquidation(table["total_investment"], table["total_qty"], table["price"], mmr,
+                                np.nan_to_num(cum), max_leverage, leverages).items():
+            table[k] = v
+    return table.sort_values("extra", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leveraged loss recovery and liquidation distance for a futures book")
+    parser.add_argument("positions", help="CSV or JSON with symbol, entry, investment (optional: price, take_profit)")
+    parser.add_argument("--take-profit", type=float, default=0.5,
+                        help="over the new average, a fraction as in the sheet (default 0.5 = 50 %%)")
+    parser.add_argument("--leverage", type=int, nargs="+", default=list(LEVERAGES))
+    parser.add_argument("--refresh-brackets", action="store_true", help="fetch the leverage brackets now")
+    parser.add_argument("--no-liquidation", action="store_true")
+    parser.add_argument("--out", help="write the table to this CSV file")
+    args = parser.parse_args(argv)
+
+    positions = load_positions(args.positions, ("symbol", "entry", "investment"))
+    brackets = None if args.no_liquidation else leverage_brackets(force=args.refresh_brackets)
+    start_time = time.perf_counter()
+    table = loss_table(positions, take_profit=args.take_profit, leverages=args.leverage, brackets=brackets)
+    duration = time.perf_counter() - start_time
+
+    with pd.option_context("display.width", 250, "display.max_rows", 100, "display.max_columns", 40):
+        print(table.to_string(index=False))
+    print(f"\n💵 Extra {table['extra'].sum():.2f} USDT for {len(table)} positions; margin "
+          + ", ".join(f"{lev}x {table[f'margin_{lev}x'].sum():.2f}" for lev in args.leverage)
+          + f" ({duration * 1000:.1f} ms)")
+    if args.out:
+        table.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
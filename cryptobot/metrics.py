@@ -0,0 +1,155 @@
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Per-scan / per-symbol timing of the phases of a REST scan. Code under measurement
+# wraps each phase in `timed(metrics, symbol, phase)`, which is a no-op when no
+# recorder is passed. A finished scan is exported as JSON lines (one line per symbol
+# plus one summary line) and folded into cumulative counters served in the
+# Prometheus text format.
+
+PHASES = ("http", "parse", "build", "indicators", "predicate", "alert")
+WEIGHT_HEADERS = ("X-MBX-USED-WEIGHT-1M", "X-MBX-USED-WEIGHT")
+
+
+def timed(metrics, symbol, phase):
+    return metrics.phase(symbol, phase) if metrics is not None else nullcontext()
+
+
+def _symbol_entry():
+    return dict({p: 0.0 for p in PHASES}, requests=0, errors=0, alerts=0, used_weight=None)
+
+
+class ScanMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.totals = {p: 0.0 for p in PHASES}
+        self.counters = {"scans": 0, "symbols": 0, "requests": 0, "errors": 0, "alerts": 0}
+        self.used_weight = None
+        self.last_scan = None
+        self.current = None
+
+    # --- RECORDING ---
+    def start_scan(self, **labels):
+        self.current = {"scan_id": uuid.uuid4().hex[:12], "started": time.time(),
+                        "labels": labels, "symbols": {}}
+
+    def _entry(self, symbol):
+        with self.lock:
+            return self.current["symbols"].setdefault(symbol, _symbol_entry())
+
+    @contextmanager
+    def phase(self, symbol, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            entry = self._entry(symbol)
+            with self.lock:
+                entry[name] += elapsed
+
+    def count(self, symbol, name, n=1):
+        entry = self._entry(symbol)
+        with self.lock:
+            entry[name] += n
+
+    def response(self, symbol, res):
+        """Count one HTTP response and keep the request weight Binance reports."""
+        entry = self._entry(symbol)
+        used = next((res.headers[h] for h in WEIGHT_HEADERS if h in res.headers), None)
+        with self.lock:
+            entry["requests"] += 1
+            if used is not None:
+                entry["used_weight"] = self.used_weight = int(used)
+
+    def end_scan(self):
+        scan, self.current = self.current, None
+        symbols = scan["symbols"]
+        summary = {
+            "type": "scan", "scan_id": scan["scan_id"], **scan["labels"],
+            "started": round(scan["started"], 3), "seconds": round(time.time() - scan["started"], 4),
+            "symbols": len(symbols),
+            **{p: round(sum(s[p] for s in symbols.values()), 4) for p in PHASES},
+            **{k: sum(s[k] for s in symbols.values()) for k in ("requests", "errors", "alerts")},
+            "max_used_weight": max((s["used_weight"] for s in symbols.values() if s["used_weight"] is not None),
+                                   default=None),
+        }
+        with self.lock:
+            for p in PHASES:
+                self.totals[p] += summary[p]
+            self.counters["scans"] += 1
+            self.counters["symbols"] += len(symbols)
+            for k in ("requests", "errors", "alerts"):
+                self.counters[k] += summary[k]
+            self.last_scan = dict(summary, per_symbol=symbols)
+        return summary
+
+    # --- EXPORT ---
+    def jsonl(self):
+        scan = self.last_scan
+        if scan is None:
+            return []
+        head = {k: v for k, v in scan.items() if k != "per_symbol"}
+        lines = [{"type": "symbol", "scan_id": scan["scan_id"], "symbol": symbol,
+                  **{k: round(v, 5) if isinstance(v, float) else v for k, v in entry.items()}}
+                 for symbol, entry in scan["per_symbol"].items()]
+        return [json.dumps(line) for line in lines + [head]]
+
+    def write_jsonl(self, path):
+        with open(path, "a") as f:
+            for line in self.jsonl():
+                f.write(line + "\n")
+
+    def prometheus(self):
+        with self.lock:
+            totals, counters, last, weight = dict(self.totals), dict(self.counters), self.last_scan, self.used_weight
+        out = ["# HELP cryptobot_scan_phase_seconds_total Time spent per scan phase, all symbols.",
+               "# TYPE cryptobot_scan_phase_seconds_total counter"]
+        out += [f'cryptobot_scan_phase_seconds_total{{phase="{p}"}} {totals[p]:.6f}' for p in PHASES]
+        for name, text in (("scans", "Finished scans."), ("symbols", "Symbols scanned."),
+                           ("requests", "HTTP requests sent."), ("errors", "Failed kline fetches."),
+                           ("alerts", "Alerts sent.")):
+            out += [f"# HELP cryptobot_scan_{name}_total {text}", f"# TYPE cryptobot_scan_{name}_total counter",
+                    f"cryptobot_scan_{name}_total {counters[name]}"]
+        if last is not None:
+            out += ["# HELP cryptobot_last_scan_seconds Wall time of the last finished scan.",
+                    "# TYPE cryptobot_last_scan_seconds gauge",
+                    f"cryptobot_last_scan_seconds {last['seconds']}",
+                    "# HELP cryptobot_last_scan_phase_seconds Time per phase in the last finished scan.",
+                    "# TYPE cryptobot_last_scan_phase_seconds gauge"]
+            out += [f'cryptobot_last_scan_phase_seconds{{phase="{p}"}} {last[p]}' for p in PHASES]
+        if weight is not None:
+            out += ["# HELP cryptobot_used_weight Last X-MBX-USED-WEIGHT reported by Binance.",
+                    "# TYPE cryptobot_used_weight gauge", f"cryptobot_used_weight {weight}"]
+        return "\n".join(out) + "\n"
+
+    def serve(self, port=9108, host="127.0.0.1"):
+        """
+        Serve /metrics from a daemon thread on `host` (loopback unless told otherwise);
+        returns the server (call .shutdown() to stop).
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
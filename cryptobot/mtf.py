@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from cryptobot.candles import INTERVAL_MS
+
+# Multi-timeframe alignment without lookahead. Higher-timeframe bars are either built
+# from the base bars (`resample`) or come from their own kline series, and their values
+# are joined onto the base bars as of each base bar's close: a base bar only sees the
+# last higher bar whose close_time is at or before its own, so a 4h value appears on
+# the 15m bar that closes with it and stays until the next 4h close. The join is one
+# searchsorted over the close times, for a whole history at once.
+
+
+def factor(interval, target):
+    """How many `interval` bars make one `target` bar."""
+    ratio, rest = divmod(INTERVAL_MS[target], INTERVAL_MS[interval])
+    if rest or ratio < 1:
+        raise ValueError(f"{target} is not a multiple of {interval}")
+    return ratio
+
+
+def resample(df, interval, target):
+    """
+    `target` bars aggregated from the `interval` bars of `df` (or `target` as a bar
+    count), indexed by bucket. Only buckets that reached their close are kept.
+    """
+    htf_ms = INTERVAL_MS[interval] * (target if isinstance(target, int) else factor(interval, target))
+    group = (df['open_time'] // htf_ms).astype('int64')
+    htf = df.groupby(group).agg(
+        open_time=('open_time', 'first'), open=('open', 'first'), high=('high', 'max'),
+        low=('low', 'min'), close=('close', 'last'), volume=('volume', 'sum'),
+        close_time=('close_time', 'last'), quote_volume=('quote_volume', 'sum'))
+    return htf[htf['close_time'] == (htf.index + 1) * htf_ms - 1]
+
+
+def asof(df, htf, columns=None):
+    """
+    `columns` of `htf` (all of them by default) aligned onto the bars of `df`: the
+    values of the last higher bar closed at or before each base bar's close, NaN
+    before the first one. Bars of `htf` that have not closed yet are never used.
+    """
+    columns = list(htf.columns.drop(['open_time', 'close_time'], errors='ignore') if columns is None else columns)
+    closes = htf['close_time'].to_numpy(dtype=np.float64)
+    at = np.searchsorted(closes, df['close_time'].to_numpy(dtype=np.float64), side='right') - 1
+    values = htf[columns].to_numpy(dtype=np.float64)
+    out = np.full((len(df), len(columns)), np.nan)
+    known = at >= 0
+    out[known] = values[at[known]]
+    return pd.DataFrame(out, index=df.index, columns=columns)
+
+
+def frame(df, interval, layers, sources=None):
+    """
+    Base bars of `df` with higher-timeframe columns joined on. `layers` maps a target
+    interval to a function of that timeframe's candle frame returning a DataFrame (or
+    {name: Series}) of indicator columns; each column is added as "<target>_<name>".
+    A target's candles come from `sources[target]` when given (e.g. fetched 4h klines),
+    otherwise they are resampled from `df`.
+    """
+    out = df.copy()
+    for target, func in layers.items():
+        htf = (sources or {}).get(target)
+        htf = resample(df, interval, target) if htf is None else htf
+        values = pd.DataFrame(func(htf), index=htf.index)
+        values['close_time'] = htf['close_time']
+        joined = asof(df, values)
+        for name in joined.columns:
+            out[f"{target}_{name}"] = joined[name]
+    return out
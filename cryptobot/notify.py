@@ -0,0 +1,22 @@
+import requests
+
+from cryptobot import config
+
+
+# --- SEND TELEGRAM MESSAGE ---
+def send_telegram_message(message, parse_mode=None):
+    if not config.TELEGRAM_TOKEN or not config.TELEGRAM_CHAT_ID:
+        print("Telegram not configured — skipping send.")
+        return False
+    url = f"{config.TELEGRAM_URL}/bot{config.TELEGRAM_TOKEN}/sendMessage"
+    payload = {"chat_id": config.TELEGRAM_CHAT_ID, "text": message}
+    if parse_mode:
+        payload["parse_mode"] = parse_mode
+    try:
+        res = requests.post(url, data=payload, timeout=10)
+        if res.status_code != 200:
+            print(f"Telegram error {res.status_code}: {res.text}")
+        return res.status_code == 200
+    except Exception as e:
+        print(f"Telegram send error: {e}")
+        return False
@@ -0,0 +1,176 @@
+import argparse
+import time
+from collections import deque
+
+import numpy as np
+
+from cryptobot import config
+from cryptobot.candles import load_symbol_list
+
+# Order-flow features from the kline columns every payload already carries: taker buy
+# base/quote volume and the trade count. The taker-sell side is volume - taker buy, so
+# per bar:
+#
+#   buy_ratio  = taker_buy / volume                  (0..1)
+#   imbalance  = (buy - sell) / volume = 2 * buy_ratio - 1   (-1..1)
+#   delta      = buy - sell; cvd = cumulative delta over the history given;
+#                rolling_delta = delta summed over the last `window` bars
+#   trades_z   = z-score of num_trades against the previous `window` bars
+#   avg_trade  = quote volume / num_trades
+#
+# `features` works on one history or on the (symbols, bars) matrices of patterns.stack,
+# along the last axis; `OrderFlow` keeps the same numbers bar by bar for live streams.
+
+WINDOW = 96
+FEATURES = ("buy_ratio", "imbalance", "delta", "cvd", "rolling_delta", "trades_z", "avg_trade")
+
+
+def _window_sum(x, window):
+    c = np.cumsum(x, axis=-1)
+    c[..., window:] = c[..., window:] - c[..., :-window]
+    return c
+
+
+def _prev_window_stats(x, window):
+    """Mean and sample std of the `window` values before each bar (NaN until the window is full)."""
+    x = np.asarray(x, dtype=np.float64)
+    valid = ~np.isnan(x)
+    center = np.nanmean(x, axis=-1, keepdims=True) if valid.any() else 0.0
+    v = np.where(valid, x - center, 0.0)
+    n = _window_sum(valid.astype(np.float64), window)
+    s, ss = _window_sum(v, window), _window_sum(v * v, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = s / n
+        std = np.sqrt(np.maximum(ss - s * mean, 0.0) / (n - 1))
+    full = n == window
+    mean, std = np.where(full, mean + center, np.nan), np.where(full, std, np.nan)
+    out_mean, out_std = np.full_like(mean, np.nan), np.full_like(std, np.nan)
+    out_mean[..., 1:], out_std[..., 1:] = mean[..., :-1], std[..., :-1]
+    return out_mean, out_std
+
+
+def features(candles, window=WINDOW, quote=False):
+    """
+    {feature: array} for candle arrays, a DataFrame or stacked matrices. `quote` uses
+    the quote-asset volumes (USDT) for delta / cvd instead of base units.
+    """
+    volume = np.asarray(candles['quote_volume' if quote else 'volume'], dtype=np.float64)
+    buy = np.asarray(candles['taker_buy_quote' if quote else 'taker_buy_base'], dtype=np.float64)
+    trades = np.asarray(candles['num_trades'], dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        buy_ratio = np.where(volume > 0, buy / volume, np.nan)
+        delta = 2 * buy - volume
+        mean, std = _prev_window_stats(trades, window)
+        trades_z = np.where(std > 0, (trades - mean) / std, np.nan)
+        avg_trade = np.where(trades > 0, np.asarray(candles['quote_volume'], dtype=np.float64) / trades, np.nan)
+    filled = np.nan_to_num(delta)
+    return {
+        "buy_ratio": buy_ratio, "imbalance": 2 * buy_ratio - 1, "delta": delta,
+        "cvd": np.where(np.isnan(delta), np.nan, np.cumsum(filled, axis=-1)),
+        "rolling_delta": np.where(np.isnan(delta), np.nan, _window_sum(filled, window)),
+        "trades_z": trades_z, "avg_trade": avg_trade,
+    }
+
+
+def latest(universe, window=WINDOW, quote=False):
+    """Features of every symbol's last bar, one row per symbol, from one stacked pass."""
+    import pandas as pd
+    from cryptobot.patterns import stack
+    fields = ("open_time", "close", "volume", "quote_volume", "taker_buy_base", "taker_buy_quote", "num_trades")
+    symbols, m = stack(universe, fields)
+    values = features(m, window, quote)
+    table = pd.DataFrame({"symbol": symbols, "open_time": m['open_time'][:, -1].astype(np.int64),
+                          "close": m['close'][:, -1]})
+    for k in FEATURES:
+        table[k] = values[k][:, -1]
+    return table
+
+
+# --- INCREMENTAL ---
+class OrderFlow:
+    """
+    Running features of one (symbol, interval), fed one bar at a time. `update` takes
+    a closed bar and commits it; `preview` gives the numbers of a forming bar without
+    changing the state; `feed` commits whatever is new in a candle buffer (after a
+    gap fill that can be several bars). Fed the same history, it matches `features`.
+    """
+
+    def __init__(self, window=WINDOW, quote=False):
+        self.window = window
+        self.quote = quote
+        self.trades = deque(maxlen=window)
+        self.deltas = deque(maxlen=window)
+        self.cvd = 0.0
+        self.last_open_time = None
+
+    def feed(self, candles):
+        """Commit the bars of `candles` newer than the last one seen; returns the features of the last."""
+        times = np.asarray(candles['open_time'])
+        start = 0 if self.last_open_time is None else int(np.searchsorted(times, self.last_open_time, side="right"))
+        out = None
+        for i in range(start, len(times)):
+            out = self.update({f: candles[f][i] for f in ("open_time", "volume", "quote_volume", "taker_buy_base",
+                                                          "taker_buy_quote", "num_trades")})
+        return out
+
+    def preview(self, bar):
+        volume = float(bar['quote_volume' if self.quote else 'volume'])
+        buy = float(bar['taker_buy_quote' if self.quote else 'taker_buy_base'])
+        trades = float(bar['num_trades'])
+        delta = 2 * buy - volume
+        buy_ratio = buy / volume if volume > 0 else np.nan
+        trades_z = np.nan
+        if len(self.trades) == self.window:
+            std = np.std(self.trades, ddof=1)
+            trades_z = (trades - np.mean(self.trades)) / std if std > 0 else np.nan
+        rolling = list(self.deltas)[1:] if len(self.deltas) == self.window else list(self.deltas)
+        return {
+            "buy_ratio": buy_ratio, "imbalance": 2 * buy_ratio - 1, "delta": delta,
+            "cvd": self.cvd + delta, "rolling_delta": sum(rolling) + delta, "trades_z": trades_z,
+            "avg_trade": float(bar['quote_volume']) / trades if trades > 0 else np.nan,
+        }
+
+    def update(self, bar):
+        """Commit a closed bar (a repeated or older open_time is ignored); returns its features."""
+        if self.last_open_time is not None and bar['open_time'] <= self.last_open_time:
+            return None
+        out = self.preview(bar)
+        self.cvd = out["cvd"]
+        self.deltas.append(out["delta"])
+        self.trades.append(float(bar['num_trades']))
+        self.last_open_time = bar['open_time']
+        return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Taker-flow imbalance, CVD and trade intensity across the universe")
+    parser.add_argument("--interval", default="4h")
+    parser.add_argument("--market", default="futures", choices=["futures", "spot"])
+    parser.add_argument("--symbols-file", default=config.FUTURES_PAIRS_FILE)
+    parser.add_argument("--fetch", type=int, default=0, help="fetch the last N bars over REST instead of reading the data dir")
+    parser.add_argument("--window", type=int, default=WINDOW, help="bars of the rolling delta and trade z-score")
+    parser.add_argument("--quote", action="store_true", help="delta / CVD in USDT instead of base units")
+    parser.add_argument("--sort", default="imbalance", choices=FEATURES)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--out", help="write every symbol to this CSV file")
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+    from cryptobot.sweep import load_or_fetch
+    universe = load_or_fetch(load_symbol_list(args.symbols_file), args.interval, args.market, args.fetch)
+    if not universe:
+        print("❌ No candles available (run the backfill or pass --fetch).")
+        return
+
+    start_time = time.perf_counter()
+    table = latest(universe, args.window, args.quote).sort_values(args.sort, ascending=False)
+    duration = time.perf_counter() - start_time
+    with pd.option_context("display.width", 200, "display.max_columns", 20):
+        print(table.head(args.top).to_string(index=False))
+    print(f"\n🌊 Order flow of {len(table)} symbols on the last {args.interval} bar ({duration * 1000:.1f} ms)")
+    if args.out:
+        table.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
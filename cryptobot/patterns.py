@@ -0,0 +1,157 @@
+import argparse
+import time
+
+import numpy as np
+
+from cryptobot import config
+from cryptobot.candles import load_symbol_list
+
+# Multi-candle patterns as shifted-array boolean expressions. A pattern is a function
+# of open / high / low / close arrays that returns a boolean array of the same shape,
+# True on the bar that completes the pattern; `lag(x, k)` is x k bars back along the
+# last axis (NaN before the first bar, so comparisons there are False). The arrays can
+# be one symbol's history or a (symbols, bars) matrix from `stack`, so one expression
+# evaluates every bar of every symbol, for the live scan (last column) and backtests.
+#
+# The three-candle reversal of 0097 / 0098 / 0099 and archive/2-5 (first, middle, last):
+#
+#   low[mid] < low[first] and low[mid] < low[last]
+#   middle green: close[last] > open[mid];  middle red: close[last] > close[mid]
+#   (a doji middle has no close rule), and in the scripts a green last candle
+#
+# `reversal_high` is the mirror image for shorts.
+
+FIELDS = ("open", "high", "low", "close")
+
+
+def lag(x, k=1):
+    """`x` shifted `k` bars forward along the last axis, NaN-filled."""
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full_like(x, np.nan)
+    if k < x.shape[-1]:
+        out[..., k:] = x[..., :x.shape[-1] - k]
+    return out
+
+
+# --- PATTERNS ---
+def reversal_low(o, h, l, c, require_green=True):
+    """Three-candle reversal low, True on the third candle."""
+    o1, l1, c1, l2 = lag(o), lag(l), lag(c), lag(l, 2)
+    pivot = (l1 < l) & (l1 < l2)
+    close_rule = np.where(c1 > o1, c > o1, np.where(c1 < o1, c > c1, True))
+    hit = pivot & close_rule
+    return hit & (c > o) if require_green else hit
+
+
+def reversal_high(o, h, l, c, require_red=True):
+    """Mirror of reversal_low: middle high above both neighbours, close back under it."""
+    o1, h1, c1, h2 = lag(o), lag(h), lag(c), lag(h, 2)
+    pivot = (h1 > h) & (h1 > h2)
+    close_rule = np.where(c1 < o1, c < o1, np.where(c1 > o1, c < c1, True))
+    hit = pivot & close_rule
+    return hit & (c < o) if require_red else hit
+
+
+def engulfing_bull(o, h, l, c):
+    """Green body engulfing the previous red body."""
+    o1, c1 = lag(o), lag(c)
+    return (c1 < o1) & (c > o) & (o <= c1) & (c >= o1)
+
+
+def engulfing_bear(o, h, l, c):
+    o1, c1 = lag(o), lag(c)
+    return (c1 > o1) & (c < o) & (o >= c1) & (c <= o1)
+
+
+# name: (function, side)
+PATTERNS = {
+    "reversal-low": (reversal_low, 1),
+    "reversal-high": (reversal_high, -1),
+    "engulfing-bull": (engulfing_bull, 1),
+    "engulfing-bear": (engulfing_bear, -1),
+}
+
+
+def evaluate(name, candles, **params):
+    """Pattern `name` on candle arrays or a DataFrame (any shape from `stack` too)."""
+    func = PATTERNS[name][0]
+    return func(*(np.asarray(candles[f], dtype=np.float64) for f in FIELDS), **params)
+
+
+# --- UNIVERSE ---
+def stack(universe, fields=FIELDS + ("open_time",), last=None):
+    """
+    Symbols and {field: (symbols, bars) matrix} of a universe ({symbol: arrays}),
+    right-aligned so column -1 is every symbol's latest bar; shorter histories are
+    NaN-padded on the left. `last` keeps only the last N bars.
+    """
+    symbols = sorted(universe)
+    width = max((len(universe[s]['open_time']) for s in symbols), default=0)
+    if last:
+        width = min(width, last)
+    out = {f: np.full((len(symbols), width), np.nan) for f in fields}
+    for i, s in enumerate(symbols):
+        for f in fields:
+            col = np.asarray(universe[s][f], dtype=np.float64)[-width:] if width else []
+            out[f][i, width - len(col):] = col
+    return symbols, out
+
+
+def find(universe, name, last_bars=0, **params):
+    """
+    Every bar of every symbol completing pattern `name` as a DataFrame (symbol,
+    open_time, close), oldest first; `last_bars` keeps only hits in the last N bars.
+    """
+    import pandas as pd
+    symbols, m = stack(universe)
+    hit = evaluate(name, m, **params)
+    if last_bars:
+        hit[:, :-last_bars] = False
+    rows, cols = np.nonzero(hit)
+    table = pd.DataFrame({"symbol": np.asarray(symbols, dtype=object)[rows],
+                          "open_time": m['open_time'][rows, cols].astype(np.int64),
+                          "close": m['close'][rows, cols]})
+    return table.sort_values(["open_time", "symbol"], kind="stable").reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-candle patterns over the full history of a universe")
+    parser.add_argument("pattern", choices=sorted(PATTERNS))
+    parser.add_argument("--interval", default="15m")
+    parser.add_argument("--market", default="futures", choices=["futures", "spot"])
+    parser.add_argument("--symbols-file", default=config.FUTURES_PAIRS_FILE)
+    parser.add_argument("--fetch", type=int, default=0, help="fetch the last N bars over REST instead of reading the data dir")
+    parser.add_argument("--last", type=int, default=0, help="only hits in the last N bars (1: the latest bar)")
+    parser.add_argument("--hold-bars", type=int, default=8, help="forward return horizon of the backtest summary")
+    parser.add_argument("--out", help="write every hit to this CSV file")
+    args = parser.parse_args(argv)
+
+    from cryptobot.backtest import summarize, trade_returns
+    from cryptobot.sweep import load_or_fetch
+    universe = load_or_fetch(load_symbol_list(args.symbols_file), args.interval, args.market, args.fetch)
+    if not universe:
+        print("❌ No candles available (run the backfill or pass --fetch).")
+        return
+
+    start_time = time.perf_counter()
+    table = find(universe, args.pattern, args.last)
+    duration = time.perf_counter() - start_time
+    bars = sum(len(a['open_time']) for a in universe.values())
+    print(f"🕯️ {args.pattern}: {len(table)} hits over {bars} bars of {len(universe)} symbols "
+          f"({duration * 1000:.1f} ms)")
+    if args.last:
+        for row in table.itertuples():
+            print(f"✅ {row.symbol} @ {row.close}")
+    else:
+        side = PATTERNS[args.pattern][1]
+        returns = np.concatenate([trade_returns(a['close'], evaluate(args.pattern, a), side, args.hold_bars)
+                                  for a in universe.values()])
+        stats = summarize(returns)
+        print(f"📊 {args.hold_bars}-bar hold: {stats['trades']} trades, win rate {stats['win_rate']:.2%}, "
+              f"avg {stats['avg_return']:.4%}, total {stats['total_return']:.4f}")
+    if args.out:
+        table.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
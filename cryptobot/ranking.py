@@ -0,0 +1,37 @@
+import heapq
+import itertools
+import math
+
+# Keep the best K candidates of a scan instead of the first K found. A bounded
+# min-heap holds the current top K, so every symbol of the universe is considered
+# with O(log K) work and memory stays at K entries.
+
+
+class TopK:
+    def __init__(self, k):
+        self.k = k
+        self.heap = []
+        self.seen = 0
+        self._order = itertools.count()
+
+    def push(self, score, item):
+        """Offer `item`; returns True if it is (for now) among the best K. NaN scores are dropped."""
+        self.seen += 1
+        if score is None or math.isnan(score):
+            return False
+        # on equal scores the earlier item wins, and items themselves are never compared
+        entry = (score, -next(self._order), item)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+            return True
+        if entry[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, entry)
+            return True
+        return False
+
+    def items(self):
+        """[(score, item)] best first."""
+        return [(score, item) for score, _, item in sorted(self.heap, reverse=True)]
+
+    def __len__(self):
+        return len(self.heap)
@@ -0,0 +1,167 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+
+from cryptobot import config
+
+try:
+    import fcntl
+except ImportError:  # no flock (Windows): the budget is only shared between threads
+    fcntl = None
+
+# Request-weight governor shared by every scanner on the machine. The weight used in
+# the current minute, the last X-MBX-* counters and any 418/429 ban live in one small
+# state file per market, updated under an exclusive flock, so concurrent scripts
+# draw from a single budget. Below PACE_FROM of the budget requests go out
+# immediately; past it the remaining weight is spread over the rest of the minute,
+# and once it is spent (or Binance answers 418/429) every process waits.
+
+WEIGHT_PER_MINUTE = {"futures": 1200, "spot": 3000}  # about half of each exchange limit
+# /futures/data/* (open-interest history) is limited to 1000 requests per 5 minutes
+WEIGHT_PER_MINUTE["futures-data"] = 200
+WEIGHT_HEADERS = ("X-MBX-USED-WEIGHT-1M", "X-MBX-USED-WEIGHT")
+ORDER_HEADERS = {"orders_10s": "X-MBX-ORDER-COUNT-10S", "orders_1m": "X-MBX-ORDER-COUNT-1M",
+                 "orders_1d": "X-MBX-ORDER-COUNT-1D"}
+PACE_FROM = 0.7
+MAX_RETRIES = 5
+
+
+def klines_weight(market, limit):
+    if market == "spot":
+        return 2
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def _fresh_state():
+    return {"minute": 0, "used": 0, "banned_until": 0.0, **{k: None for k in ORDER_HEADERS}}
+
+
+class RateGovernor:
+    def __init__(self, market="futures", per_minute=None, state_dir=None, shared=True, pace_from=PACE_FROM):
+        self.market = market
+        self.per_minute = per_minute or WEIGHT_PER_MINUTE[market]
+        self.pace_from = pace_from
+        self.lock = threading.Lock()
+        self.state = _fresh_state()
+        self.path = None
+        if shared and fcntl is not None:
+            self.path = os.path.join(state_dir or config.DATA_DIR, "cache", f"ratelimit_{market}.json")
+
+    # --- SHARED STATE ---
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return dict(_fresh_state(), **json.load(f))
+        except (OSError, ValueError):
+            return _fresh_state()
+
+    @contextmanager
+    def _locked(self):
+        with self.lock:
+            if self.path is None:
+                yield self.state
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path + ".lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    state = self._read()
+                    yield state
+                    with open(self.path, "w") as f:
+                        json.dump(state, f)
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def snapshot(self):
+        with self._locked() as state:
+            return dict(state)
+
+    # --- THROTTLE ---
+    def acquire(self, weight):
+        """Block until `weight` fits in this minute's shared budget, pacing near the limit."""
+        while True:
+            granted = False
+            with self._locked() as state:
+                now = time.time()
+                minute = int(now // 60)
+                if state["minute"] != minute:
+                    state["minute"], state["used"] = minute, 0
+                left = 60 - now % 60
+                if state["banned_until"] > now:
+                    wait = state["banned_until"] - now
+                elif state["used"] + weight > self.per_minute:
+                    wait = left
+                else:
+                    granted = True
+                    state["used"] += weight
+                    remaining = self.per_minute - state["used"] + weight
+                    wait = 0.0 if state["used"] < self.pace_from * self.per_minute else left * weight / remaining
+            if wait > 0:
+                # waiting is re-checked every second: another process may lift or extend it
+                time.sleep(wait if granted else min(wait, 1.0))
+            if granted:
+                return
+
+    def observe(self, res):
+        """Fold the response's X-MBX-* counters into the shared state; True if it was a 418/429."""
+        used = next((res.headers[h] for h in WEIGHT_HEADERS if h in res.headers), None)
+        limited = res.status_code in (418, 429)
+        with self._locked() as state:
+            now = time.time()
+            if state["minute"] != int(now // 60):
+                state["minute"], state["used"] = int(now // 60), 0
+            if used is not None:
+                # the exchange counts every process on this IP, so its number wins when higher
+                state["used"] = max(state["used"], int(used))
+            for key, header in ORDER_HEADERS.items():
+                if header in res.headers:
+                    state[key] = int(res.headers[header])
+            if limited:
+                retry = res.headers.get("Retry-After")
+                backoff = float(retry) if retry else (120.0 if res.status_code == 418 else 60 - now % 60)
+                state["banned_until"] = max(state["banned_until"], now + backoff)
+        return limited
+
+    def get(self, url, params=None, weight=1, session=None, retries=MAX_RETRIES, label=""):
+        """GET under the budget; 418/429 and 5xx are retried, the last response is returned."""
+        res = None
+        for attempt in range(retries):
+            self.acquire(weight)
+            try:
+                res = (session or requests).get(url, params=params, timeout=config.REQUEST_TIMEOUT)
+            except requests.RequestException as e:
+                if attempt == retries - 1:
+                    raise
+                print(f"⚠️ {label} request error ({e}), retry {attempt + 1}")
+                time.sleep(2 ** attempt)
+                continue
+            if self.observe(res):
+                print(f"⏳ {label} rate limited ({res.status_code}), backing off")
+                continue
+            if res.status_code >= 500:
+                time.sleep(2 ** attempt)
+                continue
+            return res
+        return res
+
+
+_governors = {}
+_governors_lock = threading.Lock()
+
+
+def governor(market="futures"):
+    """The process-wide governor of `market` (its budget is shared with other processes)."""
+    with _governors_lock:
+        if market not in _governors:
+            _governors[market] = RateGovernor(market)
+        return _governors[market]
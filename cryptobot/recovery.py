@@ -0,0 +1,122 @@
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from cryptobot.candles import fetch_tickers
+
+# Average-price recovery (Wunder-Trading/Avg_Price_Recovery_Calculator_v2.xlsx) for a
+# whole book of positions at once. For a position of `quantity` at `avg_price`, the
+# additional quantity bought at the market price that brings the average down so the
+# position breaks even at `target`:
+#
+#   add_qty = quantity * (avg_price - target) / (target - price)
+#
+# which is only meaningful when price < target < avg_price; otherwise nothing is bought
+# (status "no_loss" when the average is already at or under the target, "exit_now"
+# when the market is already at or over it). Prices for every position come from one
+# bulk 24hr ticker request.
+
+POSITION_COLUMNS = ("symbol", "quantity", "avg_price", "target")
+
+
+def load_positions(path, columns=POSITION_COLUMNS):
+    """Positions from a CSV or JSON file (a list of objects, or {"positions": [...]})."""
+    if os.path.splitext(path)[1].lower() == ".json":
+        with open(path) as f:
+            data = json.load(f)
+        table = pd.DataFrame(data["positions"] if isinstance(data, dict) else data)
+    else:
+        table = pd.read_csv(path)
+    missing = [c for c in columns if c not in table.columns]
+    if missing:
+        raise ValueError(f"{path}: missing columns {', '.join(missing)}")
+    table["symbol"] = table["symbol"].astype(str).str.strip().str.upper()
+    return table
+
+
+def market_prices(symbols, market="futures"):
+    """{symbol: last price} for `symbols` from one 24hr ticker request."""
+    tickers = fetch_tickers(market)
+    return {s: float(tickers[s]["lastPrice"]) for s in symbols if s in tickers}
+
+
+def avg_recovery(quantity, avg_price, price, target, last_order=None, step_size=None):
+    """
+    Recovery plan of every position as {column: array}; inputs broadcast. `add_qty`
+    is rounded up to `step_size` (whole units when not given, as in the sheet) into
+    `rounded_qty`, and `size_mult` is add_qty / `last_order` when that is given.
+    """
+    quantity, avg_price, price, target = (np.asarray(x, dtype=np.float64)
+                                          for x in (quantity, avg_price, price, target))
+    feasible = (price < target) & (target < avg_price)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        add_qty = np.where(feasible, quantity * (avg_price - target) / (target - price), 0.0)
+        new_qty = quantity + add_qty
+        new_avg = np.where(new_qty > 0, (quantity * avg_price + add_qty * price) / new_qty, np.nan)
+        step = np.asarray(1.0 if step_size is None else step_size, dtype=np.float64)
+        step = np.where(np.isfinite(step) & (step > 0), step, 1.0)
+        plan = {
+            "status": np.where(feasible, "add", np.where(avg_price <= target, "no_loss", "exit_now")),
+            "add_qty": add_qty,
+            "new_qty": new_qty,
+            "new_avg": new_avg,
+            "pnl_at_target": (target - new_avg) * new_qty,
+            "extra_cash": add_qty * price,
+            "rounded_qty": np.round(np.ceil(np.round(add_qty / step, 9)) * step, 12),
+        }
+        if last_order is not None:
+            plan["size_mult"] = add_qty / np.asarray(last_order, dtype=np.float64)
+    return plan
+
+
+def recovery_table(positions, prices=None, market="futures", filters=None):
+    """
+    Recovery plan for every row of `positions` (see load_positions), ranked by extra
+    cash needed. A `price` column overrides the market price; other prices come from
+    `prices` or one ticker request. `filters` from universe.tradable_symbols rounds
+    the quantities to each symbol's step size.
+    """
+    table = positions.copy()
+    if prices is None:
+        prices = market_prices(table["symbol"].unique(), market)
+    live = table["symbol"].map(prices).astype(float)
+    table["price"] = table["price"].fillna(live) if "price" in table.columns else live
+    step = None
+    if filters:
+        step = table["symbol"].map(lambda s: (filters.get(s) or {}).get("step_size")).astype(float).to_numpy()
+    plan = avg_recovery(table["quantity"], table["avg_price"], table["price"], table["target"],
+                        table["last_order"] if "last_order" in table.columns else None, step)
+    for k, v in plan.items():
+        table[k] = v
+    table.loc[table["price"].isna(), "status"] = "no_price"
+    return table.sort_values("extra_cash", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Average-price recovery plan for every open position")
+    parser.add_argument("positions", help="CSV or JSON with symbol, quantity, avg_price, target "
+                                          "(optional: price, last_order)")
+    parser.add_argument("--market", default="futures", choices=["futures", "spot"])
+    parser.add_argument("--no-filters", action="store_true", help="round to whole units instead of the step size")
+    parser.add_argument("--out", help="write the plan to this CSV file")
+    args = parser.parse_args(argv)
+
+    filters = None
+    if not args.no_filters:
+        from cryptobot.universe import tradable_symbols
+        filters = tradable_symbols(args.market)
+    table = recovery_table(load_positions(args.positions), market=args.market, filters=filters)
+
+    with pd.option_context("display.width", 200, "display.max_rows", 100):
+        print(table.to_string(index=False))
+    needed = table.loc[table["status"] == "add", "extra_cash"]
+    print(f"\n💵 {len(needed)} positions to average down, {needed.sum():.2f} USDT extra cash in total")
+    if args.out:
+        table.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
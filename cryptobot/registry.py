@@ -0,0 +1,68 @@
+from importlib import import_module
+
+# Strategy metadata that can be read without importing pandas. `func` is a
+# "module:function" path resolved on first use, so listing strategies or parsing a
+# command line never pays for the indicator stack.
+# side: +1 long / -1 short. `score` ranks the bars a strategy fires on (higher is
+# stronger); `checks` returns its individual conditions and indicator values. `grid`
+# is the default search space for sweeps; `bars` is the history a scan needs at least
+# (multi-timeframe strategies warm up their indicators on the higher timeframe).
+
+STRATEGY_SPECS = {
+    "smi-long": {
+        "func": "cryptobot.strategies:smi_long", "score": "cryptobot.strategies:smi_long_score",
+        "checks": "cryptobot.strategies:smi_long_checks",
+        "side": 1, "interval": "15m",
+        "grid": {"length": [14, 21, 28], "smooth_k": [3, 5, 8], "smooth_d": [3, 5, 8],
+                 "min_quote_volume": [10_000_000, 20_000_000, 50_000_000]},
+    },
+    "smi-short": {
+        "func": "cryptobot.strategies:smi_short", "score": "cryptobot.strategies:smi_short_score",
+        "checks": "cryptobot.strategies:smi_short_checks",
+        "side": -1, "interval": "15m",
+        "grid": {"length": [14, 21, 28], "smooth_k": [3, 5, 8], "smooth_d": [3, 5, 8],
+                 "min_quote_volume": [10_000_000, 20_000_000, 50_000_000]},
+    },
+    "dmi-long": {
+        "func": "cryptobot.strategies:dmi_long", "score": "cryptobot.strategies:dmi_long_score",
+        "checks": "cryptobot.strategies:dmi_long_checks",
+        "side": 1, "interval": "15m", "bars": 1000,
+        "grid": {"length": [10, 14, 20], "adx_min": [15, 20, 25], "min_quote_volume": [0, 20_000_000]},
+    },
+    "crossover-long": {
+        "func": "cryptobot.strategies:crossover_long", "score": "cryptobot.strategies:crossover_long_score",
+        "checks": "cryptobot.strategies:crossover_long_checks",
+        "side": 1, "interval": "1h",
+        "grid": {"rsi_length": [14, 20, 25, 30], "ci_mid": [40, 45, 50, 55],
+                 "lookback_cross": [40, 60, 80, 120], "min_quote_volume": [0, 20_000_000]},
+    },
+    "crossover-short": {
+        "func": "cryptobot.strategies:crossover_short", "score": "cryptobot.strategies:crossover_short_score",
+        "checks": "cryptobot.strategies:crossover_short_checks",
+        "side": -1, "interval": "15m",
+        "grid": {"rsi_length": [14, 20, 25, 30], "ci_mid": [40, 45, 50, 55],
+                 "lookback_cross": [40, 60, 80, 120], "min_quote_volume": [0, 20_000_000]},
+    },
+    "choch-long": {
+        "func": "cryptobot.strategies:choch_long", "score": "cryptobot.strategies:choch_long_score",
+        "checks": "cryptobot.strategies:choch_long_checks",
+        "side": 1, "interval": "1h",
+        "grid": {"swing_length": [1, 2, 3, 4, 5], "min_quote_volume": [0, 10_000_000, 20_000_000]},
+    },
+    "reversal-long": {
+        "func": "cryptobot.strategies:reversal_long", "score": "cryptobot.strategies:reversal_long_score",
+        "checks": "cryptobot.strategies:reversal_long_checks",
+        "side": 1, "interval": "15m",
+        "grid": {"ema_length": [4, 8], "rsi_low": [0, 30], "rsi_high": [50, 60, 100],
+                 "min_quote_volume": [0, 20_000_000]},
+    },
+}
+
+
+def strategy_names():
+    return sorted(STRATEGY_SPECS)
+
+
+def load_func(name, key="func"):
+    module, attr = STRATEGY_SPECS[name][key].split(":")
+    return getattr(import_module(module), attr)
@@ -0,0 +1,106 @@
+import numpy as np
+
+from cryptobot.candles import CANDLE_FIELDS
+
+# Fixed-capacity candle container for one (symbol, interval).
+#
+# All fields live in one preallocated float64 block of shape (fields, 2 * capacity).
+# Every row is written twice, at slot i and i + capacity, so the last n rows are
+# always one contiguous slice [start, start + n) and indicator code gets zero-copy
+# views without the buffer ever being rotated or reallocated.
+
+
+class CandleRing:
+    def __init__(self, capacity, fields=CANDLE_FIELDS):
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self.index = {f: i for i, f in enumerate(self.fields)}
+        self.data = np.full((len(self.fields), 2 * capacity), np.nan, dtype=np.float64)
+        self.head = 0  # slot of the next append
+        self.count = 0
+        self.last_closed = False
+
+    @staticmethod
+    def bytes_for(capacity, fields=CANDLE_FIELDS):
+        return len(fields) * 2 * capacity * 8
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def last_open_time(self):
+        if not self.count:
+            return None
+        return float(self.data[self.index['open_time'], (self.head - 1) % self.capacity])
+
+    def clear(self):
+        self.head = self.count = 0
+        self.last_closed = False
+
+    # --- WRITES ---
+    def _write(self, slot, row):
+        col = np.asarray(row, dtype=np.float64)
+        self.data[:, slot] = col
+        self.data[:, slot + self.capacity] = col
+
+    def append(self, row):
+        self._write(self.head, row)
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def update_last(self, row):
+        """Overwrite the forming bar in place."""
+        self._write((self.head - 1) % self.capacity, row)
+
+    def set_last(self, field, value):
+        slot = (self.head - 1) % self.capacity
+        self.data[self.index[field], slot] = value
+        self.data[self.index[field], slot + self.capacity] = value
+
+    def update(self, row, closed):
+        """Append a newer bar or overwrite the forming one; stale rows are ignored."""
+        last = self.last_open_time
+        if last is None or row[0] > last:
+            self.append(row)
+        elif row[0] == last:
+            self.update_last(row)
+        else:
+            return
+        self.last_closed = closed
+
+    def extend(self, arrays, now_ms):
+        times = arrays['open_time']
+        close_times = arrays['close_time']
+        last = self.last_open_time
+        start = 0 if last is None else int(np.searchsorted(times, last))
+        for i in range(start, len(times)):
+            self.update([arrays[f][i] for f in self.fields], close_times[i] < now_ms)
+
+    # --- ZERO-COPY READS ---
+    def _window(self, n=None, closed_only=False):
+        skip = 1 if closed_only and self.count and not self.last_closed else 0
+        available = self.count - skip
+        n = available if n is None else min(n, available)
+        end = (self.head - skip) % self.capacity
+        if end < n:
+            # read from the mirrored copy so the slice does not wrap
+            end += self.capacity
+        return end - n, end
+
+    def view(self, field, n=None, closed_only=False):
+        start, end = self._window(n, closed_only)
+        return self.data[self.index[field], start:end]
+
+    def arrays(self, n=None, closed_only=False):
+        start, end = self._window(n, closed_only)
+        return {f: self.data[i, start:end] for f, i in self.index.items()}
+
+    def snapshot(self, n=None, closed_only=False):
+        """Copies of the window, safe to read on another thread while the ring keeps filling."""
+        start, end = self._window(n, closed_only)
+        block = self.data[:, start:end].copy()
+        return {f: block[i] for f, i in self.index.items()}
@@ -0,0 +1,212 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptobot import config
+from cryptobot.metrics import PHASES, ScanMetrics, timed
+from cryptobot.ranking import TopK
+from cryptobot.registry import STRATEGY_SPECS, strategy_names
+
+# One REST pass over the universe, the way the numbered scripts run every few minutes:
+# fetch the last `limit` bars (more if a strategy's spec asks for `bars`) per (symbol,
+# interval), drop the bar that is still forming and alert on every strategy whose
+# condition holds on the last closed bar.
+# pandas and the indicator stack are only imported once a scan actually starts.
+# With a metrics.ScanMetrics recorder every phase is timed per symbol.
+
+
+def _by_interval(names):
+    groups = {}
+    for name in names:
+        groups.setdefault(STRATEGY_SPECS[name]['interval'], []).append(name)
+    return groups
+
+
+def scan_symbol(symbol, groups, market="futures", limit=300, metrics=None, evals=None, derivs=None, filters=None):
+    """
+    [(strategy, interval, close, score, entry)] for every strategy that fires on the
+    last closed bar; `entry` is the signal's journal.signal_entry record. With an
+    evallog.EvaluationLog every evaluation (hit or not) is added to it. `derivs` is
+    the symbol's derivatives.latest_inputs row, tested with `filters` after the
+    strategy's own conditions.
+    """
+    from cryptobot.candles import fetch_klines, to_frame
+    from cryptobot.derivatives import filter_checks
+    from cryptobot.journal import signal_entry
+    from cryptobot.strategies import checks, score
+
+    hits = []
+    for interval, names in groups.items():
+        bars = max([limit] + [STRATEGY_SPECS[name].get("bars", 0) for name in names])
+        arrays = fetch_klines(symbol, interval, limit=bars, market=market, metrics=metrics)
+        with timed(metrics, symbol, "build"):
+            closed = arrays['close_time'] < time.time() * 1000
+            df = to_frame({f: v[closed] for f, v in arrays.items()})
+        if len(df) < 60:
+            for name in names if evals is not None else ():
+                evals.add(symbol, name, interval, None, ["history"])
+            continue
+        for name in names:
+            # indicators and the vectorized conditions are one call per strategy
+            with timed(metrics, symbol, "indicators"):
+                conds, values = checks(name, df, interval)
+            with timed(metrics, symbol, "predicate"):
+                failed = [k for k, cond in conds.items() if not cond.iat[-1]]
+                if derivs is not None:
+                    extra = filter_checks(STRATEGY_SPECS[name]['side'], derivs, **(filters or {}))
+                    failed += [k for k, ok in extra.items() if not ok]
+                fired = not failed
+            if evals is not None:
+                evals.add(symbol, name, interval, df['open_time'].iat[-1], failed,
+                          {**{k: v.iat[-1] for k, v in values.items()}, **(derivs or {})})
+            if fired:
+                with timed(metrics, symbol, "indicators"):
+                    strength = float(score(name, df, interval).iloc[-1])
+                    entry = signal_entry(name, symbol, interval, df, strength, market)
+                hits.append((name, interval, df['close'].iat[-1], strength, entry))
+    return hits
+
+
+def scan(names, symbols, market="futures", limit=300, workers=8, notify=True, metrics=None, top=0,
+         journal=None, evals=None, verbose=False, filters=None, oi_period="1h"):
+    """
+    Alert on every hit, or with `top` only on the `top` best-scored hits per strategy
+    over the whole universe (sent once all symbols are evaluated, strongest first).
+    Scores of different strategies are on different scales, so each has its own heap.
+    Alerted signals are appended to the signal journal unless `journal` is False
+    (None: the default journal file). Every evaluation goes to `evals` (an
+    evallog.EvaluationLog), written as one batch at the end of the scan; `verbose`
+    prints how many symbols each condition rejected. Futures `filters` (max_funding,
+    min_oi_change, see derivatives.filter_checks) are checked on funding and open
+    interest fetched once per scan: one premiumIndex request and batched OI history;
+    a symbol without that data (every spot symbol) fails them.
+    """
+    from cryptobot.journal import record
+    from cryptobot.notify import send_telegram_message
+
+    def alert(symbol, name, interval, price, strength, entry):
+        msg = (f"✅ {name} Signal ({interval})\n"
+               f"Symbol: {symbol}\n"
+               f"Price: {price}\n"
+               f"Score: {strength:.4g}")
+        print(msg)
+        if notify:
+            with timed(metrics, symbol, "alert"):
+                send_telegram_message(msg)
+        if metrics is not None:
+            metrics.count(symbol, "alerts")
+        alerts.append((symbol, name, interval, price, strength))
+        entries.append(entry)
+
+    groups = _by_interval(names)
+    alerts, entries = [], []
+    ranked = {name: TopK(top) for name in names} if top else None
+    if metrics is not None:
+        metrics.start_scan(market=market, strategies=",".join(names))
+    if evals is not None:
+        evals.start_scan(metrics.current["scan_id"] if metrics is not None else None, market=market)
+    derivs = {}
+    if filters and market == "futures":
+        from cryptobot.derivatives import latest_inputs
+        table = latest_inputs(symbols, oi_period, workers=workers)
+        derivs = table.set_index("symbol").to_dict("index")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda s: scan_symbol(s, groups, market, limit, metrics, evals,
+                                                 derivs.get(s, {}) if filters else None, filters), symbols)
+        for symbol, hits in zip(symbols, results):
+            for hit in hits:
+                if ranked is None:
+                    alert(symbol, *hit)
+                else:
+                    ranked[hit[0]].push(hit[3], (symbol, *hit))
+    for name, best in (ranked or {}).items():
+        if best.seen:
+            print(f"🏅 {name}: top {len(best)} of {best.seen} signals")
+        for _, hit in best.items():
+            alert(*hit)
+    if journal is not False:
+        record(entries, journal)
+    if evals is not None:
+        if verbose:
+            for name, counts in evals.summary().items():
+                rejected = ", ".join(f"{k} {n}" for k, n in sorted(counts.items(), key=lambda kv: -kv[1])
+                                     if k != "passed")
+                print(f"🔎 {name}: {counts['passed']} passed | rejected by {rejected or '-'}")
+        path = evals.flush()
+        if verbose and path:
+            print(f"🗂️ Evaluations written to {path}")
+    if metrics is not None:
+        metrics.end_scan()
+    return alerts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scan the universe over REST and alert on the last closed bar")
+    parser.add_argument("strategies", nargs="+", choices=strategy_names())
+    parser.add_argument("--market", default="futures", choices=["futures", "spot"])
+    parser.add_argument("--symbols-file")
+    parser.add_argument("--limit", type=int, default=300, help="bars fetched per symbol and interval")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--no-telegram", action="store_true")
+    parser.add_argument("--top", type=int, default=0, help="only alert on the N best-scored signals per strategy")
+    parser.add_argument("--journal", help="signal journal file (default: <data dir>/journal/signals.jsonl)")
+    parser.add_argument("--no-journal", action="store_true", help="do not append alerted signals to the journal")
+    parser.add_argument("--eval-log", help="evaluation log directory (default: <data dir>/evals)")
+    parser.add_argument("--no-eval-log", action="store_true", help="do not record per-symbol evaluations")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print rejection counts per condition")
+    parser.add_argument("--max-funding", type=float,
+                        help="futures: skip signals whose side pays more than this funding rate (%%)")
+    parser.add_argument("--min-oi-change", type=float, help="futures: open interest up at least this %% over 24 periods")
+    parser.add_argument("--oi-period", default="1h", help="open-interest period for --min-oi-change")
+    parser.add_argument("--every", type=int, default=0, help="repeat the scan every N seconds")
+    parser.add_argument("--metrics-jsonl", help="append per-symbol phase timings of each scan to this file")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port")
+    parser.add_argument("--metrics-host", default="127.0.0.1",
+                        help="interface of the metrics endpoint (0.0.0.0: every interface)")
+    args = parser.parse_args(argv)
+    if args.market != "futures" and (args.max_funding is not None or args.min_oi_change is not None):
+        parser.error("--max-funding and --min-oi-change need --market futures")
+
+    from cryptobot.universe import universe
+
+    default_file = config.FUTURES_PAIRS_FULL_FILE if args.market == "futures" else config.SPOT_PAIRS_FILE
+    symbols = universe(args.market, args.symbols_file or default_file)
+    if not symbols:
+        print("❌ No symbols loaded from txt.")
+        return
+
+    filters = {}
+    if args.max_funding is not None:
+        filters["max_funding"] = args.max_funding / 100
+    if args.min_oi_change is not None:
+        filters["min_oi_change"] = args.min_oi_change
+    metrics = ScanMetrics()
+    evals = None
+    if not args.no_eval_log:
+        from cryptobot.evallog import EvaluationLog
+        evals = EvaluationLog(args.eval_log)
+    if args.metrics_port:
+        metrics.serve(args.metrics_port, args.metrics_host)
+        print(f"📈 Prometheus metrics on {args.metrics_host}:{args.metrics_port}/metrics")
+    while True:
+        print(f"🔍 Scanning {len(symbols)} {args.market} symbols for {', '.join(args.strategies)}...\n")
+        start_time = time.time()
+        alerts = scan(args.strategies, symbols, args.market, args.limit, args.workers,
+                      notify=not args.no_telegram, metrics=metrics, top=args.top,
+                      journal=False if args.no_journal else args.journal, evals=evals, verbose=args.verbose,
+                      filters=filters, oi_period=args.oi_period)
+        duration = time.time() - start_time
+        last = metrics.last_scan
+        phases = " | ".join(f"{p} {last[p]:.2f}s" for p in PHASES)
+        print(f"\n✅ Done.\n🔢 Symbols: {len(symbols)}\n🚨 Signals: {len(alerts)}\n"
+              f"🌐 Requests: {last['requests']} (errors {last['errors']}, max weight {last['max_used_weight']})\n"
+              f"🧮 Phases (summed over workers): {phases}\n⏱️ Time: {duration:.2f} sec")
+        if args.metrics_jsonl:
+            metrics.write_jsonl(args.metrics_jsonl)
+        if not args.every:
+            break
+        time.sleep(max(0.0, args.every - duration))
+
+
+if __name__ == "__main__":
+    main()
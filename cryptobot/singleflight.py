@@ -0,0 +1,85 @@
+import os
+import threading
+from concurrent.futures import Future
+
+from cryptobot import config
+from cryptobot.httpcache import ResponseCache
+
+try:
+    import fcntl
+except ImportError:  # no flock (Windows): requests are only merged inside one process
+    fcntl = None
+
+# Request coalescing. Inside a process, callers asking for the same key while a
+# request is in flight wait for that request instead of sending their own. Across
+# processes, the first caller of a key holds an flock on its lock file while it
+# fetches into the shared httpcache.ResponseCache, so a scanner started before the
+# entry expires reads that result instead of the network.
+
+
+class SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.merged = 0
+
+    def do(self, key, fn):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = Future()
+            else:
+                self.merged += 1
+        if not leader:
+            return call.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                del self.calls[key]
+
+
+class FileFlight:
+    def __init__(self, cache=None):
+        self.cache = cache or ResponseCache()
+
+    def do(self, key, expires_ms, fn):
+        """Cached payload of `key`, or fn() stored until `expires_ms` by one process at a time."""
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+        if fcntl is None:
+            data = fn()
+            self.cache.put(key, data, expires_ms)
+            return data
+        lock_path = self.cache.path(key) + ".lock"
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        with open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # another process may have filled it while this one waited for the lock
+                data = self.cache.get(key)
+                if data is None:
+                    data = fn()
+                    self.cache.put(key, data, expires_ms)
+                return data
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+_flights = SingleFlight()
+_files = FileFlight()
+
+
+def coalesce(key, expires_ms, fn):
+    """One fn() per key for concurrent callers in this process, and per expiry across processes."""
+    if not config.HTTP_CACHE:
+        return _flights.do(key, fn)
+    return _flights.do(key, lambda: _files.do(key, expires_ms, fn))
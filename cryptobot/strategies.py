@@ -0,0 +1,245 @@
+import numpy as np
+import pandas as pd
+
+from cryptobot import indicators as ind
+from cryptobot import mtf, orderflow, patterns
+from cryptobot.candles import bars_per_day
+from cryptobot.registry import STRATEGY_SPECS, load_func
+
+# Vectorized versions of the screener conditions: every function takes a candle
+# DataFrame (see candles.to_frame) and returns a boolean Series that is True on
+# each closed bar where the script would have alerted. The `*_checks` variants return
+# the individual conditions (in the order the scripts test them) and the indicator
+# values behind them, so a scan can record which condition rejected a symbol.
+
+
+# --- Helpers ---
+def volume_ok(df, interval, min_quote_volume):
+    if not min_quote_volume:
+        return pd.Series(True, index=df.index)
+    return ind.rolling_quote_volume(df, bars_per_day(interval)) >= min_quote_volume
+
+
+def _all(checks):
+    out = None
+    for cond in checks.values():
+        out = cond if out is None else out & cond
+    return out
+
+
+# --- 0084 / 0085: SMI 15m + 30m ---
+def _smi_frame(df, interval, length, smooth_k, smooth_d, htf_factor):
+    smi, sig = ind.smi_tradingview(df, length, smooth_k, smooth_d)
+    htf = mtf.resample(df, interval, htf_factor)
+    htf['smi'], htf['sig'] = ind.smi_tradingview(htf, length, smooth_k, smooth_d)
+    up = mtf.asof(df, htf, ['smi', 'sig'])
+    return smi, sig, up['smi'], up['sig']
+
+
+def smi_long_checks(df, interval="15m", length=21, smooth_k=5, smooth_d=5, htf_factor=2,
+                    min_quote_volume=20_000_000):
+    smi, sig, smi_h, sig_h = _smi_frame(df, interval, length, smooth_k, smooth_d, htf_factor)
+    checks = {"smi_above_signal": smi > sig, "smi_below_zero": smi < 0, "htf_smi_above_signal": smi_h > sig_h,
+              "volume": volume_ok(df, interval, min_quote_volume)}
+    return checks, {"smi": smi, "smi_signal": sig, "htf_smi": smi_h, "htf_smi_signal": sig_h}
+
+
+def smi_short_checks(df, interval="15m", length=21, smooth_k=5, smooth_d=5, htf_factor=2,
+                     min_quote_volume=20_000_000):
+    smi, sig, smi_h, sig_h = _smi_frame(df, interval, length, smooth_k, smooth_d, htf_factor)
+    checks = {"smi_below_signal": smi < sig, "smi_above_zero": smi > 0, "htf_smi_below_signal": smi_h < sig_h,
+              "volume": volume_ok(df, interval, min_quote_volume)}
+    return checks, {"smi": smi, "smi_signal": sig, "htf_smi": smi_h, "htf_smi_signal": sig_h}
+
+
+def smi_long(df, interval="15m", **params):
+    return _all(smi_long_checks(df, interval, **params)[0])
+
+
+def smi_short(df, interval="15m", **params):
+    return _all(smi_short_checks(df, interval, **params)[0])
+
+
+# --- 0088: DMI 15m + 1h + 4h ---
+def dmi_long_checks(df, interval="15m", length=14, adx_min=20, trend_tfs=("4h", "1h"),
+                    min_quote_volume=20_000_000):
+    plus, minus, _ = ind.dmi(df, length)
+    layers = {tf: (lambda h: dict(zip(("plus", "minus", "adx"), ind.dmi(h, length)))) for tf in trend_tfs}
+    up = mtf.frame(df, interval, layers)
+    checks, values = {}, {"plus_di": plus, "minus_di": minus}
+    for tf in trend_tfs:
+        checks[f"trend_{tf}"] = (up[f"{tf}_adx"] > adx_min) & (up[f"{tf}_plus"] > up[f"{tf}_minus"])
+        values[f"adx_{tf}"] = up[f"{tf}_adx"]
+    checks["di_bullish"] = plus > minus
+    checks["volume"] = volume_ok(df, interval, min_quote_volume)
+    return checks, values
+
+
+def dmi_long(df, interval="15m", **params):
+    return _all(dmi_long_checks(df, interval, **params)[0])
+
+
+# --- 0086 / 0087: EMA crossover + RSI + choppiness ---
+def _crossover_frame(df, rsi_length, ci_len, ema_fast, ema_slow, vol_sma, avg_len, lookback_cross):
+    out = pd.DataFrame(index=df.index)
+    out['ema_fast'] = ind.ema(df['close'], ema_fast)
+    out['ema_slow'] = ind.ema(df['close'], ema_slow)
+    out['rsi'] = ind.rsi(df['close'], rsi_length)
+    out['ci'] = ind.choppiness_index(df, ci_len)
+    out['vol_ok'] = df['volume'] > ind.sma(df['volume'], vol_sma)
+    out['lowAvg'] = ind.sma(df['low'], avg_len)
+    out['highAvg'] = ind.sma(df['high'], avg_len)
+
+    mid = (df['high'] + df['low']) / 2.0
+    out['bullish_candle'] = (df['close'] > df['open']) & (df['close'] >= mid)
+    out['bearish_candle'] = (df['close'] < df['open']) & (df['close'] <= mid)
+
+    kind, bars_since = ind.cross_state(out['ema_fast'], out['ema_slow'])
+    out['cross_kind'] = kind.where(bars_since <= lookback_cross, 0)
+    return out
+
+
+def _crossover_values(f):
+    return {k: f[k] for k in ('ema_fast', 'ema_slow', 'rsi', 'ci', 'cross_kind')}
+
+
+def crossover_long_checks(df, interval="1h", rsi_length=25, rsi_buy=55, ci_len=14, ci_mid=45,
+                          lookback_cross=80, ema_fast=8, ema_slow=14, vol_sma=14, avg_len=14,
+                          min_quote_volume=0):
+    f = _crossover_frame(df, rsi_length, ci_len, ema_fast, ema_slow, vol_sma, avg_len, lookback_cross)
+    bullish = f['cross_kind'] == 1
+    trending = f['ci'] < ci_mid
+    buy = bullish & trending & (f['rsi'] >= rsi_buy) & f['vol_ok'] & f['bullish_candle']
+    add_pos = bullish & (df['low'] <= f['ema_fast']) & (f['rsi'] >= rsi_buy) & f['bullish_candle'] & trending
+    buy_on_dips = f['bullish_candle'] & (df['close'] > f['lowAvg']) & (df['open'] <= f['lowAvg']) & trending
+    checks = {"buy_or_add_or_dip": buy | add_pos | buy_on_dips, "volume": volume_ok(df, interval, min_quote_volume)}
+    return checks, _crossover_values(f)
+
+
+def crossover_short_checks(df, interval="15m", rsi_length=25, rsi_sell=45, ci_len=14, ci_mid=50,
+                           ci_skip=61, lookback_cross=80, ema_fast=8, ema_slow=14, vol_sma=14, avg_len=14,
+                           min_quote_volume=0):
+    f = _crossover_frame(df, rsi_length, ci_len, ema_fast, ema_slow, vol_sma, avg_len, lookback_cross)
+    bearish = f['cross_kind'] == -1
+    sell = bearish & (f['ci'] < ci_mid) & (f['rsi'] <= rsi_sell) & f['vol_ok'] & f['bearish_candle']
+    add_pos = bearish & (df['high'] >= f['ema_fast']) & (f['rsi'] <= rsi_sell) & f['bearish_candle']
+    rallies = f['bearish_candle'] & (df['close'] < f['highAvg']) & (df['open'] >= f['highAvg'])
+    checks = {"sell_or_add_or_rally": sell | add_pos | rallies, "not_choppy": ~(f['ci'] > ci_skip),
+              "volume": volume_ok(df, interval, min_quote_volume)}
+    return checks, _crossover_values(f)
+
+
+def crossover_long(df, interval="1h", **params):
+    return _all(crossover_long_checks(df, interval, **params)[0])
+
+
+def crossover_short(df, interval="15m", **params):
+    return _all(crossover_short_checks(df, interval, **params)[0])
+
+
+# --- 0092: 1H bullish CHoCH with SMA7 > SMA25 ---
+def _swing_high(df, swing_length):
+    last_high, last_low = ind.confirmed_swings(df, swing_length)
+    idx = last_high.to_numpy()
+    swing_high = np.where(np.isnan(idx), np.nan, df['high'].to_numpy()[np.nan_to_num(idx).astype(int)])
+    return pd.Series(swing_high, index=df.index), last_high, last_low
+
+
+def choch_long_checks(df, interval="1h", swing_length=2, sma_fast=7, sma_slow=25, min_quote_volume=0):
+    fast, slow = ind.sma(df['close'], sma_fast), ind.sma(df['close'], sma_slow)
+    swing_high, last_high, last_low = _swing_high(df, swing_length)
+    checks = {"sma_trend": fast > slow, "low_after_high": last_low > last_high,
+              "close_above_swing_high": df['close'] > swing_high,
+              "volume": volume_ok(df, interval, min_quote_volume)}
+    return checks, {"sma_fast": fast, "sma_slow": slow, "swing_high": swing_high}
+
+
+def choch_long(df, interval="1h", **params):
+    return _all(choch_long_checks(df, interval, **params)[0])
+
+
+# --- 0097 / 0098 / 0099: three-candle reversal low + EMA4 + RSI 30-50 ---
+def reversal_long_checks(df, interval="15m", ema_length=4, rsi_length=14, rsi_low=30, rsi_high=50,
+                         min_quote_volume=20_000_000):
+    ema4 = ind.ema(df['close'], ema_length)
+    rsi = ind.rsi(df['close'], rsi_length)
+    pattern = patterns.evaluate("reversal-low", df, require_green=False)
+    checks = {"green": df['close'] > df['open'], "ema4": ~((df['close'] < ema4) & (df['high'] < ema4)),
+              "reversal_low": pd.Series(pattern, index=df.index),
+              "rsi_band": (rsi >= rsi_low) & (rsi < rsi_high),
+              "volume": volume_ok(df, interval, min_quote_volume)}
+    flow = orderflow.features(df)
+    return checks, {"ema4": ema4, "rsi": rsi, "taker_imbalance": pd.Series(flow["imbalance"], index=df.index),
+                    "trades_z": pd.Series(flow["trades_z"], index=df.index)}
+
+
+def reversal_long(df, interval="15m", **params):
+    return _all(reversal_long_checks(df, interval, **params)[0])
+
+
+# =========================
+# SCORES
+# =========================
+# Strength of a bar a strategy fires on, used to keep the best K signals of a scan.
+# Same parameters as the signal function; the ones a score does not use are ignored.
+def smi_long_score(df, interval="15m", length=21, smooth_k=5, smooth_d=5, **_params):
+    # depth of the SMI below zero when it crosses up
+    smi, _ = ind.smi_tradingview(df, length, smooth_k, smooth_d)
+    return -smi
+
+
+def smi_short_score(df, interval="15m", length=21, smooth_k=5, smooth_d=5, **_params):
+    smi, _ = ind.smi_tradingview(df, length, smooth_k, smooth_d)
+    return smi
+
+
+def dmi_long_score(df, interval="15m", length=14, **_params):
+    # spread of +DI over -DI on the signal timeframe
+    plus, minus, _ = ind.dmi(df, length)
+    return plus - minus
+
+
+def crossover_long_score(df, interval="1h", rsi_length=25, **_params):
+    # RSI distance above the 50 midline
+    return ind.rsi(df['close'], rsi_length) - 50
+
+
+def crossover_short_score(df, interval="15m", rsi_length=25, **_params):
+    return 50 - ind.rsi(df['close'], rsi_length)
+
+
+def choch_long_score(df, interval="1h", swing_length=2, **_params):
+    # how far the close broke above the last swing high
+    swing_high, _, _ = _swing_high(df, swing_length)
+    return df['close'] / swing_high - 1
+
+
+def reversal_long_score(df, interval="15m", **_params):
+    # rebound of the close off the middle candle's low
+    return df['close'] / df['low'].shift(1) - 1
+
+
+# =========================
+# REGISTRY
+# =========================
+# metadata lives in cryptobot.registry so it can be read without importing pandas
+STRATEGIES = {name: {**spec, "func": load_func(name), "score": load_func(name, "score"),
+                     "checks": load_func(name, "checks")}
+              for name, spec in STRATEGY_SPECS.items()}
+
+
+def signals(name, df, interval=None, **params):
+    spec = STRATEGIES[name]
+    return spec["func"](df, interval=interval or spec["interval"], **params).fillna(False).astype(bool)
+
+
+def score(name, df, interval=None, **params):
+    spec = STRATEGIES[name]
+    return spec["score"](df, interval=interval or spec["interval"], **params)
+
+
+def checks(name, df, interval=None, **params):
+    """({condition: bool Series}, {indicator: Series}) of a strategy, conditions in test order."""
+    spec = STRATEGIES[name]
+    conds, values = spec["checks"](df, interval=interval or spec["interval"], **params)
+    return {k: v.fillna(False).astype(bool) for k, v in conds.items()}, values
@@ -0,0 +1,214 @@
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptobot import config
+from cryptobot.candles import INTERVAL_MS, fetch_klines, to_frame
+from cryptobot.ringbuffer import CandleRing
+
+# Combined-stream kline consumer. One WebSocket connection carries up to
+# STREAMS_PER_CONNECTION `<symbol>@kline_<interval>` streams; every message updates the
+# fixed-capacity CandleRing of its (symbol, interval). When a bar closes (k.x == true)
+# the on_close callback runs on a worker thread so the socket keeps being read; it gets
+# a copy of the closed bars (symbol, interval, {field: array}), not the live ring.
+# After a reconnect each buffer is gap-filled over REST before streaming resumes.
+
+STREAMS_PER_CONNECTION = 100
+HISTORY = 300
+REST_LIMIT = {"futures": 1500, "spot": 1000}
+RECONNECT_MAX_DELAY = 30
+
+
+def kline_event_row(k):
+    return [float(k['t']), float(k['o']), float(k['h']), float(k['l']), float(k['c']), float(k['v']),
+            float(k['T']), float(k['q']), float(k['n']), float(k['V']), float(k['Q'])]
+
+
+def _last_closed(buf):
+    times = buf.view('open_time', 1, closed_only=True)
+    return float(times[-1]) if len(times) else None
+
+
+# --- STREAM CONSUMER ---
+class KlineStream:
+    def __init__(self, symbols, intervals, market="futures", history=HISTORY, on_close=None,
+                 streams_per_connection=STREAMS_PER_CONNECTION, seed_workers=8, clock=None):
+        self.market = market
+        self.clock = clock or (lambda: time.time() * 1000)
+        self.keys = [(s.upper(), i) for s in symbols for i in intervals]
+        self.buffers = {key: CandleRing(history) for key in self.keys}
+        self.history = history
+        self.on_close = on_close
+        self.streams_per_connection = streams_per_connection
+        self.seed_workers = seed_workers
+        self.callbacks = ThreadPoolExecutor(max_workers=1)
+        self.connections = 0
+        self.messages = 0
+        self._stop = None
+
+    # --- REST ---
+    def _fill(self, key, limit):
+        symbol, interval = key
+        arrays = fetch_klines(symbol, interval, limit=limit, market=self.market)
+        buf = self.buffers[key]
+        if len(arrays['open_time']) and buf.last_open_time is not None \
+                and arrays['open_time'][0] > buf.last_open_time + INTERVAL_MS[interval]:
+            # the hole is wider than one REST page: start the buffer over
+            buf.clear()
+        buf.extend(arrays, self.clock())
+        return len(arrays['open_time'])
+
+    def seed(self):
+        with ThreadPoolExecutor(max_workers=self.seed_workers) as pool:
+            list(pool.map(lambda key: self._fill(key, self.history), self.keys))
+
+    def gap_fill(self, keys):
+        now = self.clock()
+        for key in keys:
+            buf = self.buffers[key]
+            step = INTERVAL_MS[key[1]]
+            missing = self.history if buf.last_open_time is None else int((now - buf.last_open_time) // step) + 2
+            before = _last_closed(buf)
+            self._fill(key, min(max(missing, 2), REST_LIMIT[self.market]))
+            after = _last_closed(buf)
+            # only a bar that closed while disconnected is new to the callback
+            if after is not None and (before is None or after > before):
+                self._dispatch(key)
+
+    # --- WEBSOCKET ---
+    def _url(self, keys):
+        streams = "/".join(f"{s.lower()}@kline_{i}" for s, i in keys)
+        return f"{config.ws_url(self.market)}/stream?streams={streams}"
+
+    def _dispatch(self, key):
+        if self.on_close:
+            # the window is copied here, on the thread that writes the ring: once the
+            # ring is full, later appends would overwrite slots of a zero-copy view
+            self.callbacks.submit(self._safe_callback, key, self.buffers[key].snapshot(closed_only=True))
+
+    def _safe_callback(self, key, arrays):
+        try:
+            self.on_close(key[0], key[1], arrays)
+        except Exception as e:
+            print(f"❌ on_close error for {key[0]} {key[1]}: {e}")
+
+    def handle(self, raw):
+        msg = json.loads(raw)
+        data = msg.get('data', msg)
+        if data.get('e') != 'kline':
+            return
+        k = data['k']
+        key = (k['s'], k['i'])
+        if key not in self.buffers:
+            return
+        self.messages += 1
+        self.buffers[key].update(kline_event_row(k), k['x'])
+        if k['x']:
+            self._dispatch(key)
+
+    async def _connection(self, keys):
+        import websockets
+        delay, first = 1, True
+        while not self._stop.is_set():
+            try:
+                async with websockets.connect(self._url(keys), ping_interval=20, max_size=2 ** 22) as ws:
+                    self.connections += 1
+                    if not first:
+                        print(f"🔄 Reconnected ({len(keys)} streams), gap-filling over REST")
+                        await asyncio.to_thread(self.gap_fill, keys)
+                    first, delay = False, 1
+                    while not self._stop.is_set():
+                        try:
+                            raw = await asyncio.wait_for(ws.recv(), timeout=1.0)
+                        except asyncio.TimeoutError:
+                            continue
+                        self.handle(raw)
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                print(f"⚠️ Stream connection lost ({type(e).__name__}: {e}), retrying in {delay}s")
+                first = False
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    async def run(self):
+        self._stop = asyncio.Event()
+        await asyncio.to_thread(self.seed)
+        n = self.streams_per_connection
+        chunks = [self.keys[i:i + n] for i in range(0, len(self.keys), n)]
+        await asyncio.gather(*(self._connection(chunk) for chunk in chunks))
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+        self.callbacks.shutdown(wait=False)
+
+
+# --- FEED THE STRATEGY CHECKS ---
+def strategy_checker(names, notify=True, market="futures", journal=None):
+    """
+    on_close callback running the given strategies on every closed bar of their
+    interval; signals go to the journal unless `journal` is False. Order-flow
+    features are kept bar by bar and added to every alert.
+    """
+    from cryptobot.journal import record, signal_entry
+    from cryptobot.notify import send_telegram_message
+    from cryptobot.orderflow import OrderFlow
+    from cryptobot.strategies import STRATEGIES, score, signals
+
+    flows = {}  # callbacks run on one thread, one running OrderFlow per (symbol, interval)
+
+    def on_close(symbol, interval, arrays):
+        flow = flows.setdefault((symbol, interval), OrderFlow()).feed(arrays) or {}
+        df = to_frame(arrays)
+        if len(df) < 60:
+            return
+        for name in names:
+            if STRATEGIES[name]['interval'] != interval:
+                continue
+            if signals(name, df, interval).iloc[-1]:
+                msg = (f"✅ {name} Signal ({interval})\n"
+                       f"Symbol: {symbol}\n"
+                       f"Price: {df['close'].iat[-1]}\n"
+                       f"Flow: imbalance {flow.get('imbalance', float('nan')):+.2f}, "
+                       f"trades z {flow.get('trades_z', float('nan')):+.1f}")
+                print(msg)
+                if notify:
+                    send_telegram_message(msg)
+                if journal is not False:
+                    strength = float(score(name, df, interval).iloc[-1])
+                    record([signal_entry(name, symbol, interval, df, strength, market)], journal)
+    return on_close
+
+
+def main(argv=None):
+    from cryptobot.registry import STRATEGY_SPECS, strategy_names
+    from cryptobot.universe import universe
+
+    parser = argparse.ArgumentParser(description="Stream closed klines and run the strategy checks on each close")
+    parser.add_argument("strategies", nargs="+", choices=strategy_names())
+    parser.add_argument("--market", default="futures", choices=["futures", "spot"])
+    parser.add_argument("--symbols-file", default=config.FUTURES_PAIRS_FULL_FILE)
+    parser.add_argument("--no-telegram", action="store_true")
+    parser.add_argument("--journal", help="signal journal file (default: <data dir>/journal/signals.jsonl)")
+    parser.add_argument("--no-journal", action="store_true")
+    args = parser.parse_args(argv)
+
+    symbols = universe(args.market, args.symbols_file)
+    intervals = sorted({STRATEGY_SPECS[n]['interval'] for n in args.strategies})
+    history = max([HISTORY] + [STRATEGY_SPECS[n].get("bars", 0) for n in args.strategies])
+    stream = KlineStream(symbols, intervals, args.market, history=history,
+                         on_close=strategy_checker(args.strategies, notify=not args.no_telegram, market=args.market,
+                                                   journal=False if args.no_journal else args.journal))
+    print(f"📡 Streaming {len(symbols)} symbols × {intervals} for {', '.join(args.strategies)}")
+    try:
+        asyncio.run(stream.run())
+    except KeyboardInterrupt:
+        stream.stop()
+        print("\n👋 Stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import argparse
+import glob
+import hashlib
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+
+from cryptobot import config
+from cryptobot.backtest import summarize, trade_returns
+from cryptobot.candles import fetch_klines, load_symbol_list, load_universe, to_frame
+from cryptobot.candlestore import CandleStore, attach_worker, worker_store
+from cryptobot.strategies import STRATEGIES, signals
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # parquet is optional, results fall back to gzipped CSV
+    pa = pq = None
+
+# Grid / random search over strategy parameters. Candles for the whole universe are
+# packed into one shared-memory CandleStore; workers attach to it once and read views, so
+# no candle data is pickled per task. Finished combos are appended to part files in
+# the output directory, which doubles as the checkpoint for --resume.
+
+CHECKPOINT_EVERY = 25
+
+
+# --- PARAMETER SPACES ---
+def grid_params(grid):
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def random_params(grid, n, seed=0):
+    rng = random.Random(seed)
+    keys = sorted(grid)
+    seen, combos = set(), []
+    space = 1
+    for k in keys:
+        space *= len(grid[k])
+    while len(combos) < min(n, space):
+        params = {k: rng.choice(grid[k]) for k in keys}
+        cid = combo_id(params)
+        if cid not in seen:
+            seen.add(cid)
+            combos.append(params)
+    return combos
+
+
+def run_key(strategy, interval, hold_bars, fee, symbols):
+    """The settings a combo's result depends on besides its parameters."""
+    universe = hashlib.sha1(",".join(sorted(symbols)).encode()).hexdigest()[:12]
+    return {"strategy": strategy, "interval": interval, "hold_bars": hold_bars, "fee": fee, "universe": universe}
+
+
+def combo_id(params, run=None):
+    """Hash of `params`, and of the run settings (see run_key) when given."""
+    key = params if run is None else {"params": params, "run": run}
+    return hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()[:12]
+
+
+# --- SHARED MEMORY CANDLES ---
+@contextmanager
+def candle_pool(universe, workers=None):
+    """Process pool whose workers are attached to a shared CandleStore of `universe`."""
+    with CandleStore.create(universe) as store:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                 initializer=attach_worker, initargs=(store.handle,)) as pool:
+            yield pool
+
+
+def worker_symbols():
+    return worker_store().symbols
+
+
+def worker_frame(symbol):
+    """Candle frame over the shared-memory views of `symbol`: no copy, nothing kept per process."""
+    return to_frame(worker_store().arrays(symbol), copy=False)
+
+
+def _run_combo(task):
+    strategy, interval, params, hold_bars, fee = task
+    side = STRATEGIES[strategy]['side']
+    started = time.time()
+    returns = []
+    for symbol in worker_symbols():
+        df = worker_frame(symbol)
+        if len(df) < 60:
+            continue
+        sig = signals(strategy, df, interval, **params)
+        returns.append(trade_returns(df['close'].to_numpy(), sig.to_numpy(), side, hold_bars, fee))
+    run = run_key(strategy, interval, hold_bars, fee, worker_symbols())
+    row = {"combo_id": combo_id(params, run), "strategy": strategy, "interval": interval,
+           "hold_bars": hold_bars, "fee": fee, **params}
+    row.update(summarize(np.concatenate(returns) if returns else []))
+    row["seconds"] = round(time.time() - started, 3)
+    return row
+
+
+# --- RESULTS TABLE ---
+def _write_part(out_dir, rows):
+    os.makedirs(out_dir, exist_ok=True)
+    stem = os.path.join(out_dir, f"part-{time.time_ns()}")
+    if pq is not None:
+        pq.write_table(pa.Table.from_pylist(rows), stem + ".parquet", compression="zstd")
+    else:
+        import pandas as pd
+        pd.DataFrame(rows).to_csv(stem + ".csv.gz", index=False, compression="gzip")
+
+
+def load_results(out_dir):
+    import pandas as pd
+    parts = sorted(glob.glob(os.path.join(out_dir, "part-*")))
+    frames = [pd.read_parquet(p) if p.endswith(".parquet") else pd.read_csv(p) for p in parts]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def done_ids(out_dir):
+    res = load_results(out_dir) if out_dir and os.path.isdir(out_dir) else None
+    return set() if res is None or res.empty else set(res['combo_id'])
+
+
+# --- DRIVER ---
+def run_sweep(strategy, universe, combos, interval=None, hold_bars=8, fee=0.0004,
+              workers=None, out_dir=None, resume=True):
+    interval = interval or STRATEGIES[strategy]['interval']
+    run = run_key(strategy, interval, hold_bars, fee, universe)
+    skip = done_ids(out_dir) if (out_dir and resume) else set()
+    todo = [p for p in combos if combo_id(p, run) not in skip]
+    print(f"🔍 Sweep {strategy} ({interval}): {len(todo)} combos to run, "
+          f"{len(combos) - len(todo)} already done, {len(universe)} symbols")
+    if not todo:
+        return []
+
+    results, pending = [], []
+    try:
+        with candle_pool(universe, workers) as pool:
+            tasks = [(strategy, interval, p, hold_bars, fee) for p in todo]
+            for i, row in enumerate(pool.map(_run_combo, tasks), 1):
+                results.append(row)
+                pending.append(row)
+                if out_dir and len(pending) >= CHECKPOINT_EVERY:
+                    _write_part(out_dir, pending)
+                    pending = []
+                if row['trades']:
+                    print(f"✅ [{i}/{len(todo)}] {row['combo_id']} trades={row['trades']} avg={row['avg_return']:.4%}")
+                else:
+                    print(f"— [{i}/{len(todo)}] {row['combo_id']} no trades")
+    finally:
+        if out_dir and pending:
+            _write_part(out_dir, pending)
+    return results
+
+
+def load_or_fetch(symbols, interval, market, fetch):
+    if not fetch:
+        return load_universe(symbols, interval, market)
+    universe = {}
+    for symbol in symbols:
+        arrays = fetch_klines(symbol, interval, limit=fetch, market=market)
+        if len(arrays['open_time']):
+            universe[symbol] = arrays
+    return universe
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel parameter sweep for the screener strategies")
+    parser.add_argument("strategy", choices=sorted(STRATEGIES))
+    parser.add_argument("--interval")
+    parser.add_argument("--market", default="futures", choices=["futures", "spot"])
+    parser.add_argument("--symbols-file", default=config.FUTURES_PAIRS_FILE)
+    parser.add_argument("--fetch", type=int, default=0, help="fetch the last N bars over REST instead of reading the data dir")
+    parser.add_argument("--random", type=int, default=0, help="sample N random combos instead of the full grid")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--hold-bars", type=int, default=8)
+    parser.add_argument("--fee", type=float, default=0.0004)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--out", help="results directory (default: sweeps/<strategy>)")
+    parser.add_argument("--no-resume", action="store_true")
+    args = parser.parse_args(argv)
+
+    interval = args.interval or STRATEGIES[args.strategy]['interval']
+    universe = load_or_fetch(load_symbol_list(args.symbols_file), interval, args.market, args.fetch)
+    if not universe:
+        print("❌ No candles available (run the backfill or pass --fetch).")
+        return
+
+    grid = STRATEGIES[args.strategy]['grid']
+    combos = random_params(grid, args.random, args.seed) if args.random else grid_params(grid)
+    out_dir = args.out or os.path.join("sweeps", args.strategy)
+
+    start_time = time.time()
+    run_sweep(args.strategy, universe, combos, interval, args.hold_bars, args.fee,
+              args.workers, out_dir, resume=not args.no_resume)
+    table = load_results(out_dir)
+    duration = time.time() - start_time
+    if not table.empty:
+        best = table.sort_values("total_return", ascending=False).head(10)
+        print("\n🏆 Top combos by total return:")
+        print(best.to_string(index=False))
+    print(f"\n⏱️ Time: {duration:.2f} sec — results in {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import math
+import os
+import time
+
+import requests
+
+from cryptobot import config
+from cryptobot.candles import load_symbol_list
+from cryptobot.httpcache import read_entry, write_entry
+
+# Tradable symbol universe from exchangeInfo. The payload is cached on disk per market
+# with a TTL; once stale it is revalidated with If-None-Match so an unchanged
+# exchangeInfo costs a 304 instead of the full document. Scans intersect the
+# TRADING USDT pairs with the curated lists, so delisted symbols are never requested.
+
+CACHE_TTL = 6 * 3600
+INFO_PATH = {"futures": "/fapi/v1/exchangeInfo", "spot": "/api/v3/exchangeInfo"}
+
+
+def _cache_path(market, cache_dir=None):
+    return os.path.join(cache_dir or config.DATA_DIR, "cache", f"exchangeInfo_{market}.json")
+
+
+# --- FETCH (cached) ---
+def exchange_info(market="futures", ttl=CACHE_TTL, cache_dir=None, force=False):
+    path = _cache_path(market, cache_dir)
+    cached = read_entry(path)
+    if cached and not force and time.time() - cached["fetched_at"] < ttl:
+        return cached["info"]
+
+    headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else {}
+    try:
+        res = requests.get(config.base_url(market) + INFO_PATH[market], headers=headers,
+                           timeout=config.REQUEST_TIMEOUT)
+        if res.status_code == 304 and cached:
+            cached["fetched_at"] = time.time()
+            write_entry(path, cached)
+            return cached["info"]
+        res.raise_for_status()
+        info = res.json()
+    except Exception as e:
+        if cached:
+            print(f"⚠️ exchangeInfo refresh failed ({e}), using cached copy")
+            return cached["info"]
+        print(f"❌ Failed to get exchangeInfo: {e}")
+        return {"symbols": []}
+
+    # only what the universe needs is kept, the spot document is several MB
+    slim = {"symbols": [
+        {k: s.get(k) for k in ("symbol", "status", "baseAsset", "quoteAsset", "contractType", "filters")}
+        for s in info.get("symbols", [])
+    ]}
+    write_entry(path, {"fetched_at": time.time(), "etag": res.headers.get("ETag"), "info": slim})
+    return slim
+
+
+# --- FILTERS ---
+def _filter_value(entry, filter_type, key):
+    for flt in entry.get("filters") or []:
+        if flt.get("filterType") == filter_type and key in flt:
+            return float(flt[key])
+    return None
+
+
+def tradable_symbols(market="futures", quote="USDT", **cache_opts):
+    """{symbol: {"tick_size", "step_size", "min_qty", "base"}} for TRADING pairs in `quote`."""
+    out = {}
+    for s in exchange_info(market, **cache_opts).get("symbols", []):
+        if s.get("status") != "TRADING" or s.get("quoteAsset") != quote:
+            continue
+        if market == "futures" and s.get("contractType") not in (None, "PERPETUAL"):
+            continue
+        out[s["symbol"]] = {
+            "base": s.get("baseAsset"),
+            "tick_size": _filter_value(s, "PRICE_FILTER", "tickSize"),
+            "step_size": _filter_value(s, "LOT_SIZE", "stepSize"),
+            "min_qty": _filter_value(s, "LOT_SIZE", "minQty"),
+        }
+    return out
+
+
+def load_xlsx_pairs(path):
+    """Pairs from the RoyalQ sheets (base in column B, quote in column C)."""
+    try:
+        import openpyxl
+    except ImportError:
+        print(f"⚠️ openpyxl not installed, skipping {path}")
+        return []
+    wb = openpyxl.load_workbook(path, read_only=True)
+    pairs = []
+    for row in wb.active.iter_rows(min_col=2, max_col=3, values_only=True):
+        base, quote = row
+        if base and quote:
+            pairs.append(f"{str(base).strip()}{str(quote).strip()}".upper())
+    return pairs
+
+
+def load_curated(path):
+    if path.endswith(".xlsx"):
+        return load_xlsx_pairs(path)
+    return load_symbol_list(path)
+
+
+def universe(market="futures", curated=None, quote="USDT", **cache_opts):
+    """
+    Symbols to scan: TRADING `quote` pairs from exchangeInfo, intersected with the
+    curated list(s) when given (txt or RoyalQ xlsx), in curated order.
+    """
+    live = tradable_symbols(market, quote, **cache_opts)
+    if not curated:
+        return sorted(live)
+    paths = [curated] if isinstance(curated, str) else curated
+    wanted = list(dict.fromkeys(s for path in paths for s in load_curated(path)))
+    dropped = [s for s in wanted if s not in live]
+    if dropped and live:
+        print(f"⚠️ Skipping {len(dropped)} symbols not trading on {market}: {', '.join(dropped[:10])}"
+              f"{' ...' if len(dropped) > 10 else ''}")
+    return [s for s in wanted if s in live] if live else wanted
+
+
+def round_price(price, tick_size):
+    if not tick_size:
+        return price
+    return round(round(price / tick_size) * tick_size, 12)
+
+
+def round_qty(qty, step_size):
+    if not step_size:
+        return qty
+    # round the quotient first: 0.3 // 0.1 is 2.0 in binary floats
+    return round(math.floor(round(qty / step_size, 9)) * step_size, 12)
+
+
+if __name__ == "__main__":
+    for market, listed in (("futures", config.FUTURES_PAIRS_FULL_FILE), ("spot", config.SPOT_PAIRS_FILE)):
+        start_time = time.time()
+        symbols = universe(market, listed)
+        print(f"✅ {market}: {len(symbols)} tradable symbols from {listed} ({time.time() - start_time:.3f} sec)")
@@ -0,0 +1,150 @@
+import argparse
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from cryptobot import config
+from cryptobot.backtest import summarize, trades
+from cryptobot.candles import INTERVAL_MS, load_symbol_list
+from cryptobot.strategies import STRATEGIES, signals
+from cryptobot.sweep import (candle_pool, combo_id, grid_params, load_or_fetch, random_params,
+                             worker_frame, worker_symbols)
+
+# Walk-forward evaluation: pick the best parameters on each rolling in-sample window
+# and score them on the following out-of-sample window.
+#
+# All indicators used by the strategies are causal, so the signal series computed
+# once over the full history is identical (after warm-up) to one recomputed on any
+# window. Each combo is therefore evaluated a single time per symbol and reduced to
+# a list of (entry time, exit time, return) trades; every window is then scored by
+# masking that list instead of recomputing indicators on overlapping slices.
+
+WF_STRATEGIES = ["smi-long", "smi-short", "crossover-long", "crossover-short"]
+DAY_MS = 86_400_000
+
+
+# --- TRADES PER COMBO (computed once, reused by every window) ---
+def _combo_trades(task):
+    strategy, interval, params, hold_bars, fee = task
+    side = STRATEGIES[strategy]['side']
+    hold_ms = hold_bars * INTERVAL_MS[interval]
+    times, rets = [], []
+    for symbol in worker_symbols():
+        df = worker_frame(symbol)
+        if len(df) < 60:
+            continue
+        sig = signals(strategy, df, interval, **params)
+        idx, ret = trades(df['close'].to_numpy(), sig.to_numpy(), side, hold_bars, fee)
+        times.append(df['close_time'].to_numpy()[idx])
+        rets.append(ret)
+    t = np.concatenate(times) if times else np.empty(0)
+    return combo_id(params), params, t, t + hold_ms, np.concatenate(rets) if rets else np.empty(0)
+
+
+# --- WINDOWS ---
+def rolling_windows(start_ms, end_ms, train_days, test_days, step_days=None):
+    step = (step_days or test_days) * DAY_MS
+    train, test = train_days * DAY_MS, test_days * DAY_MS
+    windows = []
+    t = start_ms
+    while t + train + test <= end_ms:
+        windows.append((t, t + train, t + train + test))
+        t += step
+    return windows
+
+
+def _window_stats(combo_trades, lo, hi):
+    _, _, entry_t, exit_t, rets = combo_trades
+    # a trade belongs to a window only if it opens and closes inside it
+    mask = (entry_t >= lo) & (exit_t < hi)
+    return summarize(rets[mask])
+
+
+def _iso(ms):
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+def walk_forward(strategy, universe, combos, train_days=60, test_days=14, step_days=None,
+                 interval=None, hold_bars=8, fee=0.0004, objective="total_return",
+                 min_trades=20, workers=None):
+    interval = interval or STRATEGIES[strategy]['interval']
+    start_ms = min(a['open_time'][0] for a in universe.values())
+    end_ms = max(a['close_time'][-1] for a in universe.values())
+    windows = rolling_windows(start_ms, end_ms, train_days, test_days, step_days)
+    if not windows:
+        print(f"❌ History too short for {train_days}d train + {test_days}d test windows")
+        return []
+
+    print(f"🔍 Walk-forward {strategy} ({interval}): {len(combos)} combos × {len(windows)} windows")
+    with candle_pool(universe, workers) as pool:
+        tasks = [(strategy, interval, p, hold_bars, fee) for p in combos]
+        all_trades = list(pool.map(_combo_trades, tasks))
+
+    trace = []
+    for n, (lo, mid, hi) in enumerate(windows, 1):
+        best, best_score, best_is = None, -np.inf, None
+        for combo_trades in all_trades:
+            stats = _window_stats(combo_trades, lo, mid)
+            score = stats[objective]
+            if stats['trades'] < min_trades or np.isnan(score):
+                continue
+            if score > best_score:
+                best, best_score, best_is = combo_trades, score, stats
+        row = {"window": n, "strategy": strategy, "train_start": _iso(lo),
+               "test_start": _iso(mid), "test_end": _iso(hi)}
+        if best is None:
+            print(f"— window {n}: no combo with >= {min_trades} in-sample trades")
+            trace.append(row)
+            continue
+        oos = _window_stats(best, mid, hi)
+        row.update({"combo_id": best[0], **best[1],
+                    "is_trades": best_is['trades'], f"is_{objective}": best_score})
+        row.update({f"oos_{k}": v for k, v in oos.items()})
+        trace.append(row)
+        print(f"✅ window {n} {_iso(mid)}: {best[1]} IS {objective}={best_score:.4f} "
+              f"→ OOS trades={oos['trades']} total={oos['total_return']:.4f}")
+    return trace
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Walk-forward optimisation for the SMI and crossover screeners")
+    parser.add_argument("strategies", nargs="*", default=WF_STRATEGIES)
+    parser.add_argument("--market", default="futures", choices=["futures", "spot"])
+    parser.add_argument("--symbols-file", default=config.FUTURES_PAIRS_FILE)
+    parser.add_argument("--fetch", type=int, default=0, help="fetch the last N bars over REST instead of reading the data dir")
+    parser.add_argument("--train-days", type=int, default=60)
+    parser.add_argument("--test-days", type=int, default=14)
+    parser.add_argument("--step-days", type=int)
+    parser.add_argument("--objective", default="total_return", choices=["total_return", "avg_return", "sharpe", "win_rate"])
+    parser.add_argument("--min-trades", type=int, default=20)
+    parser.add_argument("--random", type=int, default=0, help="sample N random combos instead of the full grid")
+    parser.add_argument("--hold-bars", type=int, default=8)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--out", default="walkforward")
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+    symbols = load_symbol_list(args.symbols_file)
+    os.makedirs(args.out, exist_ok=True)
+    for strategy in args.strategies:
+        start_time = time.time()
+        interval = STRATEGIES[strategy]['interval']
+        universe = load_or_fetch(symbols, interval, args.market, args.fetch)
+        if not universe:
+            print(f"❌ No {interval} candles available for {strategy}")
+            continue
+        grid = STRATEGIES[strategy]['grid']
+        combos = random_params(grid, args.random) if args.random else grid_params(grid)
+        trace = walk_forward(strategy, universe, combos, args.train_days, args.test_days,
+                             args.step_days, interval, args.hold_bars, objective=args.objective,
+                             min_trades=args.min_trades, workers=args.workers)
+        if trace:
+            path = os.path.join(args.out, f"{strategy}.csv")
+            pd.DataFrame(trace).to_csv(path, index=False)
+            print(f"📄 {strategy}: {len(trace)} windows → {path} ({time.time() - start_time:.2f} sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from cryptobot import fake_exchange
+from cryptobot.backfill import backfill, find_gaps
+from cryptobot.candles import candle_file, load_candles, save_candles
+
+HOUR = 3_600_000
+NOW = 1_700_000_000_000 // HOUR * HOUR
+SYMBOL = "BTCUSDT"
+
+
+@pytest.fixture
+def exchange():
+    with fake_exchange.running(symbols=[SYMBOL], now_ms=NOW) as srv:
+        yield srv
+
+
+def _run(exchange, data_dir, start_ms, end_ms=NOW):
+    exchange.requests.clear()
+    progress, failed = backfill("futures", [SYMBOL], "1h", start_ms, end_ms, workers=1, data_dir=str(data_dir))
+    assert failed == []
+    pages = [q for _, path, q in exchange.requests if path == "/fapi/v1/klines"]
+    return load_candles(candle_file(SYMBOL, "1h", "futures", str(data_dir))), pages
+
+
+def _assert_complete(arrays, start_ms, end_ms):
+    assert arrays['open_time'][0] == start_ms
+    assert arrays['open_time'][-1] == end_ms - HOUR
+    assert find_gaps(arrays['open_time'], "1h") == []
+
+
+def test_pages_forward_until_the_forming_bar(exchange, tmp_path):
+    start = NOW - 2000 * HOUR
+    arrays, pages = _run(exchange, tmp_path, start)
+    _assert_complete(arrays, start, NOW)
+    assert len(pages) == 2
+    assert int(pages[1]['startTime']) == start + 1500 * HOUR
+
+
+def test_resume_fetches_only_the_new_bars(exchange, tmp_path):
+    start = NOW - 500 * HOUR
+    _run(exchange, tmp_path, start, NOW - 100 * HOUR)
+    arrays, pages = _run(exchange, tmp_path, start)
+    _assert_complete(arrays, start, NOW)
+    assert [int(q['startTime']) for q in pages] == [NOW - 100 * HOUR]
+
+    _, pages = _run(exchange, tmp_path, start)
+    assert pages == []
+
+
+def test_earlier_start_fetches_before_the_stored_bars(exchange, tmp_path):
+    _run(exchange, tmp_path, NOW - 300 * HOUR)
+    arrays, pages = _run(exchange, tmp_path, NOW - 800 * HOUR)
+    _assert_complete(arrays, NOW - 800 * HOUR, NOW)
+    assert [(int(q['startTime']), int(q['endTime'])) for q in pages] == [(NOW - 800 * HOUR, NOW - 300 * HOUR - 1)]
+
+
+def test_holes_are_repaired(exchange, tmp_path):
+    start = NOW - 400 * HOUR
+    full, _ = _run(exchange, tmp_path, start)
+    path = candle_file(SYMBOL, "1h", "futures", str(tmp_path))
+    keep = np.ones(len(full['open_time']), dtype=bool)
+    keep[100:130] = keep[250] = False
+    save_candles(path, {f: np.array(v)[keep] for f, v in full.items()})
+
+    arrays, pages = _run(exchange, tmp_path, start)
+    _assert_complete(arrays, start, NOW)
+    assert [int(q['startTime']) for q in pages] == [start + 100 * HOUR, start + 250 * HOUR]
+    for f in full:
+        np.testing.assert_array_equal(arrays[f], full[f])
@@ -0,0 +1,15 @@
+from cryptobot import config, fake_exchange
+from cryptobot.candles import fetch_klines, fetch_tickers
+
+
+def test_cached_payloads_are_per_market(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    with fake_exchange.running(symbols=["ETHUSDT"]) as srv:
+        assert config.FUTURES_URL == config.SPOT_URL
+        futures = fetch_klines("ETHUSDT", "15m", 7, "futures")
+        spot = fetch_klines("ETHUSDT", "15m", 7, "spot")
+        fetch_tickers("futures")
+        fetch_tickers("spot")
+        paths = [path for _, path, _ in srv.requests]
+    assert paths == ["/fapi/v1/klines", "/api/v3/klines", "/fapi/v1/ticker/24hr", "/api/v3/ticker/24hr"]
+    assert len(futures['open_time']) == len(spot['open_time']) == 7
@@ -0,0 +1,38 @@
+import pytest
+
+from cryptobot.dca import capital_table, ladder_frame, symbol_table
+
+# Wunder-Trading/DCA_Calculator_v3.xlsx: entry 0.26425, 50 USDT per trade, 20 orders,
+# deviation 1.3 %, size multiplier 1.1, deviation multiplier 1
+SHEET_ROWS = {
+    # order: (cum deviation %, price, size USDT, tokens, cum invest, cum tokens, avg price)
+    1: (0.0, 0.26425, 50.0, 189.21475875118261, 50.0, 189.21475875118261, 0.26425),
+    2: (1.3, 0.26081475, 54.285, 208.1362346263009, 104.285, 397.3509933774835, 0.2624505833333333),
+    6: (6.5, 0.24707375, 75.2913425, 304.7322611163673, 371.85623250000015, 1459.9072847682125, 0.2547122247965488),
+    20: (24.7, 0.19898025, 230.2639755382811, 1157.2202544638533, 2398.6912276272546, 10837.275211590551,
+         0.22133711480002238),
+}
+SHEET_REQUIRED = {5: 296.5648900000001, 10: 742.2305560406503, 15: 1408.5156323030196, 20: 2398.6912276272546}
+
+
+def test_ladder_matches_the_sheet():
+    table = ladder_frame(0.26425, 50, 1.3, 1.1, 1.0, 20)
+    columns = ["cum_deviation", "price", "size", "tokens", "cum_invest", "cum_tokens", "avg_price"]
+    for order, expected in SHEET_ROWS.items():
+        assert table.loc[order, columns].tolist() == pytest.approx(expected, rel=1e-12)
+
+
+def test_required_capital_and_margin_match_the_sheet():
+    row = capital_table([1.3], [1.1]).iloc[0]
+    for count, required in SHEET_REQUIRED.items():
+        assert row[f"required_{count}"] == pytest.approx(required, rel=1e-12)
+    assert row["margin_20_10x"] == pytest.approx(239.86912276272545)
+    assert row["margin_20_20x"] == pytest.approx(119.93456138136273)
+
+
+def test_step_rounding_keeps_exact_multiples():
+    filters = {"XUSDT": {"tick_size": 0.01, "step_size": 0.1, "min_qty": 0.3}}
+    row = symbol_table({"XUSDT": 10.0}, amount=3.0, size_mult=1.0, filters=filters).iloc[0]
+    assert row["min_qty_ok"]
+    # 0.3 tokens at 10, 9.87, 9.74, 9.61 and 9.48
+    assert row["required_5"] == pytest.approx(0.3 * 48.7)
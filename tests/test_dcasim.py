@@ -0,0 +1,13 @@
+import numpy as np
+import pytest
+
+from cryptobot.dcasim import simulate
+
+
+def test_take_profit_is_a_fraction_over_the_average():
+    close = np.array([100.0, 100.5, 100.8, 101.2])
+    deals = simulate(close + 0.1, close - 0.1, close, amount=50.0, take_profit=0.01, fee=0.0)
+    first = deals[0]
+    assert (first["entry"], first["exit"], first["orders"]) == (0, 3, 1)
+    assert first["exit_price"] == pytest.approx(101.0)
+    assert first["pnl"] == pytest.approx(0.5)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cryptobot.journal import outcomes
+
+
+def _candles(closes):
+    close = np.asarray(closes, dtype=np.float64)
+    return {"open_time": np.arange(len(close), dtype=np.float64) * 60_000, "close": close,
+            "high": close + 1, "low": close - 1}
+
+
+@pytest.fixture
+def scored():
+    candles = {("AUSDT", "1m"): _candles([100, 100, 104, 98, 102, 110]), ("BUSDT", "1m"): _candles([50, 45, 55])}
+    journal = pd.DataFrame({
+        "strategy": ["x", "y", "x", "x"], "symbol": ["AUSDT", "BUSDT", "CUSDT", "AUSDT"],
+        "interval": "1m", "bar_time": [60_000, 0, 0, 30_000],
+        "side": [1, -1, 1, 1], "price": [100.0, 50.0, 1.0, 100.0]})
+    return outcomes(journal, candles, horizons=(1, 2, 5)).set_index("symbol", append=True)
+
+
+def test_long_excursions_run_over_the_bars_after_the_signal(scored):
+    a = scored.xs("AUSDT", level="symbol").iloc[0]
+    assert (a["ret_1"], a["mfe_1"], a["mae_1"]) == pytest.approx((0.04, 0.05, 0.03))
+    assert (a["ret_2"], a["mfe_2"], a["mae_2"]) == pytest.approx((-0.02, 0.05, -0.03))
+    # only four bars follow the signal
+    assert np.isnan(a["ret_5"]) and np.isnan(a["mfe_5"]) and np.isnan(a["mae_5"])
+
+
+def test_short_outcomes_are_signed_by_the_side(scored):
+    b = scored.xs("BUSDT", level="symbol").iloc[0]
+    assert (b["ret_1"], b["mfe_1"], b["mae_1"]) == pytest.approx((0.1, 0.12, 0.08))
+    assert (b["ret_2"], b["mfe_2"], b["mae_2"]) == pytest.approx((-0.1, 0.12, -0.12))
+
+
+def test_signals_off_the_stored_bars_are_not_scored(scored):
+    missing = scored[~scored["in_store"]]
+    assert missing.index.get_level_values("symbol").tolist() == ["CUSDT", "AUSDT"]
+    assert missing[["ret_1", "mfe_1", "mae_1"]].isna().all().all()
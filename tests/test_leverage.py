@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cryptobot.leverage import liquidation, loss_recovery, loss_table
+
+# Wunder-Trading/Loss_Recovery_Input_Based.xlsx: entry 0.26425, 3912.55 USDT invested,
+# market 0.20974, take profit 0.5 (a fraction)
+SHEET = {
+    "qty": 14806.24408703879, "value": 3105.461634815516, "unrealized": -807.0883651844842,
+    "extra": 2033.6902879755878, "total_investment": 5946.240287975588, "total_qty": 24502.488427534583,
+    "new_avg": 0.24267903668484228, "tp_price": 0.36401855502726344, "net_profit": 2973.120143987795,
+    "margin_10x": 203.36902879755877,
+}
+
+
+def test_matches_the_sheet():
+    plan = loss_recovery(0.26425, 3912.55, 0.20974, 0.5, leverages=(10,))
+    for column, expected in SHEET.items():
+        assert plan[column] == pytest.approx(expected, rel=1e-12), column
+
+
+def test_loss_table_takes_the_sheet_fraction():
+    positions = pd.DataFrame({"symbol": ["AUSDT", "BUSDT", "CUSDT"], "entry": [0.26425, 0.26425, 1.0],
+                              "investment": [3912.55, 3912.55, 100.0], "take_profit": [None, 0.25, None]})
+    table = loss_table(positions, prices={"AUSDT": 0.20974, "BUSDT": 0.20974, "CUSDT": 1.2}, leverages=(10,))
+    extra = table.set_index("symbol")["extra"]
+    assert extra["AUSDT"] == pytest.approx(SHEET["extra"])
+    assert extra["BUSDT"] == pytest.approx(2 * SHEET["extra"])
+    assert extra["CUSDT"] == 0
+    assert table["symbol"].tolist() == ["BUSDT", "AUSDT", "CUSDT"]
+
+
+def test_liquidation_without_maintenance_margin_is_one_over_leverage_below_entry():
+    out = liquidation(1000.0, 10.0, 100.0, 0.0, leverages=(10, 20))
+    assert out["liq_10x"] == pytest.approx(90.0)
+    assert out["liq_dist_20x"] == pytest.approx(5.0)
+    # over the bracket's max leverage
+    assert np.isnan(liquidation(1000.0, 10.0, 100.0, 0.0, max_leverage=10, leverages=(20,))["liq_20x"])
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from cryptobot.candles import INTERVAL_MS
+from cryptobot.mtf import asof, frame, resample
+
+STEP = INTERVAL_MS["15m"]
+
+
+def _bars(n):
+    close = 100 + np.sin(np.arange(n) / 3.0) * 5
+    open_time = np.arange(n, dtype=np.float64) * STEP
+    return pd.DataFrame({"open_time": open_time, "open": close, "high": close + 1, "low": close - 1,
+                         "close": close, "volume": 1.0, "close_time": open_time + STEP - 1,
+                         "quote_volume": close})
+
+
+def test_resample_keeps_only_closed_buckets():
+    htf = resample(_bars(10), "15m", "1h")
+    assert len(htf) == 2
+    assert htf["close_time"].tolist() == [4 * STEP - 1, 8 * STEP - 1]
+
+
+def test_a_higher_bar_appears_on_the_base_bar_that_closes_with_it():
+    df = _bars(12)
+    joined = asof(df, resample(df, "15m", "1h"), ["close"])["close"].to_numpy()
+    hour_close = df["close"].to_numpy()[[3, 7, 11]]
+    assert np.isnan(joined[:3]).all()
+    np.testing.assert_array_equal(joined[3:7], hour_close[0])
+    np.testing.assert_array_equal(joined[7:11], hour_close[1])
+    assert joined[11] == hour_close[2]
+
+
+def test_no_lookahead_on_any_prefix():
+    df = _bars(200)
+    layers = {"1h": lambda h: {"close": h["close"]}, "4h": lambda h: {"range": h["high"] - h["low"]}}
+    full = frame(df, "15m", layers)
+    for n in (17, 63, 64, 150):
+        prefix = frame(df.iloc[:n], "15m", layers)
+        pd.testing.assert_frame_equal(prefix, full.iloc[:n])
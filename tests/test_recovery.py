@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from cryptobot.recovery import avg_recovery
+
+
+def test_matches_the_sheet():
+    # Wunder-Trading/Avg_Price_Recovery_Calculator_v2.xlsx, Calculator sheet
+    plan = avg_recovery(3165, 0.5554, 0.525, 0.544, last_order=34)
+    assert plan["status"] == "add"
+    assert plan["add_qty"] == pytest.approx(1899)
+    assert plan["new_qty"] == pytest.approx(5064)
+    assert plan["new_avg"] == pytest.approx(0.544)
+    assert plan["pnl_at_target"] == pytest.approx(0, abs=1e-9)
+    assert plan["extra_cash"] == pytest.approx(996.975)
+    assert plan["rounded_qty"] == 1899
+    assert plan["size_mult"] == pytest.approx(55.85294117647037)
+
+
+def test_positions_without_a_reachable_target_add_nothing():
+    plan = avg_recovery([100, 100, 100], [10.0, 10.0, 10.0], [9.0, 11.0, 9.0], [9.5, 10.5, 8.5])
+    assert plan["status"].tolist() == ["add", "no_loss", "exit_now"]
+    np.testing.assert_allclose(plan["add_qty"], [100, 0, 0])
+
+
+def test_rounds_up_to_the_step_size():
+    plan = avg_recovery(10, 2.0, 1.0, 1.5, step_size=0.3)
+    assert plan["add_qty"] == pytest.approx(10)
+    assert plan["rounded_qty"] == pytest.approx(10.2)
@@ -0,0 +1,54 @@
+import numpy as np
+
+from cryptobot.candles import CANDLE_FIELDS
+from cryptobot.ringbuffer import CandleRing
+
+
+def _row(t, close=None):
+    row = [float(t)] * len(CANDLE_FIELDS)
+    row[CANDLE_FIELDS.index("close")] = float(t if close is None else close)
+    return row
+
+
+def test_window_stays_contiguous_across_the_wrap():
+    ring = CandleRing(5)
+    for t in range(12):
+        ring.append(_row(t))
+    assert len(ring) == 5 and ring.last_open_time == 11
+    for n in range(1, 6):
+        np.testing.assert_array_equal(ring.view("open_time", n), np.arange(12 - n, 12))
+    assert ring.view("close").base is ring.data
+
+
+def test_update_overwrites_the_forming_bar_and_ignores_stale_rows():
+    ring = CandleRing(4)
+    ring.update(_row(1), True)
+    ring.update(_row(2, close=5), False)
+    ring.update(_row(2, close=6), False)
+    ring.update(_row(1, close=99), True)
+    np.testing.assert_array_equal(ring.view("close"), [1, 6])
+    np.testing.assert_array_equal(ring.view("close", closed_only=True), [1])
+    ring.update(_row(2, close=7), True)
+    np.testing.assert_array_equal(ring.view("close", closed_only=True), [1, 7])
+
+
+def test_snapshot_is_a_copy_that_later_writes_do_not_touch():
+    ring = CandleRing(3)
+    for t in range(3):
+        ring.update(_row(t), True)
+    view, snap = ring.arrays(closed_only=True), ring.snapshot(closed_only=True)
+    for t in range(3, 6):
+        ring.update(_row(t), True)
+    np.testing.assert_array_equal(snap["open_time"], [0, 1, 2])
+    assert not np.shares_memory(snap["close"], ring.data)
+    # the zero-copy view was overwritten by the appends that wrapped over its slots
+    assert view["open_time"].tolist() != [0, 1, 2]
+
+
+def test_extend_marks_only_bars_closed_by_now():
+    ring = CandleRing(10)
+    arrays = {f: np.arange(3, dtype=np.float64) * 60_000 for f in CANDLE_FIELDS}
+    arrays["close_time"] = arrays["open_time"] + 59_999
+    ring.extend(arrays, now_ms=150_000)
+    assert not ring.last_closed
+    np.testing.assert_array_equal(ring.view("open_time", closed_only=True), [0, 60_000])
@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pytest
+
+from cryptobot import config, fake_exchange
+from cryptobot.backfill import find_gaps
+from cryptobot.fake_exchange import FakeKlineStream, SimClock, synthetic_klines
+from cryptobot.stream import KlineStream
+
+MINUTE = 60_000
+T0 = 1_700_000_000_000 // MINUTE * MINUTE
+SYMBOL = "BTCUSDT"
+KEY = (SYMBOL, "1m")
+
+
+class ManualClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _wait(condition, timeout=15):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def live(monkeypatch):
+    """REST and kline WebSocket stand-ins on one simulated clock (a 1m bar every 0.2 s)."""
+    clock = SimClock(T0 + 5_000, speed=300)
+    ws = FakeKlineStream(clock=clock, tick=0.02).start()
+    monkeypatch.setattr(config, "FUTURES_WS_URL", ws.url)
+    with fake_exchange.running(symbols=[SYMBOL], clock=clock):
+        yield clock, ws
+    ws.stop()
+
+
+@contextmanager
+def streaming(stream):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_until_complete, args=(stream.run(),), daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        loop.call_soon_threadsafe(stream.stop)
+        thread.join(10)
+        stream.callbacks.shutdown(wait=True)
+
+
+def test_seed_fills_history_up_to_the_forming_bar():
+    clock = ManualClock(T0 + 30_000)
+    with fake_exchange.running(symbols=[SYMBOL], clock=clock):
+        stream = KlineStream([SYMBOL], ["1m"], history=50, clock=clock)
+        stream.seed()
+    buf = stream.buffers[KEY]
+    assert len(buf) == 50 and buf.last_open_time == T0 and not buf.last_closed
+    closed = buf.arrays(closed_only=True)
+    assert closed['open_time'][-1] == T0 - MINUTE and find_gaps(closed['open_time'], "1m") == []
+    rows = synthetic_klines(SYMBOL, "1m", T0 - 49 * MINUTE, T0 - MINUTE, 49, T0)
+    np.testing.assert_allclose(closed['close'], [float(r[4]) for r in rows])
+
+
+def test_gap_fill_dispatches_only_a_newly_closed_bar():
+    clock = ManualClock(T0 + 5_000)
+    closes = []
+    with fake_exchange.running(symbols=[SYMBOL], clock=clock):
+        stream = KlineStream([SYMBOL], ["1m"], history=50, clock=clock,
+                             on_close=lambda s, i, arrays: closes.append(arrays['open_time'][-1]))
+        stream.seed()
+        stream.gap_fill(stream.keys)  # reconnected inside the same bar
+        clock.now += 3 * MINUTE
+        stream.gap_fill(stream.keys)  # three bars closed while disconnected
+        stream.gap_fill(stream.keys)  # and nothing since
+        stream.callbacks.shutdown(wait=True)
+    assert closes == [T0 + 2 * MINUTE]
+
+
+def test_closed_bars_are_dispatched_once_as_copies(live):
+    closes = []
+    stream = KlineStream([SYMBOL], ["1m"], history=50, clock=live[0],
+                         on_close=lambda s, i, arrays: closes.append((s, i, arrays)))
+    with streaming(stream):
+        _wait(lambda: len(closes) >= 3)
+    times = [arrays['open_time'][-1] for _, _, arrays in closes]
+    assert times == [T0 + k * MINUTE for k in range(len(times))]
+    for symbol, interval, arrays in closes:
+        assert (symbol, interval) == KEY
+        assert find_gaps(arrays['open_time'], "1m") == []
+        assert not np.shares_memory(arrays['close'], stream.buffers[KEY].data)
+
+
+def test_reconnect_gap_fills_without_duplicate_dispatch(live):
+    clock, ws = live
+    closes = []
+    stream = KlineStream([SYMBOL], ["1m"], history=50, clock=clock,
+                         on_close=lambda s, i, arrays: closes.append(arrays))
+    with streaming(stream):
+        _wait(lambda: len(closes) >= 1)
+        ws.drop_connections()
+        _wait(lambda: stream.connections >= 2)
+        seen = len(closes)
+        _wait(lambda: len(closes) >= seen + 2)
+    times = [arrays['open_time'][-1] for arrays in closes]
+    assert stream.connections == 2
+    assert all(b > a for a, b in zip(times, times[1:]))
+    assert find_gaps(closes[-1]['open_time'], "1m") == []
+    assert closes[-1]['open_time'][-1] - closes[0]['open_time'][-1] > 2 * MINUTE
@@ -0,0 +1,10 @@
+import pytest
+
+from cryptobot.universe import round_qty
+
+
+@pytest.mark.parametrize("qty, step, expected", [
+    (0.3, 0.1, 0.3), (0.39, 0.1, 0.3), (2.9, 0.1, 2.9), (1.23456, 0.001, 1.234), (7.0, 1.0, 7.0), (5.5, 0, 5.5),
+])
+def test_round_qty_floors_to_the_step(qty, step, expected):
+    assert round_qty(qty, step) == expected